@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark the registration, course and lodgement queries of a large event.
+
+This clones a registration of the event for a number of synthetic personas and
+then times the queries with and without the cached query views. Changes are rolled
+back unless `SCRIPT_DRY_RUN` is disabled.
+"""
+import sys
+import timeit
+
+import cdedb.backend.event.query as event_query
+import cdedb.models.event as models
+from cdedb.common.query import Query, QueryScope
+from cdedb.script import Script
+
+# Configuration
+
+# The admin id will need to be replaces before use.
+executing_admin_id = int(sys.argv[1])
+event_id = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+NUM_REGISTRATIONS = 1000
+REPETITIONS = 5
+
+# Prepare stuff
+script = Script(persona_id=executing_admin_id, dbuser="cdb_admin")
+user_rs = script.rs()
+
+event_backend = script.make_backend("event", proxy=False)
+
+
+def columns(table: str, exclude: str) -> str:
+    schema, name = table.split(".")
+    query = ("SELECT column_name FROM information_schema.columns"
+             " WHERE table_schema = %s AND table_name = %s AND column_name != 'id'"
+             " AND is_generated = 'NEVER'"
+             " AND column_name != %s")
+    data = event_backend.query_all(user_rs, query, (schema, name, exclude))
+    return ", ".join(e['column_name'] for e in data)
+
+
+def clone(table: str, key: str, source_column: str, source_id: int,
+          new_ids: list[int]) -> list[int]:
+    """Copy the source rows once per new value of the key, returning the new ids."""
+    cols = columns(table, key)
+    query = (f"INSERT INTO {table} ({cols}, {key})"
+             f" SELECT {cols}, new.id FROM {table}, unnest(%s::integer[]) AS new(id)"
+             f" WHERE {table}.{source_column} = %s ORDER BY new.id RETURNING id")
+    return [e['id'] for e in event_backend.query_all(
+        user_rs, query, (new_ids, source_id))]
+
+
+def make_query(scope: QueryScope, event: models.Event) -> Query:
+    spec = scope.get_spec(event=event)
+    fields_of_interest = [field for field in spec if "," not in field][:20]
+    return Query(scope, spec, fields_of_interest, constraints=[], order=[])
+
+
+# Execution
+
+with script:
+    registration_id = min(event_backend.list_registrations(user_rs, event_id))
+    registration = event_backend.get_registration(user_rs, registration_id)
+    persona_ids = [e['id'] for e in event_backend.query_all(
+        user_rs, f"""
+            INSERT INTO core.personas ({columns("core.personas", "username")},
+                                       username)
+            SELECT {columns("core.personas", "username")},
+                'synthetic' || i || '@example.cde'
+            FROM core.personas, generate_series(1, %s) AS i
+            WHERE id = %s ORDER BY i RETURNING id""",
+        (NUM_REGISTRATIONS, registration['persona_id']))]
+    new_ids = clone("event.registrations", "persona_id", "id", registration_id,
+                    persona_ids)
+    for table in ("event.registration_parts", "event.registration_tracks",
+                  "event.course_choices"):
+        clone(table, "registration_id", "registration_id", registration_id, new_ids)
+
+    event = event_backend.get_event(user_rs, event_id)
+    queries = {scope: make_query(scope, event) for scope in (
+        QueryScope.registration, QueryScope.event_course, QueryScope.lodgement)}
+
+    print(f"{len(event_backend.list_registrations(user_rs, event_id))} registrations,"
+          f" best of {REPETITIONS}:")
+    for scope, query in queries.items():
+        def cold() -> None:
+            event_query._QUERY_VIEW_CACHE.clear()  # pylint: disable=protected-access
+            event_backend.submit_general_query(user_rs, query, event_id=event_id)
+
+        def warm() -> None:
+            event_backend.submit_general_query(user_rs, query, event_id=event_id)
+
+        for func in (cold, warm):
+            best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+            print(f"{scope.name:>14} {func.__name__:>4}: {best * 1000:8.1f} ms")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark the evaluation of fee conditions for a large synthetic event.
+
+This compares the recursive evaluation of the parse tree with the compiled
+evaluator used by the event backend. It does not need a database.
+"""
+import random
+import timeit
+
+import cdedb.fee_condition_parser.evaluation as fcp_evaluation
+import cdedb.fee_condition_parser.parsing as fcp_parsing
+
+# Configuration
+
+NUM_REGISTRATIONS = 1500
+NUM_FEES = 30
+NUM_FIELDS = 10
+PART_NAMES = ("Wu", "1.H.", "2.H.", "OK")
+REPETITIONS = 5
+
+# Prepare stuff
+
+rng = random.Random(42)
+field_names = [f"field{i}" for i in range(NUM_FIELDS)]
+
+
+def random_atom() -> str:
+    return rng.choice((
+        f"field.{rng.choice(field_names)}",
+        f"part.{rng.choice(PART_NAMES)}",
+        "is_orga", "is_member", "any_part", "all_parts",
+    ))
+
+
+def random_condition(depth: int = 3) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        return random_atom()
+    op = rng.choice(("and", "or", "xor", "not"))
+    if op == "not":
+        return f"not ({random_condition(depth - 1)})"
+    return f"({random_condition(depth - 1)}) {op} ({random_condition(depth - 1)})"
+
+
+conditions = [random_condition() for _ in range(NUM_FEES)]
+inputs = []
+for _ in range(NUM_REGISTRATIONS):
+    parts = {p: rng.random() < 0.7 for p in PART_NAMES}
+    inputs.append((
+        {f: rng.random() < 0.5 for f in field_names},
+        parts,
+        {
+            'is_orga': rng.random() < 0.05, 'is_member': rng.random() < 0.8,
+            'any_part': any(parts.values()), 'all_parts': all(parts.values()),
+        },
+    ))
+
+# Execution
+
+
+def recursive() -> list[list[bool]]:
+    return [
+        [bool(fcp_evaluation.evaluate(fcp_parsing.parse(c), *reg_inputs))
+         for c in conditions]
+        for reg_inputs in inputs
+    ]
+
+
+def compiled() -> list[list[bool]]:
+    results = [fcp_evaluation.compile_condition(c)(inputs) for c in conditions]
+    return [list(row) for row in zip(*results)]
+
+
+assert recursive() == compiled()
+print(f"{NUM_REGISTRATIONS} registrations, {NUM_FEES} conditional fees,"
+      f" best of {REPETITIONS}:")
+for func in (recursive, compiled):
+    best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+    print(f"{func.__name__:>10}: {best * 1000:8.1f} ms")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Compare fulltext member searches with and without the trigram prefilter.
+
+This is meant to be run against a database filled by `insert_huge_data.py`. For each
+search term it times the plain diacritic regex scan against the same search
+prefiltered via the trigram index on the normalized fulltext.
+"""
+import sys
+import timeit
+
+from cdedb.common import diacritic_patterns, normalized_search_pattern
+from cdedb.script import Script
+
+# Configuration
+
+# The admin id will need to be replaces before use.
+executing_admin_id = int(sys.argv[1])
+TERMS = sys.argv[2:] or ["Anton", "Bertalotta", "Musterstadt", "boehm", "xyz"]
+REPETITIONS = 5
+
+# Prepare stuff
+script = Script(persona_id=executing_admin_id, dbuser="cdb_admin")
+user_rs = script.rs()
+
+core = script.make_backend("core", proxy=False)
+
+# Execution
+
+with script:
+    total = core.query_one(user_rs, "SELECT COUNT(*) AS num FROM core.personas", ())
+    print(f"{total['num'] if total else 0} personas, best of {REPETITIONS}:")
+    for term in TERMS:
+        regex = diacritic_patterns(term)
+        pattern = normalized_search_pattern(term)
+
+        def regex_only() -> int:
+            return len(core.query_all(
+                user_rs, "SELECT id FROM core.personas WHERE fulltext ~* %s",
+                (regex,)))
+
+        def prefiltered() -> int:
+            return len(core.query_all(
+                user_rs, "SELECT id FROM core.personas"
+                         " WHERE fulltext_normalized ~ %s AND fulltext ~* %s",
+                (pattern, regex)))
+
+        assert regex_only() == prefiltered()
+        for func in (regex_only, prefiltered):
+            best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+            print(f"{term:>12} {func.__name__:>11}: {best * 1000:8.1f} ms")
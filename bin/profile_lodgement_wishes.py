@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the detection of lodgement wishes for a large synthetic event.
+
+This compares the former scan of every wish text with the regex of every other
+registration to the indexed wish matcher, which the lodgement wishes graph and
+the lodgement puzzle download use. It does not need a database.
+"""
+import random
+import re
+import timeit
+import types
+from typing import cast
+
+import cdedb.frontend.event.lodgement_wishes as lodgement_wishes
+import cdedb.models.event as models
+from cdedb.common import CdEDBObjectMap
+from cdedb.database.constants import Genders, RegistrationPartStati
+from cdedb.filter import cdedbid_filter
+
+# Configuration
+
+NUM_REGISTRATIONS = 600
+WISHES_PER_REGISTRATION = 3
+PART_IDS = (1, 2)
+REPETITIONS = 5
+GIVEN_NAMES = ("Anna", "Bertålda", "Emilia", "Jonas", "Lukas", "Marie", "Paul",
+               "Sophie", "Zoë", "Ömer")
+FAMILY_NAMES = ("Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer",
+                "Wagner", "Becker", "Schulz", "Hoffmann", "Koch", "Richter")
+
+# Prepare stuff
+
+rng = random.Random(42)
+event = cast(models.Event, types.SimpleNamespace(
+    id=1, lodge_field=types.SimpleNamespace(field_name="lodge")))
+
+personas: CdEDBObjectMap = {}
+registrations: CdEDBObjectMap = {}
+for i in range(1, NUM_REGISTRATIONS + 1):
+    given_names = rng.choice(GIVEN_NAMES)
+    personas[i] = {
+        'id': i,
+        'given_names': given_names,
+        'display_name': given_names,
+        # Suffixes make most names unique, as they are in a real event.
+        'family_name': f"{rng.choice(FAMILY_NAMES)}{rng.randrange(100)}",
+        'username': f"person{i}@example.cde",
+        'gender': rng.choice(list(Genders)),
+    }
+    registrations[1000 + i] = {
+        'id': 1000 + i,
+        'persona_id': i,
+        'mixed_lodging': rng.random() < 0.5,
+        'parts': {part_id: {'status': rng.choice(list(RegistrationPartStati))}
+                  for part_id in PART_IDS},
+        'fields': {},
+    }
+
+
+def reference(persona_id: int) -> str:
+    persona = personas[persona_id]
+    return rng.choice((
+        f"{persona['given_names']} {persona['family_name']}",
+        cdedbid_filter(persona_id),
+        persona['username'],
+    ))
+
+
+for registration in registrations.values():
+    wished = rng.sample(range(1, NUM_REGISTRATIONS + 1), WISHES_PER_REGISTRATION)
+    registration['fields']['lodge'] = (
+        "Ich möchte gerne mit " + ", ".join(map(reference, wished))
+        + " in ein Zimmer.")
+
+# Execution
+
+
+def quadratic() -> list[tuple[int, int]]:
+    lookup_map = [
+        (lodgement_wishes.make_identifying_regex(
+            personas[registration['persona_id']]), registration_id)
+        for registration_id, registration in registrations.items()
+    ]
+    ret = []
+    for registration_id, registration in registrations.items():
+        for pattern, other_registration_id in lookup_map:
+            if (other_registration_id != registration_id
+                    and pattern.search(registration['fields']['lodge'])):
+                ret.append((registration_id, other_registration_id))
+    return ret
+
+
+def cold() -> list[tuple[int, int]]:
+    lodgement_wishes._WISH_MATCHER_CACHE.clear()  # pylint: disable=protected-access
+    return warm()
+
+
+def warm() -> list[tuple[int, int]]:
+    wishes, _ = lodgement_wishes.detect_lodgement_wishes(
+        registrations, personas, event, restrict_part_id=None, check_edges=False)
+    ret = []
+    for wish in wishes:
+        ret.append((wish.wishing, wish.wished))
+        if wish.bidirectional:
+            ret.append((wish.wished, wish.wishing))
+    return ret
+
+
+assert sorted(quadratic()) == sorted(cold())
+print(f"{NUM_REGISTRATIONS} registrations, {WISHES_PER_REGISTRATION} wishes each,"
+      f" best of {REPETITIONS}:")
+for func in (quadratic, cold, warm):
+    re.purge()
+    best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+    print(f"{func.__name__:>10}: {best * 1000:8.1f} ms")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark parsing a large synthetic bank statement.
+
+This builds a statement with one line per transaction, referencing existing
+personas and events, and compares retrieving the matching data once for the whole
+statement against retrieving it again for every single transaction.
+"""
+import datetime
+import itertools
+import sys
+import timeit
+
+import cdedb.frontend.cde.parse_statement as parse
+from cdedb.common import Accounts, CdEDBObject
+from cdedb.filter import cdedbid_filter
+from cdedb.script import Script
+
+# Configuration
+
+# The admin id will need to be replaces before use.
+executing_admin_id = int(sys.argv[1])
+NUM_LINES = 5000
+# Retrieving per transaction is slow, so only a sample is timed.
+NUM_SAMPLE_LINES = 200
+REPETITIONS = 3
+
+# Prepare stuff
+script = Script(persona_id=executing_admin_id, dbuser="cdb_admin")
+user_rs = script.rs()
+
+core = script.make_backend("core", proxy=False)
+event_backend = script.make_backend("event", proxy=False)
+
+
+def make_lines(personas: list[CdEDBObject], shortnames: list[str],
+               ) -> list[CdEDBObject]:
+    keys = parse.StatementCSVKeys
+    date = datetime.date.today().strftime(parse.STATEMENT_INPUT_DATEFORMAT)
+    ret = []
+    for i, persona, shortname in zip(
+            range(NUM_LINES), itertools.cycle(personas), itertools.cycle(shortnames)):
+        reference = (f"{cdedbid_filter(persona['id'])} {persona['given_names']}"
+                     f" {persona['family_name']}")
+        if i % 2:
+            reference += f" Teilnahmebeitrag {shortname}"
+        else:
+            reference += " Mitgliedsbeitrag"
+        ret.append({
+            "id": i,
+            keys.cde_iban: Accounts.Account0.value,
+            keys.transaction_date: date,
+            keys.amount: parse.number_to_german(i % 500 + 2),
+            keys.reference: reference,
+            keys.account_holder: persona['display_name'],
+            keys.iban: "",
+            keys.bic: "",
+            keys.posting: "Gutschrift",
+        })
+    return ret
+
+
+# Execution
+
+with script:
+    persona_ids = [e['id'] for e in core.query_all(
+        user_rs, "SELECT id FROM core.personas WHERE NOT is_archived"
+                 " ORDER BY id LIMIT 1000", ())]
+    personas = list(core.get_personas(user_rs, persona_ids).values())
+    events = event_backend.get_events(user_rs, event_backend.list_events(user_rs))
+    lines = make_lines(personas, [event.shortname for event in events.values()])
+
+    def batched() -> None:
+        transactions = [parse.Transaction.from_csv(line) for line in lines]
+        context = parse.StatementContext.retrieve(
+            user_rs, core, event_backend, transactions)
+        for t in transactions:
+            t.parse(context)
+            t.validate(context)
+
+    def per_transaction() -> None:
+        for line in lines[:NUM_SAMPLE_LINES]:
+            t = parse.Transaction.from_csv(line)
+            context = parse.StatementContext.retrieve(
+                user_rs, core, event_backend, [t])
+            t.parse(context)
+            t.validate(context)
+
+    print(f"{NUM_LINES} lines, {len(personas)} personas, {len(events)} events,"
+          f" best of {REPETITIONS}:")
+    best = min(timeit.repeat(batched, number=1, repeat=REPETITIONS))
+    print(f"        batched: {best * 1000:8.1f} ms")
+    best = min(timeit.repeat(per_transaction, number=1, repeat=REPETITIONS))
+    best *= NUM_LINES / NUM_SAMPLE_LINES
+    print(f"per transaction: {best * 1000:8.1f} ms (extrapolated)")
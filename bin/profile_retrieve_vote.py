@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark looking up the votes of an attendee in a large assembly.
+
+This clones a ballot of the assembly a number of times and fills each clone with
+the votes of synthetic voters. It then times looking up the votes of one secret
+ballot by ballot, all at once and with the remembered vote ids. Changes are rolled
+back unless `SCRIPT_DRY_RUN` is disabled.
+"""
+import secrets
+import sys
+import timeit
+
+import cdedb.backend.assembly as assembly_backend
+from cdedb.script import Script
+
+# Configuration
+
+# The admin id will need to be replaces before use.
+executing_admin_id = int(sys.argv[1])
+assembly_id = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+NUM_VOTERS = 2000
+NUM_BALLOTS = 40
+REPETITIONS = 5
+
+# Prepare stuff
+script = Script(persona_id=executing_admin_id, dbuser="cdb_admin")
+user_rs = script.rs()
+
+assembly = script.make_backend("assembly", proxy=False)
+
+
+def columns(table: str, exclude: str) -> str:
+    schema, name = table.split(".")
+    query = ("SELECT column_name FROM information_schema.columns"
+             " WHERE table_schema = %s AND table_name = %s AND column_name != 'id'"
+             " AND is_generated = 'NEVER'"
+             " AND column_name != %s")
+    data = assembly.query_all(user_rs, query, (schema, name, exclude))
+    return ", ".join(e['column_name'] for e in data)
+
+
+# Execution
+
+with script:
+    ballot_id = min(assembly.list_ballots(user_rs, assembly_id))
+    cols = columns("assembly.ballots", "title")
+    ballot_ids = [e['id'] for e in assembly.query_all(
+        user_rs, f"""
+            INSERT INTO assembly.ballots ({cols}, title)
+            SELECT {cols}, 'Synthetic ballot ' || i
+            FROM assembly.ballots, generate_series(1, %s) AS i
+            WHERE id = %s ORDER BY i RETURNING id""",
+        (NUM_BALLOTS, ballot_id))]
+
+    voter_secrets = [secrets.token_urlsafe(12) for _ in range(NUM_VOTERS)]
+    vote = "_bar_"
+    for new_id in ballot_ids:
+        salts = [secrets.token_urlsafe(12) for _ in voter_secrets]
+        hashes = [assembly.encrypt_vote(salt, secret, vote)
+                  for salt, secret in zip(salts, voter_secrets)]
+        assembly.query_exec(
+            user_rs, "INSERT INTO assembly.votes (ballot_id, vote, salt, hash)"
+                     " SELECT %s, %s, unnest(%s::varchar[]), unnest(%s::varchar[])",
+            (new_id, vote, salts, hashes))
+
+    # The last voter is the worst case for the brute force search.
+    secret = voter_secrets[-1]
+
+    def one_by_one() -> None:
+        assembly_backend._VOTE_ID_CACHE.clear()  # pylint: disable=protected-access
+        for new_id in ballot_ids:
+            assembly.retrieve_vote(user_rs, new_id, secret)
+
+    def batched() -> None:
+        assembly_backend._VOTE_ID_CACHE.clear()  # pylint: disable=protected-access
+        assembly.retrieve_votes(user_rs, ballot_ids, secret)
+
+    def remembered() -> None:
+        assembly.retrieve_votes(user_rs, ballot_ids, secret)
+
+    print(f"{NUM_VOTERS} voters, {NUM_BALLOTS} ballots, best of {REPETITIONS}:")
+    for func in (one_by_one, batched, remembered):
+        best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+        print(f"{func.__name__:>10}: {best * 1000:8.1f} ms")
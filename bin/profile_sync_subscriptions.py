@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Compare the ways to write the subscription states of all mailinglists.
+
+This times the old per mailinglist invocation against the batched and the
+incremental mode of `MlBackend.write_subscription_states` and stores a profile of
+the batched mode. Changes are rolled back unless `SCRIPT_DRY_RUN` is disabled.
+"""
+import cProfile
+import sys
+import timeit
+
+from cdedb.script import Script
+
+# Configuration
+
+# The admin id will need to be replaces before use.
+executing_admin_id = int(sys.argv[1])
+profile_path = sys.argv[2] if len(sys.argv) > 2 else "/cdedb2/sync_subscriptions.prof"
+REPETITIONS = 3
+
+# Prepare stuff
+script = Script(persona_id=executing_admin_id, dbuser="cdb_admin")
+user_rs = script.rs()
+
+ml = script.make_backend("ml", proxy=False)
+
+# Execution
+
+with script:
+    ml_ids = ml.list_mailinglists(user_rs)
+    marker = ml.get_subscription_input_marker(user_rs)
+
+    def per_list() -> None:
+        for ml_id in ml_ids:
+            ml.write_subscription_states(user_rs, (ml_id,))
+
+    def batched() -> None:
+        ml.write_subscription_states(user_rs, ml_ids)
+
+    def incremental() -> None:
+        ml.write_subscription_states(user_rs, ml_ids, since=marker)
+
+    print(f"{len(ml_ids)} mailinglists, best of {REPETITIONS}:")
+    for func in (per_list, batched, incremental):
+        best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+        print(f"{func.__name__:>12}: {best * 1000:8.1f} ms")
+
+    cProfile.run("batched()", profile_path)
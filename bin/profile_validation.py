@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark the validators which are run on (nearly) every backend call.
+
+For each case this times the compiled validators against resolving the validator
+anew for every value, which is what looking up a validator used to do. This needs
+no database, only a config, so run it with `CDEDB_CONFIGPATH` set.
+"""
+import datetime
+import timeit
+from collections.abc import Callable
+from typing import Any, Optional
+
+import cdedb.common.validation.types as vtypes
+import cdedb.common.validation.validate as validate
+import cdedb.database.constants as const
+from cdedb.common.query.log_filter import CoreLogFilter
+
+# Configuration
+
+NUM_VALUES = 10000
+REPETITIONS = 5
+
+# Prepare stuff
+
+ids = list(range(1, NUM_VALUES + 1))
+cases: dict[str, tuple[Any, list[Any], dict[str, Any]]] = {
+    "ID": (vtypes.ID, ids, {}),
+    "Optional[ID]": (Optional[vtypes.ID], ids, {}),
+    "int": (int, [-i for i in ids], {}),
+    "bool": (bool, [bool(i % 2) for i in ids], {}),
+    "str": (str, [f"Title {i}" for i in ids], {}),
+    "set[ID]": (set[vtypes.ID], [ids[i:i + 100] for i in range(0, NUM_VALUES, 100)], {}),
+    "LogFilter": (vtypes.LogFilter, [
+        {'length': 50, 'codes': [const.CoreLogCodes.persona_creation],
+         'ctime_from': datetime.datetime.now(datetime.timezone.utc),
+         'change_note': "Some note"},
+    ] * (NUM_VALUES // 10), {'subtype': CoreLogFilter}),
+}
+
+
+def uncompiled(type_: Any) -> Callable[..., Any]:
+    # pylint: disable=protected-access
+    return validate._ALL_TYPED._compile(type_)
+
+
+# Execution
+
+print(f"{NUM_VALUES} values, best of {REPETITIONS}:")
+for name, (type_, values, kwargs) in cases.items():
+    def compiled_lookup() -> None:
+        for value in values:
+            validate.validate_assert(type_, value, True, **kwargs)
+
+    def uncompiled_lookup() -> None:
+        for value in values:
+            uncompiled(type_)(value, ignore_warnings=True, **kwargs)
+
+    def batched() -> None:
+        validate.validate_assert_all(type_, values, True, **kwargs)
+
+    for func in (uncompiled_lookup, compiled_lookup, batched):
+        best = min(timeit.repeat(func, number=1, repeat=REPETITIONS))
+        print(f"{name:>12} {func.__name__:>17}: {best * 1000:8.1f} ms")
@@ -31,10 +31,12 @@ import dataclasses
 import datetime
 import hmac
 import math
+import os
+import tempfile
 from collections.abc import Collection, Iterator
 from pathlib import Path
-from secrets import token_urlsafe
-from typing import Any, NamedTuple, Optional, Protocol, Union
+from secrets import token_bytes, token_urlsafe
+from typing import Any, Literal, NamedTuple, Optional, Protocol, Union, overload
 
 from schulze_condorcet import schulze_evaluate
 
@@ -65,6 +67,7 @@ from cdedb.common import (
     unwrap,
 )
 from cdedb.common.attachment import AttachmentStore
+from cdedb.common.cache import ExpiringCache
 from cdedb.common.exceptions import (
     DeletionBlockedError,
     DeletionImpossibleError,
@@ -83,6 +86,17 @@ from cdedb.common.roles import implying_realms
 from cdedb.common.sorting import EntitySorter, mixed_existence_sorter, xsorted
 from cdedb.database.connection import Atomizer
 
+# Maps ballot ids and digests of voting secrets to the id of the respective vote.
+# The digests use a key private to this process, so that they do not reveal the
+# secrets. A cached vote is still checked against the secret before it is used.
+_VOTE_ID_CACHE: ExpiringCache[tuple[int, bytes], int] = ExpiringCache(
+    max_size=16384)
+_VOTE_ID_CACHE_KEY = token_bytes(32)
+
+# The point in time at which an untallied ballot needs to be extended or tallied,
+# keep in sync with the ballots_deadline_idx index.
+BALLOT_DEADLINE = "CASE WHEN extended THEN vote_extension_end ELSE vote_end END"
+
 
 class BallotConfiguration(NamedTuple):
     vote_begin: datetime.datetime
@@ -251,30 +265,64 @@ class AssemblyBackend(AbstractBackend):
         This hash is used to ensure that only knowledge of the secret
         allows modification of the vote. We use SHA512 as hash.
         """
-        h = hmac.new(salt.encode('ascii'), digestmod="sha512")
-        h.update(secret.encode('ascii'))
-        h.update(vote.encode('ascii'))
-        return h.hexdigest()
+        return hmac.digest(salt.encode('ascii'),
+                           (secret + vote).encode('ascii'), "sha512").hex()
 
-    def retrieve_vote(self, rs: RequestState, ballot_id: int,
-                      secret: str) -> CdEDBObject:
-        """Low level function for looking up a vote.
+    def retrieve_votes(self, rs: RequestState, ballot_ids: Collection[int],
+                       secret: str) -> CdEDBObjectMap:
+        """Low level function for looking up the votes of a secret in some ballots.
 
         This is a brute force algorithm checking each vote, whether it
         belongs to the passed secret. This is impossible to do more
         efficiently by design. Otherwise some quality of our voting
         process would be compromised.
 
+        To make this bearable, all votes of the ballots are fetched at once and
+        each process remembers the vote it found for a secret. A remembered vote
+        is checked against the secret like any other, and the ballot is searched
+        again, if it does not match.
+
+        :returns: Mapping of ballot ids to votes. Ballots without a vote of the
+            secret are missing.
+        """
+        columns = ("id", "ballot_id", "vote", "salt", "hash")
+        digest = hmac.digest(_VOTE_ID_CACHE_KEY, secret.encode('ascii'), "sha256")
+        ttl = self.conf["VOTE_ID_CACHE_TTL"].total_seconds()
+
+        ret: CdEDBObjectMap = {}
+        cached_ids = {
+            ballot_id: vote_id for ballot_id in ballot_ids
+            if (vote_id := _VOTE_ID_CACHE.peek((ballot_id, digest))) is not None}
+        if cached_ids:
+            for v in self.sql_select(rs, "assembly.votes", columns,
+                                     cached_ids.values()):
+                if (cached_ids.get(v['ballot_id']) == v['id']
+                        and v['hash'] == self.encrypt_vote(
+                            v['salt'], secret, v['vote'])):
+                    ret[v['ballot_id']] = v
+
+        if missing := set(ballot_ids) - set(ret):
+            all_votes = self.sql_select(
+                rs, "assembly.votes", columns, missing, entity_key="ballot_id")
+            for v in all_votes:
+                if v['ballot_id'] in ret:
+                    continue
+                if v['hash'] == self.encrypt_vote(v['salt'], secret, v['vote']):
+                    ret[v['ballot_id']] = v
+                    _VOTE_ID_CACHE.put((v['ballot_id'], digest), v['id'], ttl)
+        return ret
+
+    def retrieve_vote(self, rs: RequestState, ballot_id: int,
+                      secret: str) -> CdEDBObject:
+        """Low level function for looking up a vote, see `retrieve_votes`.
+
         This assumes, that a vote actually exists and throws an error if
         not.
         """
-        all_votes = self.sql_select(
-            rs, "assembly.votes", ("id", "vote", "salt", "hash"),
-            (ballot_id,), entity_key="ballot_id")
-        for v in all_votes:
-            if v['hash'] == self.encrypt_vote(v['salt'], secret, v['vote']):
-                return v
-        raise ValueError(n_("No vote found."))
+        votes = self.retrieve_votes(rs, (ballot_id,), secret)
+        if ballot_id not in votes:
+            raise ValueError(n_("No vote found."))
+        return votes[ballot_id]
 
     def assembly_log(self, rs: RequestState, code: const.AssemblyLogCodes,
                      assembly_id: Optional[int],
@@ -323,14 +371,30 @@ class AssemblyBackend(AbstractBackend):
 
         return self.generic_retrieve_log(rs, log_filter)
 
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False, *,
+                             stream: Literal[False] = False,
+                             ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False, *, stream: Literal[True],
+                             ) -> Iterator[CdEDBObject]: ...
+
     @access("core_admin", "assembly_admin")
     def submit_general_query(self, rs: RequestState, query: Query,
-                             aggregate: bool = False) -> tuple[CdEDBObject, ...]:
+                             aggregate: bool = False, *, stream: bool = False,
+                             ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Realm specific wrapper around
         :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.`
+
+        :param stream: Retrieve the results lazily, see
+            :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
         """
         query = affirm(Query, query)
         aggregate = affirm(bool, aggregate)
+        stream = affirm(bool, stream)
         if query.scope in {QueryScope.assembly_user, QueryScope.all_assembly_users}:
             # Potentially restrict to non-archived users.
             if not query.scope.includes_archived:
@@ -349,7 +413,7 @@ class AssemblyBackend(AbstractBackend):
                 query.spec[f"is_{realm}_realm"] = QuerySpecEntry("bool", "")
         else:
             raise RuntimeError(n_("Bad scope."))
-        return self.general_query(rs, query, aggregate=aggregate)
+        return self.general_query(rs, query, aggregate=aggregate, stream=stream)
 
     @internal
     @access("assembly")
@@ -859,6 +923,41 @@ class AssemblyBackend(AbstractBackend):
                                (assembly_id,), entity_key="assembly_id")
         return {e['id']: e['title'] for e in data}
 
+    @access("assembly")
+    def list_due_ballots(self, rs: RequestState, assembly_id: Optional[int] = None,
+                         is_active: Optional[bool] = None) -> dict[int, int]:
+        """List the ballots which need a state update.
+
+        These are the untallied ballots whose voting period has passed, so they
+        have to be checked for an extension or tallied. This uses an index on the
+        deadline of untallied ballots, so it is cheap if nothing is due.
+
+        :param assembly_id: If given, only list ballots of this assembly.
+        :param is_active: If not None list only ballots of assemblies which have
+          this activity status.
+        :returns: Mapping of ballot ids to the ids of their assemblies.
+        """
+        assembly_id = affirm_optional(vtypes.ID, assembly_id)
+        is_active = affirm_optional(bool, is_active)
+        query = f"""
+            SELECT b.id, b.assembly_id
+            FROM assembly.ballots AS b
+                JOIN assembly.assemblies AS a ON a.id = b.assembly_id
+            WHERE NOT b.is_tallied AND {BALLOT_DEADLINE} < %s
+        """
+        params: list[Any] = [now()]
+        if assembly_id:
+            query += " AND b.assembly_id = %s"
+            params.append(assembly_id)
+        if is_active is not None:
+            query += " AND a.is_active = %s"
+            params.append(is_active)
+        data = self.query_all(rs, query, params)
+        accessible = {anid for anid in {e['assembly_id'] for e in data}
+                      if self.may_access(rs, assembly_id=anid)}
+        return {e['id']: e['assembly_id'] for e in data
+                if e['assembly_id'] in accessible}
+
     @access("assembly")
     def are_ballots_locked(self, rs: RequestState, ballot_ids: Collection[int],
                            ) -> dict[int, bool]:
@@ -1452,40 +1551,60 @@ class AssemblyBackend(AbstractBackend):
         return count_votes
 
     @access("assembly")
-    def get_vote(self, rs: RequestState, ballot_id: int,
-                 secret: Union[str, None]) -> Union[str, None]:
-        """Look up a vote.
+    def get_votes(self, rs: RequestState, ballot_ids: Collection[int],
+                  secret: Union[str, None]) -> dict[int, Union[str, None]]:
+        """Look up votes.
 
         This does not accept a persona_id on purpose.
 
-        It is only allowed to call this if we attend the ballot.
+        It is only allowed to call this if we attend all the ballots.
 
         :param secret: The secret of this user. May be None to signal that the
           stored secret should be used.
-        :returns: The vote if we have voted or None otherwise. Note, that
-          this also returns None, if the secret has been purged after an
-          assembly has concluded.
+        :returns: Mapping of ballot ids to the vote if we have voted or None
+          otherwise. Note, that this also returns None, if the secret has been
+          purged after an assembly has concluded.
         """
-        ballot_id = affirm(vtypes.ID, ballot_id)
+        ballot_ids = affirm_set(vtypes.ID, ballot_ids)
         secret = affirm_optional(vtypes.PrintableASCII, secret)
 
-        if not self.check_attendance(rs, ballot_id=ballot_id):
-            raise PrivilegeError(n_("Must attend the ballot."))
+        query = """
+            SELECT b.id AS ballot_id, v.has_voted, a.secret
+            FROM assembly.ballots AS b
+                JOIN assembly.attendees AS a
+                    ON a.assembly_id = b.assembly_id AND a.persona_id = %s
+                LEFT JOIN assembly.voter_register AS v
+                    ON v.ballot_id = b.id AND v.persona_id = %s
+            WHERE b.id = ANY(%s)
+        """
+        params = (rs.user.persona_id, rs.user.persona_id, ballot_ids)
 
         with Atomizer(rs):
-            has_voted = self.has_voted(rs, ballot_id)
-            if not has_voted:
-                return None
-            if secret is None:
-                ballot = unwrap(self.get_ballots(rs, (ballot_id,)))
-                query = glue("SELECT secret FROM assembly.attendees",
-                             "WHERE assembly_id = %s and persona_id = %s")
-                secret = unwrap(self.query_one(
-                    rs, query, (ballot['assembly_id'], rs.user.persona_id)))
-            if secret is None:
-                return None
-            vote = self.retrieve_vote(rs, ballot_id, secret)
-        return vote['vote']
+            data = self.query_all(rs, query, params)
+            if len(data) != len(ballot_ids):
+                raise PrivilegeError(n_("Must attend the ballot."))
+
+            ret: dict[int, Union[str, None]] = {ballot_id: None
+                                                for ballot_id in ballot_ids}
+            ballots_by_secret: dict[str, set[int]] = {}
+            for e in data:
+                if not e['has_voted']:
+                    continue
+                if ballot_secret := secret or e['secret']:
+                    ballots_by_secret.setdefault(ballot_secret, set()).add(
+                        e['ballot_id'])
+            for ballot_secret, secret_ballot_ids in ballots_by_secret.items():
+                votes = self.retrieve_votes(rs, secret_ballot_ids, ballot_secret)
+                if len(votes) != len(secret_ballot_ids):
+                    raise ValueError(n_("No vote found."))
+                for ballot_id, vote in votes.items():
+                    ret[ballot_id] = vote['vote']
+        return ret
+
+    class _GetVoteProtocol(Protocol):
+        def __call__(self, rs: RequestState, ballot_id: int,
+                     secret: Union[str, None]) -> Union[str, None]: ...
+    get_vote: _GetVoteProtocol = singularize(get_votes, "ballot_ids", "ballot_id")
 
     @access("assembly")
     def get_ballot_result(self, rs: RequestState, ballot_id: int) -> Optional[bytes]:
@@ -1511,10 +1630,19 @@ class AssemblyBackend(AbstractBackend):
                 ret = f.read()
             return ret
 
+    @staticmethod
+    def _write_ballot_result(path: Path, data: str) -> None:
+        """Write a result file, so that it is never seen partially written."""
+        with tempfile.NamedTemporaryFile(
+                'w', encoding='UTF-8', dir=path.parent, delete=False) as f:
+            f.write(data)
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+
     @access("assembly")
-    def tally_ballot(self, rs: RequestState,
-                     ballot_id: int) -> Optional[bytes]:
-        """Evaluate the result of a ballot.
+    def tally_ballots(self, rs: RequestState, ballot_ids: Collection[int],
+                      ) -> dict[int, bytes]:
+        """Evaluate the result of some ballots.
 
         After voting has finished all votes are tallied and a result
         file is produced. This file is then published to guarantee the
@@ -1525,77 +1653,103 @@ class AssemblyBackend(AbstractBackend):
         automatically by everybody when viewing a ballot. It is not
         allowed to call this before voting has actually ended.
 
+        All ballots are tallied in one transaction, retrieving the votes, voters
+        and assemblies of all ballots at once.
+
         We use the Schulze method as documented in the schulze_condorcet
         pypi package.
 
-        :returns: The content of the file if a new result file was created,
-            otherwise None.
+        :returns: Mapping of ballot ids to the content of the newly created result
+            files. Ballots which were already tallied are missing.
         """
-        ballot_id = affirm(vtypes.ID, ballot_id)
+        ballot_ids = affirm_set(vtypes.ID, ballot_ids)
 
-        if not self.may_access(rs, ballot_id=ballot_id):
+        if not all(self.may_access(rs, ballot_id=anid) for anid in ballot_ids):
             raise PrivilegeError(n_("Not privileged."))
 
+        ret: dict[int, bytes] = {}
         with Atomizer(rs):
-            ballot = unwrap(self.get_ballots(rs, (ballot_id,)))
-            if ballot['is_tallied']:
-                return None
-            elif now() < ballot['vote_begin']:
-                raise ValueError(n_("This ballot has not yet begun."))
-            elif self.is_ballot_voting(rs, ballot_id):
-                raise ValueError(n_("Voting is still going on."))
-
-            votes = self.sql_select(
-                rs, "assembly.votes", ("vote", "salt", "hash"), (ballot_id,),
-                entity_key="ballot_id")
-            shortnames = tuple(
-                x['shortname'] for x in ballot['candidates'].values())
-            if ballot['use_bar'] or ballot['votes']:
-                shortnames += (ASSEMBLY_BAR_SHORTNAME,)
-            vote_result = schulze_evaluate([e['vote'] for e in votes], shortnames)
-            update = {
-                'id': ballot_id,
-                'is_tallied': True,
+            ballots = {
+                anid: ballot
+                for anid, ballot in self.get_ballots(rs, ballot_ids).items()
+                if not ballot['is_tallied']
             }
+            if not ballots:
+                return ret
+            reference_time = now()
+            for ballot in ballots.values():
+                if reference_time < ballot['vote_begin']:
+                    raise ValueError(n_("This ballot has not yet begun."))
+                elif ballot['is_voting']:
+                    raise ValueError(n_("Voting is still going on."))
+
+            votes: dict[int, list[CdEDBObject]] = {anid: [] for anid in ballots}
+            for e in self.sql_select(
+                    rs, "assembly.votes", ("ballot_id", "vote", "salt", "hash"),
+                    ballots.keys(), entity_key="ballot_id"):
+                votes[e.pop('ballot_id')].append(e)
+            query = glue("SELECT ballot_id, persona_id FROM assembly.voter_register",
+                         "WHERE ballot_id = ANY(%s) and has_voted = True")
+            voter_ids: dict[int, list[int]] = {anid: [] for anid in ballots}
+            for e in self.query_all(rs, query, (ballots.keys(),)):
+                voter_ids[e['ballot_id']].append(e['persona_id'])
+            personas = self.core.get_personas(
+                rs, set().union(*voter_ids.values()))
+            assemblies = self.get_assemblies(
+                rs, {ballot['assembly_id'] for ballot in ballots.values()})
+
+            query = "UPDATE assembly.ballots SET is_tallied = True WHERE id = ANY(%s)"
             # do not use set_ballot since it would throw an error
-            self.sql_update(rs, "assembly.ballots", update)
-            self.assembly_log(
-                rs, const.AssemblyLogCodes.ballot_tallied,
-                ballot['assembly_id'], change_note=ballot['title'])
+            self.query_exec(rs, query, (ballots.keys(),))
+
+            for ballot in xsorted(ballots.values(), key=EntitySorter.ballot):
+                ballot_id = ballot['id']
+                shortnames = tuple(
+                    x['shortname'] for x in ballot['candidates'].values())
+                if ballot['use_bar'] or ballot['votes']:
+                    shortnames += (ASSEMBLY_BAR_SHORTNAME,)
+                vote_result = schulze_evaluate(
+                    [e['vote'] for e in votes[ballot_id]], shortnames)
+                self.assembly_log(
+                    rs, const.AssemblyLogCodes.ballot_tallied,
+                    ballot['assembly_id'], change_note=ballot['title'])
 
-            # now generate the result file
-            assembly = unwrap(
-                self.get_assemblies(rs, (ballot['assembly_id'],)))
-            candidates = {
-                c['shortname']: c['title']
-                for c in xsorted(ballot['candidates'].values(),
-                                 key=EntitySorter.candidates)
-            }
-            query = glue("SELECT persona_id FROM assembly.voter_register",
-                         "WHERE ballot_id = %s and has_voted = True")
-            voter_ids = self.query_all(rs, query, (ballot_id,))
-            voters = self.core.get_personas(
-                rs, tuple(unwrap(e) for e in voter_ids))
-            voter_names = list(f"{e['given_names']} {e['family_name']}"
-                               for e in xsorted(voters.values(),
-                                                key=EntitySorter.persona))
-            vote_list = xsorted(votes, key=json_serialize)
-            result = {
-                "assembly": assembly['title'],
-                "ballot": ballot['title'],
-                "result": vote_result,
-                "candidates": candidates,
-                "use_bar": ballot['use_bar'],
-                "voters": voter_names,
-                "votes": vote_list,
-            }
-            path = self.get_ballot_file_path(rs, ballot_id)
-            data = json_serialize(result)
-            with open(path, 'w', encoding='UTF-8') as f:
-                f.write(data)
-        ret = data.encode()
+                # now generate the result file
+                candidates = {
+                    c['shortname']: c['title']
+                    for c in xsorted(ballot['candidates'].values(),
+                                     key=EntitySorter.candidates)
+                }
+                voters = (personas[anid] for anid in voter_ids[ballot_id])
+                voter_names = list(f"{e['given_names']} {e['family_name']}"
+                                   for e in xsorted(voters, key=EntitySorter.persona))
+                vote_list = xsorted(votes[ballot_id], key=json_serialize)
+                result = {
+                    "assembly": assemblies[ballot['assembly_id']]['title'],
+                    "ballot": ballot['title'],
+                    "result": vote_result,
+                    "candidates": candidates,
+                    "use_bar": ballot['use_bar'],
+                    "voters": voter_names,
+                    "votes": vote_list,
+                }
+                path = self.get_ballot_file_path(rs, ballot_id)
+                data = json_serialize(result)
+                self._write_ballot_result(path, data)
+                ret[ballot_id] = data.encode()
         return ret
 
+    @access("assembly")
+    def tally_ballot(self, rs: RequestState,
+                     ballot_id: int) -> Optional[bytes]:
+        """Evaluate the result of a ballot, see `tally_ballots`.
+
+        :returns: The content of the file if a new result file was created,
+            otherwise None.
+        """
+        ballot_id = affirm(vtypes.ID, ballot_id)
+        return self.tally_ballots(rs, (ballot_id,)).get(ballot_id)
+
     @access("assembly_admin")
     def conclude_assembly_blockers(self, rs: RequestState,
                                    assembly_id: int) -> DeletionBlockers:
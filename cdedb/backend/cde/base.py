@@ -16,7 +16,8 @@ import dataclasses
 import datetime
 import decimal
 from collections import OrderedDict
-from typing import Optional, Union
+from collections.abc import Iterator
+from typing import Literal, Optional, Union, overload
 
 import psycopg2.extensions
 
@@ -28,6 +29,7 @@ from cdedb.backend.common import (
     affirm_array_validation as affirm_array,
     affirm_dataclass,
     affirm_validation as affirm,
+    affirm_validation_optional as affirm_optional,
 )
 from cdedb.backend.event import EventBackend
 from cdedb.backend.past_event import PastEventBackend
@@ -51,6 +53,7 @@ from cdedb.common.validation.validate import (
     is_optional,
 )
 from cdedb.database.connection import Atomizer
+from cdedb.database.query import DatabaseValue
 from cdedb.filter import money_filter
 
 
@@ -559,14 +562,62 @@ class CdEBaseBackend(AbstractBackend):
             return False, index  # pylint: disable=used-before-assignment
         return True, stats
 
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False,
+                             near_postal_code: Optional[str] = None,
+                             near_radius: Optional[int] = None, *,
+                             stream: Literal[False] = False,
+                             ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False,
+                             near_postal_code: Optional[str] = None,
+                             near_radius: Optional[int] = None, *,
+                             stream: Literal[True],
+                             ) -> Iterator[CdEDBObject]: ...
+
     @access("searchable", "core_admin", "cde_admin")
     def submit_general_query(self, rs: RequestState, query: Query,
-                             aggregate: bool = False) -> tuple[CdEDBObject, ...]:
+                             aggregate: bool = False,
+                             near_postal_code: Optional[str] = None,
+                             near_radius: Optional[int] = None, *,
+                             stream: bool = False,
+                             ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Realm specific wrapper around
         :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.`
+
+        :param near_postal_code: For member searches, restrict to members living
+            within `near_radius` meters of the given german postal code.
+        :param stream: Retrieve the results lazily, see
+            :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
         """
         query = affirm(Query, query)
         aggregate = affirm(bool, aggregate)
+        stream = affirm(bool, stream)
+        near_postal_code = affirm_optional(str, near_postal_code)
+        near_radius = affirm_optional(vtypes.NonNegativeInt, near_radius)
+        view = None
+        view_params: tuple[DatabaseValue, ...] = ()
+        if near_postal_code is not None:
+            if query.scope != QueryScope.cde_member or near_radius is None:
+                raise ValueError(n_("Nearby search needs a member query and radius."))
+            # Filter by distance directly instead of passing all nearby postal
+            # codes back and forth.
+            view = query.scope.get_view() + """
+                INNER JOIN (
+                    SELECT array_agg(near.postal_code) AS postal_codes
+                    FROM core.postal_code_locations AS center,
+                        core.postal_code_locations AS near
+                    WHERE center.postal_code = %s
+                        AND earth_box(center.earth_location, %s) @> near.earth_location
+                        AND earth_distance(
+                            center.earth_location, near.earth_location) < %s
+                ) AS nearby ON personas.postal_code = ANY(nearby.postal_codes)
+                    OR personas.postal_code2 = ANY(nearby.postal_codes)
+                """
+            view_params = (near_postal_code, near_radius, near_radius)
         if query.scope == QueryScope.cde_member:
             if self.core.check_quota(rs, num=1):
                 raise QuotaException(n_("Too many queries."))
@@ -605,7 +656,15 @@ class CdEBaseBackend(AbstractBackend):
                     query.spec[f"is_{realm}_realm"] = QuerySpecEntry("bool", "")
         else:
             raise RuntimeError(n_("Bad scope."))
-        return self.general_query(rs, query, aggregate=aggregate)
+        return self.general_query(rs, query, aggregate=aggregate, view=view,
+                                  view_params=view_params, stream=stream)
+
+    @access("searchable")
+    def is_known_postal_code(self, rs: RequestState, postal_code: str) -> bool:
+        """Whether the location of a german postal code is known for nearby search."""
+        postal_code = affirm(str, postal_code)
+        q = "SELECT COUNT(*) FROM core.postal_code_locations WHERE postal_code = %s"
+        return bool(unwrap(self.query_one(rs, q, (postal_code,))))
 
     @access("searchable")
     def get_nearby_postal_codes(
@@ -618,24 +677,18 @@ class CdEBaseBackend(AbstractBackend):
         postal_code = affirm(str, postal_code)
         radius = affirm(vtypes.NonNegativeInt, radius)
 
+        # The bounding box allows to use the index, the exact distance is checked
+        # afterwards.
         q = """
-            SELECT earth_location
-            FROM core.postal_code_locations
-            WHERE postal_code = %s
-        """
-        data = self.query_all(rs, q, (postal_code,))
-
-        if not data:
-            return []
-        earth_pos = data[0]['earth_location']
-
-        q = """
-            SELECT postal_code
-            FROM core.postal_code_locations
-            WHERE earth_distance(earth_location, %s) < %s
+            SELECT near.postal_code
+            FROM core.postal_code_locations AS center,
+                core.postal_code_locations AS near
+            WHERE center.postal_code = %s
+                AND earth_box(center.earth_location, %s) @> near.earth_location
+                AND earth_distance(center.earth_location, near.earth_location) < %s
         """
         return [
             e['postal_code'] for e in self.query_all(
-                rs, q, (earth_pos, radius),
+                rs, q, (postal_code, radius, radius),
             )
         ]
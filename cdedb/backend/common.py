@@ -12,7 +12,7 @@ import functools
 import logging
 import sys
 import uuid
-from collections.abc import Iterable, Mapping
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
 from types import TracebackType
 from typing import (
     Any,
@@ -41,9 +41,11 @@ from cdedb.common import (
     Role,
     diacritic_patterns,
     make_proxy,
+    normalized_search_pattern,
     setup_logger,
     unwrap,
 )
+from cdedb.common.cache import ExpiringCache
 from cdedb.common.exceptions import PrivilegeError
 from cdedb.common.n_ import n_
 from cdedb.common.query import Query, QueryOperators
@@ -53,6 +55,7 @@ from cdedb.database.connection import Atomizer
 from cdedb.database.constants import FieldDatatypes, LockType
 from cdedb.database.query import DatabaseValue, SqlQueryBackend
 from cdedb.models.common import CdEDataclass
+from cdedb.models.core import EmailAddressReport
 
 F = TypeVar('F', bound=Callable[..., Any])
 LF = TypeVar('LF', bound=GenericLogFilter)
@@ -60,6 +63,12 @@ T = TypeVar('T')
 S = TypeVar('S')
 DC = TypeVar('DC', bound=Union[CdEDataclass, GenericLogFilter])
 
+# The raw content of core.meta_info, shared by the core and the session backend.
+META_INFO_CACHE: ExpiringCache[None, CdEDBObject] = ExpiringCache(max_size=1)
+# The defect address reports of single personas, by persona id.
+DEFECT_ADDRESS_CACHE: ExpiringCache[int, dict[str, EmailAddressReport]] = (
+    ExpiringCache())
+
 
 @overload
 def singularize(function: Callable[..., Mapping[Any, T]],
@@ -271,9 +280,36 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
             # wrong.
             pass
 
+    @overload
+    def general_query(self, rs: RequestState, query: Query,
+                      distinct: bool = True, view: Optional[str] = None,
+                      aggregate: bool = False,
+                      view_params: Sequence[DatabaseValue] = (), *,
+                      stream: Literal[False] = False,
+                      ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def general_query(self, rs: RequestState, query: Query,
+                      distinct: bool = True, view: Optional[str] = None,
+                      aggregate: bool = False,
+                      view_params: Sequence[DatabaseValue] = (), *,
+                      stream: Literal[True],
+                      ) -> Iterator[CdEDBObject]: ...
+
+    @overload
+    def general_query(self, rs: RequestState, query: Query,
+                      distinct: bool = True, view: Optional[str] = None,
+                      aggregate: bool = False,
+                      view_params: Sequence[DatabaseValue] = (), *,
+                      stream: bool,
+                      ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]: ...
+
     def general_query(self, rs: RequestState, query: Query,
                       distinct: bool = True, view: Optional[str] = None,
-                      aggregate: bool = False) -> tuple[CdEDBObject, ...]:
+                      aggregate: bool = False,
+                      view_params: Sequence[DatabaseValue] = (), *,
+                      stream: bool = False,
+                      ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Perform a DB query described by a :py:class:`cdedb.query.Query`
         object.
 
@@ -281,8 +317,14 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
         :param view: Override parameter to specify the target of the FROM
           clause. This is necessary for event stuff and should be used seldom.
         :param aggregate: Perform an aggregation query instead.
+        :param view_params: Parameters for placeholders in the overridden view.
+        :param stream: Retrieve the results lazily via a server-side cursor, see
+          :py:meth:`cdedb.database.query.SqlQueryBackend.query_iter`. This is meant
+          for downloads of large results.
         :returns: all results of the query
         """
+        if stream and aggregate:
+            raise ValueError(n_("Aggregation queries can not be streamed."))
         query.fix_custom_columns()
         self.logger.debug(f"Performing general query {query} (aggregate={aggregate}).")
 
@@ -310,7 +352,10 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
         q, params = self._construct_query(query, distinct=distinct, view=view,
                                           aggregate_select=aggregate_select,
         )
-        data = self.query_all(rs, q, params)
+        # The view precedes all constraints in the query.
+        if stream:
+            return self.query_iter(rs, q, tuple(view_params) + tuple(params))
+        data = self.query_all(rs, q, tuple(view_params) + tuple(params))
 
         if aggregate:
             # we know that all keys are unique, so we put them in a single dict
@@ -330,6 +375,18 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
         params: list[DatabaseValue] = []
         constraints = []
         _ops = QueryOperators
+
+        def prefilter(field: str, terms: Collection[str]) -> None:
+            """Additionally require each term via the trigram index, if possible.
+
+            This does not change the result, but saves the regex for most rows.
+            """
+            if normalized := TRIGRAM_INDEXED_COLUMNS.get(field):
+                for term in terms:
+                    if pattern := normalized_search_pattern(term):
+                        constraints.append(f"{normalized} ~ %s")
+                        params.append(pattern)
+
         for field, operator, value in query.constraints:
             lowercase = query.spec[field].type == "str"
             if lowercase:
@@ -362,6 +419,8 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
                 if operator == _ops.containsnone:
                     constraint = f"NOT ( {constraint} )"
                 constraints.append(constraint)
+                if operator == _ops.containsall:
+                    prefilter(field, value)
                 continue  # skip constraints.append below
             if operator == _ops.empty:
                 if query.spec[field].type == "str":
@@ -430,6 +489,8 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
             else:
                 raise RuntimeError(n_("Impossible."))
             constraints.append(" OR ".join(phrase.format(c) for c in columns))
+            if operator == _ops.match:
+                prefilter(field, (value,))
         where = ""
         if constraints:
             where = f'WHERE ({") AND (".join(constraints)})'
@@ -461,6 +522,11 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
         history).
 
         However this handles the finance_log for financial transactions.
+
+        Pages may be given by offset or, which is cheaper for large logs, relative
+        to a known entry via `before_id` or `after_id`. Without either, the last
+        page is returned. The returned total is only an estimate if it exceeds
+        the `LOG_COUNT_ESTIMATE_THRESHOLD`.
         """
         length = log_filter.length or 0
         offset = log_filter.offset
@@ -470,20 +536,46 @@ class AbstractBackend(SqlQueryBackend, metaclass=abc.ABCMeta):
         columns = log_filter.get_columns_str()
 
         # The first query determines the absolute number of logs existing
-        # matching the given criteria
-        query = f"SELECT COUNT(*) AS count FROM {log_filter.log_table} {condition}"
-        total: int = unwrap(self.query_one(rs, query, params)) or 0
-        if offset and offset > total:
-            # Why you do this
-            return total, tuple()
-        elif offset is None and total > length:
-            offset = length * ((total - 1) // length)
+        # matching the given criteria. For large logs, counting is expensive, so
+        # we use the estimate of the query planner instead.
+        query = (f"EXPLAIN (FORMAT JSON)"
+                 f" SELECT id FROM {log_filter.log_table} {condition}")
+        plan = self.query_one(rs, query, params)
+        assert plan is not None
+        total: int = plan['QUERY PLAN'][0]['Plan']['Plan Rows']
+        exact = total <= self.conf["LOG_COUNT_ESTIMATE_THRESHOLD"]
+        if exact:
+            query = f"SELECT COUNT(*) AS count FROM {log_filter.log_table} {condition}"
+            total = unwrap(self.query_one(rs, query, params)) or 0
 
         # Now, query the actual information
-        query = f"""
-            SELECT {columns} FROM {log_filter.log_table} {condition}
-            ORDER BY id LIMIT {length} {f' OFFSET {offset}' if offset else ''}
-        """
+        keyset_condition, keyset_params = log_filter.to_sql_keyset_condition()
+        if log_filter.after_id is not None:
+            # The entries directly after the given one.
+            query = f"""
+                SELECT {columns} FROM {log_filter.log_table} WHERE {keyset_condition}
+                ORDER BY id LIMIT {length}
+            """
+            params = keyset_params
+        elif log_filter.before_id is not None or (offset is None and not exact):
+            # The entries directly before the given one, or the newest entries.
+            query = f"""
+                SELECT * FROM (
+                    SELECT {columns} FROM {log_filter.log_table}
+                    WHERE {keyset_condition} ORDER BY id DESC LIMIT {length}
+                ) AS page ORDER BY id
+            """
+            params = keyset_params
+        else:
+            if exact and offset and offset > total:
+                # Why you do this
+                return total, tuple()
+            elif offset is None and total > length:
+                offset = length * ((total - 1) // length)
+            query = f"""
+                SELECT {columns} FROM {log_filter.log_table} {condition}
+                ORDER BY id LIMIT {length} {f' OFFSET {offset}' if offset else ''}
+            """
 
         data = self.query_all(rs, query, params)
         for e in data:
@@ -634,20 +726,16 @@ def affirm_array_validation(
     assertion: type[T], values: Iterable[Any], **kwargs: Any,
 ) -> tuple[T, ...]:
     """Wrapper to call asserts in :py:mod:`cdedb.validation` for an array."""
-    return tuple(
-        affirm_validation(assertion, value, **kwargs)
-        for value in values
-    )
+    return tuple(validate.validate_assert_all(
+        assertion, values, ignore_warnings=True, **kwargs))
 
 
 def affirm_set_validation(
     assertion: type[T], values: Iterable[T], **kwargs: Any,
 ) -> set[T]:
     """Wrapper to call asserts in :py:mod:`cdedb.validation` for a set."""
-    return set(
-        affirm_validation(assertion, value, **kwargs)
-        for value in values
-    )
+    return set(validate.validate_assert_all(
+        assertion, values, ignore_warnings=True, **kwargs))
 
 
 def inspect_validation(
@@ -688,3 +776,8 @@ PYTHON_TO_SQL_MAP = {
     FieldDatatypes.datetime: "timestamp with time zone",
     FieldDatatypes.bool: "boolean",
 }
+
+#: Columns with a trigram indexed copy, see `cdedb.common.normalize_fulltext`.
+TRIGRAM_INDEXED_COLUMNS = {
+    "fulltext": "fulltext_normalized",
+}
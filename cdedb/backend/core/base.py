@@ -14,14 +14,17 @@ import collections
 import copy
 import datetime
 import decimal
-from collections.abc import Collection
+import itertools
+from collections.abc import Collection, Iterator, Mapping
 from secrets import token_hex
-from typing import Any, Optional, Protocol, Union, overload
+from typing import Any, Literal, Optional, Protocol, Union, overload
 
 import cdedb.common.validation.types as vtypes
 import cdedb.database.constants as const
 import cdedb.models.core as models
 from cdedb.backend.common import (
+    DEFECT_ADDRESS_CACHE,
+    META_INFO_CACHE,
     AbstractBackend,
     access,
     affirm_array_validation as affirm_array,
@@ -87,6 +90,24 @@ from cdedb.database import DATABASE_ROLES
 from cdedb.database.connection import Atomizer, connection_pool_factory
 from cdedb.models.core import EmailAddressReport
 
+#: Weighted conditions comparing a candidate `c` with an existing persona `p` to
+#: find doppelgangers. Conditions involving a NULL value of `c` never hold.
+DOPPELGANGER_CRITERIA: tuple[tuple[int, str], ...] = (
+    (10, "c.given_names IN (p.given_names, p.display_name)"),
+    (10, "c.family_name IN (p.family_name, p.birth_name)"),
+    (10, "c.birth_name IN (p.family_name, p.birth_name)"),
+    (10, "c.birthday = p.birthday"),
+    (5, "c.location = p.location"),
+    (5, "c.postal_code = p.postal_code"),
+    (20, "c.given_names IN (p.given_names, p.display_name)"
+         " AND c.family_name = p.family_name"),
+    (21, "c.username = p.username"),
+)
+#: Minimal score (exclusive) of a doppelganger.
+DOPPELGANGER_CUTOFF = 21
+#: Maximal number of doppelgangers reported per candidate.
+DOPPELGANGER_MAX_ENTRIES = 7
+
 
 class CoreBaseBackend(AbstractBackend):
     """Access to this is probably necessary from everywhere, so we need
@@ -98,7 +119,9 @@ class CoreBaseBackend(AbstractBackend):
         secrets = SecretsConfig()
         self.connpool = connection_pool_factory(
             self.conf["CDB_DATABASE_NAME"], DATABASE_ROLES,
-            secrets, self.conf["DB_HOST"], self.conf["DB_PORT"])
+            secrets, self.conf["DB_HOST"], self.conf["DB_PORT"],
+            pool_size=self.conf["DB_POOL_SIZE"], max_idle=self.conf["DB_POOL_MAX_IDLE"],
+            timeout=self.conf["DB_POOL_TIMEOUT"])
         # local variable to prevent closure over secrets
         reset_salt = secrets["RESET_SALT"]
         self.generate_reset_cookie = (
@@ -1930,6 +1953,7 @@ class CoreBaseBackend(AbstractBackend):
                     self.core_log(
                         rs, const.CoreLogCodes.username_change, persona_id,
                         change_note=new_username)
+                    DEFECT_ADDRESS_CACHE.invalidate(persona_id)
                     return True, new_username
         return False, n_("Failed.")
 
@@ -2298,6 +2322,8 @@ class CoreBaseBackend(AbstractBackend):
         #  Maybe rework this somehow.
         is_cde = unwrap(self.sql_select_one(rs, "core.personas",
                                             ("is_cde_realm",), data["id"]))
+        # Release the anonymous connection, so it can go back into the pool.
+        rs._conn.close()  # pylint: disable=protected-access
         if is_cde:
             rs.conn = self.connpool['cdb_member']
         else:
@@ -2571,6 +2597,7 @@ class CoreBaseBackend(AbstractBackend):
         finally:
             # deescalate
             if orig_conn:
+                rs.conn.close()
                 rs.conn = orig_conn
         return bool(ret), new_password
 
@@ -2636,6 +2663,7 @@ class CoreBaseBackend(AbstractBackend):
         finally:
             # deescalate
             if orig_conn:
+                rs.conn.close()
                 rs.conn = orig_conn
 
         admin = any(persona[admin] for admin in ADMIN_KEYS)
@@ -2716,49 +2744,82 @@ class CoreBaseBackend(AbstractBackend):
                            persona: CdEDBObject) -> CdEDBObjectMap:
         """Look for accounts with data similar to the passed dataset.
 
+        This is used during genesis to avoid creation of duplicate accounts. For
+        many datasets at once use `find_doppelgangers_batch` instead.
+
+        :returns: A dict of possibly matching account data.
+        """
+        return self.find_doppelgangers_batch(rs, {0: persona})[0]
+
+    @access("core_admin", *(f"{realm}_admin"
+                            for realm in REALM_SPECIFIC_GENESIS_FIELDS))
+    def find_doppelgangers_batch(self, rs: RequestState,
+                                 personas: Mapping[int, CdEDBObject],
+                                 ) -> dict[int, CdEDBObjectMap]:
+        """Look for accounts with data similar to each of the passed datasets.
+
         This is for batch admission, where we may encounter datasets to
         already existing accounts. In that case we do not want to create
-        a new account. It is also used during genesis to avoid creation
-        of duplicate accounts.
+        a new account.
 
-        :returns: A dict of possibly matching account data.
+        All datasets are checked with a single query. Each pair of dataset and
+        account is scored by the criteria in `DOPPELGANGER_CRITERIA`.
+
+        :param personas: The datasets, indexed by an arbitrary key.
+        :returns: For each key a dict of possibly matching account data.
         """
-        persona = affirm(vtypes.Persona, persona, _ignore_warnings=True)
-        if persona['birthday'] == datetime.date.min:
-            persona['birthday'] = None
-        scores: dict[int, int] = collections.defaultdict(lambda: 0)
-        queries: list[tuple[int, str, tuple[Any, ...]]] = [
-            (10, "given_names = %s OR display_name = %s",
-             (persona['given_names'], persona['given_names'])),
-            (10, "family_name = %s OR birth_name = %s",
-             (persona['family_name'], persona['family_name'])),
-            (10, "family_name = %s OR birth_name = %s",
-             (persona['birth_name'], persona['birth_name'])),
-            (10, "birthday = %s", (persona['birthday'],)),
-            (5, "location = %s", (persona['location'],)),
-            (5, "postal_code = %s", (persona['postal_code'],)),
-            (20, "(given_names = %s OR display_name = %s) AND family_name = %s",
-             (persona['given_names'], persona['given_names'], persona['family_name'])),
-            (21, "username = %s", (persona['username'],)),
-        ]
-        # Omit queries where some parameters are None
-        queries = tuple(e for e in queries if all(x is not None for x in e[2]))
-        for score, condition, params in queries:
-            query = f"SELECT id FROM core.personas WHERE {condition}"
-            result = self.query_all(rs, query, params)
-            for e in result:
-                scores[unwrap(e)] += score
-        cutoff = 21
-        max_entries = 7
-        persona_ids = tuple(k for k, v in scores.items() if v > cutoff)
-        persona_ids = xsorted(persona_ids, key=lambda k: -scores.get(k, 0))
-        persona_ids = persona_ids[:max_entries]
+        columns = ("given_names", "family_name", "birth_name", "birthday",
+                   "location", "postal_code", "username")
+        rows = []
+        params: list[Any] = []
+        for key, persona in personas.items():
+            persona = affirm(vtypes.Persona, persona, _ignore_warnings=True)
+            if persona['birthday'] == datetime.date.min:
+                persona['birthday'] = None
+            rows.append(f"(%s::integer, {', '.join(['%s::varchar'] * 3)},"
+                        f" %s::date, {', '.join(['%s::varchar'] * 3)})")
+            params.extend((key, *(persona[column] for column in columns)))
+        if not rows:
+            return {}
+        # Every match above the cutoff coincides in a name, the birthday or the
+        # username, so only pairs equal in one of these are scored at all.
+        blocking = " UNION ".join(
+            f"SELECT c.key, p.id FROM candidates AS c"
+            f" JOIN core.personas AS p ON c.{candidate} = p.{column}"
+            for candidate, column in (
+                ("given_names", "given_names"), ("given_names", "display_name"),
+                ("family_name", "family_name"), ("family_name", "birth_name"),
+                ("birth_name", "family_name"), ("birth_name", "birth_name"),
+                ("birthday", "birthday"), ("username", "username")))
+        score = " + ".join(f"(CASE WHEN {condition} THEN {weight} ELSE 0 END)"
+                           for weight, condition in DOPPELGANGER_CRITERIA)
+        query = f"""
+            WITH candidates(key, {', '.join(columns)}) AS (
+                VALUES {', '.join(rows)}
+            ), pairs AS ({blocking})
+            SELECT * FROM (
+                SELECT c.key, p.id, {score} AS score
+                FROM pairs
+                    JOIN candidates AS c ON pairs.key = c.key
+                    JOIN core.personas AS p ON pairs.id = p.id
+            ) AS scored
+            WHERE score > %s"""
+        params.append(DOPPELGANGER_CUTOFF)
+        scores: dict[int, dict[int, int]] = collections.defaultdict(dict)
+        for e in self.query_all(rs, query, params):
+            scores[e['key']][e['id']] = e['score']
+        matches = {
+            key: xsorted(scores[key], key=lambda k: (-scores[key][k], k))[
+                :DOPPELGANGER_MAX_ENTRIES]
+            for key in personas}
         # Circumvent privilege check, since this is a rather special case.
-        ret = self.retrieve_personas(
-            rs, persona_ids, PERSONA_CORE_FIELDS + ("birthday",))
-        for persona_id, persona_ in ret.items():
+        data = self.retrieve_personas(
+            rs, set(itertools.chain.from_iterable(matches.values())),
+            PERSONA_CORE_FIELDS + ("birthday",))
+        for persona_ in data.values():
             persona_['may_be_edited'] = self._is_relative_admin(rs, persona_)
-        return ret
+        return {key: {anid: data[anid] for anid in persona_ids}
+                for key, persona_ids in matches.items()}
 
     @access("persona")
     def log_anonymous_message(
@@ -2843,11 +2904,19 @@ class CoreBaseBackend(AbstractBackend):
 
         This is a relatively painless way to specify lots of constants
         like who is responsible for donation certificates.
+
+        Since this is needed for every page, it is cached for a short time.
         """
-        query = "SELECT info FROM core.meta_info LIMIT 1"
-        data = unwrap(self.query_one(rs, query, tuple())) or {}
+        data = META_INFO_CACHE.get(
+            None, lambda: self._retrieve_meta_info(rs),
+            self.conf["META_INFO_CACHE_TTL"].total_seconds())
         return {field: data.get(field) for field in META_INFO_FIELDS}
 
+    def _retrieve_meta_info(self, rs: RequestState) -> CdEDBObject:
+        """Uncached version of `get_meta_info`, returning the raw content."""
+        query = "SELECT info FROM core.meta_info LIMIT 1"
+        return unwrap(self.query_one(rs, query, tuple())) or {}
+
     @access("core_admin")
     def set_meta_info(self, rs: RequestState,
                       data: CdEDBObject) -> DefaultReturnCode:
@@ -2856,12 +2925,15 @@ class CoreBaseBackend(AbstractBackend):
         This is expected to occur regularly.
         """
         with Atomizer(rs):
-            meta_info = self.get_meta_info(rs)
+            info = self._retrieve_meta_info(rs)
+            meta_info = {field: info.get(field) for field in META_INFO_FIELDS}
             # Late validation since we need to know the keys
             data = affirm(vtypes.MetaInfo, data, keys=meta_info.keys())
             meta_info.update(data)
             query = "UPDATE core.meta_info SET info = %s"
-            return self.query_exec(rs, query, (PsycoJson(meta_info),))
+            ret = self.query_exec(rs, query, (PsycoJson(meta_info),))
+        META_INFO_CACHE.clear()
+        return ret
 
     @access("anonymous")
     def is_locked_down(self, rs: RequestState) -> bool:
@@ -2893,20 +2965,36 @@ class CoreBaseBackend(AbstractBackend):
                 ret = self.sql_insert(rs, "core.cron_store", update)
         return ret
 
+    @overload
+    def _submit_general_query(self, rs: RequestState, query: Query,
+                              aggregate: bool = False, *,
+                              stream: Literal[False] = False,
+                              ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
     def _submit_general_query(self, rs: RequestState, query: Query,
-                              aggregate: bool = False) -> tuple[CdEDBObject, ...]:
+                              aggregate: bool = False, *, stream: Literal[True],
+                              ) -> Iterator[CdEDBObject]: ...
+
+    def _submit_general_query(self, rs: RequestState, query: Query,
+                              aggregate: bool = False, *, stream: bool = False,
+                              ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Realm specific wrapper around
         :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
+
+        :param stream: Retrieve the results lazily, see
+            :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
         """
         query = affirm(Query, query)
         aggregate = affirm(bool, aggregate)
+        stream = affirm(bool, stream)
         if query.scope == QueryScope.core_user:
             query.constraints.append(("is_archived", QueryOperators.equal, False))
         elif query.scope == QueryScope.all_core_users:
             pass
         else:
             raise RuntimeError(n_("Bad scope."))
-        return self.general_query(rs, query, aggregate=aggregate)
+        return self.general_query(rs, query, aggregate=aggregate, stream=stream)
     submit_general_query = access("core_admin")(_submit_general_query)
 
     @access("persona")
@@ -2962,7 +3050,20 @@ class CoreBaseBackend(AbstractBackend):
     def get_defect_address_reports(
             self, rs: RequestState, persona_ids: Optional[Collection[int]] = None,
     ) -> dict[str, EmailAddressReport]:
+        """Get the defect addresses, see `get_email_reports`.
+
+        The reports of the user themself are needed for every page, so these are
+        cached for a short time.
+        """
         # Input validation and permission checks are delegated
+        if persona_ids is not None and set(persona_ids) == {rs.user.persona_id}:
+            persona_id = rs.user.persona_id
+            assert persona_id is not None
+            return dict(DEFECT_ADDRESS_CACHE.get(
+                persona_id,
+                lambda: self.get_email_reports(
+                    rs, {persona_id}, const.EmailStatus.defect_states()),
+                self.conf["DEFECT_ADDRESS_CACHE_TTL"].total_seconds()))
         return self.get_email_reports(rs, persona_ids,
                                       const.EmailStatus.defect_states())
 
@@ -3044,7 +3145,8 @@ class CoreBaseBackend(AbstractBackend):
             change_note = f"'{address}' als '{status.name}' markiert"
             self.core_log(rs, const.CoreLogCodes.modify_email_status,
                           change_note=change_note)
-            return code
+        DEFECT_ADDRESS_CACHE.clear()
+        return code
 
     @access("core_admin", "ml_admin")
     def remove_email_status(
@@ -3055,5 +3157,7 @@ class CoreBaseBackend(AbstractBackend):
             change_note = f"'{address}' entfernt"
             self.core_log(rs, const.CoreLogCodes.delete_email_status,
                           change_note=change_note)
-            return self.sql_delete_one(rs, EmailAddressReport.database_table,
-                                       address, "address")
+            ret = self.sql_delete_one(rs, EmailAddressReport.database_table,
+                                      address, "address")
+        DEFECT_ADDRESS_CACHE.clear()
+        return ret
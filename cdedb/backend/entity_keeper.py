@@ -10,12 +10,20 @@ to apache or similar.
 
 Depending on the specific use case, one may choose to use one EntityKeeper for each
 individual entity, or for all entities of a specific type.
+
+Commits are written directly as loose git objects instead of invoking git for each
+of them, since the periodic snapshots of all events would otherwise spawn a lot of
+processes. Git itself is only used for setting up a repository and for
+maintenance.
 """
 import datetime
+import hashlib
 import logging
+import os
 import shutil
 import subprocess
 import tempfile
+import zlib
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Optional, Union
@@ -31,6 +39,13 @@ from cdedb.filter import datetime_filter
 # We use whitespace to force column length, so we do not want it to be stripped away.
 tabulate.PRESERVE_WHITESPACE = True
 
+GIT_USER_NAME = "CdE-Datenbank"
+GIT_USER_EMAIL = "datenbank@cde-ev.de"
+GIT_BRANCH = "refs/heads/master"
+# Mirror the heuristic of `git gc --auto`, which estimates the number of loose
+# objects by the content of a single one of the 256 object directories.
+GIT_GC_AUTO_LIMIT = (6700 + 255) // 256
+
 
 class EntityKeeper:
     def __init__(self, conf: Config, directory: PathLike,
@@ -87,8 +102,8 @@ class EntityKeeper:
         full_dir.mkdir(exist_ok=exists_ok)
         # See https://git-scm.com/book/en/v2/Git-on-the-Server-The-Protocols
         self._run(["git", "init", "-b", "master"], cwd=full_dir)
-        self._run(["git", "config", "user.name", "CdE-Datenbank"], cwd=full_dir)
-        self._run(["git", "config", "user.email", "datenbank@cde-ev.de"], cwd=full_dir)
+        self._run(["git", "config", "user.name", GIT_USER_NAME], cwd=full_dir)
+        self._run(["git", "config", "user.email", GIT_USER_EMAIL], cwd=full_dir)
         shutil.move(full_dir / ".git/hooks/post-update.sample",
                     full_dir / ".git/hooks/post-update")
         # Additionally run post-commit since we commit on the repository itself
@@ -118,10 +133,108 @@ class EntityKeeper:
         assert formatted is not None
         return formatted.encode("utf-8")
 
+    def format_git_date(self, dt: datetime.datetime) -> bytes:
+        """Format a datetime as used in the author and committer lines of a commit."""
+        dt = dt.astimezone(self.conf["DEFAULT_TIMEZONE"])
+        return f"{int(dt.timestamp())} {dt.strftime('%z')}".encode()
+
+    @staticmethod
+    def _write_object(git_dir: Path, kind: bytes, data: bytes) -> bytes:
+        """Store a loose object in the git repository, returning its hex sha.
+
+        The object is written to a temporary file first and then moved into place,
+        so concurrent writers of the same object do not interfere.
+        """
+        raw = kind + b" " + str(len(data)).encode() + b"\0" + data
+        sha = hashlib.sha1(raw).hexdigest()
+        path = git_dir / "objects" / sha[:2] / sha[2:]
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+                f.write(zlib.compress(raw))
+            os.chmod(f.name, 0o444)
+            os.replace(f.name, path)
+        return sha.encode()
+
+    @staticmethod
+    def _read_object(git_dir: Path, sha: bytes) -> Optional[bytes]:
+        """Read the content of a loose object, if the object is not packed."""
+        sha_ = sha.decode()
+        try:
+            raw = zlib.decompress(
+                (git_dir / "objects" / sha_[:2] / sha_[2:]).read_bytes())
+        except FileNotFoundError:
+            return None
+        return raw.split(b"\0", 1)[1]
+
+    @staticmethod
+    def _read_ref(git_dir: Path) -> Optional[bytes]:
+        """Retrieve the commit the branch points to, if there is any."""
+        try:
+            return (git_dir / GIT_BRANCH).read_bytes().strip()
+        except FileNotFoundError:
+            pass
+        # After `git gc` the ref may only be available in packed form.
+        try:
+            packed = (git_dir / "packed-refs").read_bytes()
+        except FileNotFoundError:
+            return None
+        for line in packed.splitlines():
+            if line.endswith(b" " + GIT_BRANCH.encode()):
+                return line.split(b" ", 1)[0]
+        return None
+
+    def _read_commit_header(self, full_dir: Path, commit_sha: bytes,
+                            key: bytes) -> bytes:
+        """Retrieve a header line like the tree of a commit, without the key."""
+        commit = self._read_object(full_dir / ".git", commit_sha)
+        if commit is None:
+            # Fall back to git if the commit is packed.
+            commit = self._run(["git", "cat-file", "commit", commit_sha],
+                               cwd=full_dir).stdout
+        for line in commit.split(b"\n\n", 1)[0].splitlines():
+            if line.startswith(key + b" "):
+                return line[len(key) + 1:]
+        raise ValueError(f"Commit {commit_sha!r} without {key!r}.")
+
+    @staticmethod
+    def _clean_message(paragraphs: Sequence[bytes]) -> bytes:
+        """Assemble a commit message like `git commit -m ... -m ...` would do.
+
+        This is the "whitespace" cleanup of git: Trailing whitespace is removed,
+        consecutive empty lines are collapsed, and leading and trailing empty lines
+        are removed.
+        """
+        lines: list[bytes] = []
+        for line in b"\n\n".join(paragraphs).splitlines():
+            line = line.rstrip()
+            if line or (lines and lines[-1]):
+                lines.append(line)
+        while lines and not lines[-1]:
+            lines.pop()
+        return b"\n".join(lines) + b"\n"
+
+    def _maintain(self, full_dir: Path, commit_sha: bytes) -> None:
+        """Keep the repository servable and run garbage collection if needed.
+
+        This replaces the hooks, which are not invoked since we do not use git for
+        committing.
+        """
+        git_dir = full_dir / ".git"
+        info = git_dir / "info" / "refs"
+        info.parent.mkdir(exist_ok=True)
+        tmp = info.with_suffix(".tmp")
+        tmp.write_bytes(commit_sha + b"\t" + GIT_BRANCH.encode() + b"\n")
+        os.replace(tmp, info)
+        sample = git_dir / "objects" / "17"
+        if sample.is_dir() and len(os.listdir(sample)) > GIT_GC_AUTO_LIMIT:
+            self._run(["git", "gc", "--auto", "--quiet"], cwd=full_dir, check=False)
+            self._run(["git", "update-server-info"], cwd=full_dir, check=False)
+
     def commit(self, entity_id: int, file_text: str, commit_msg: str,
                author_name: str = "", author_email: str = "", *,
                may_drop: bool = True, logs: Optional[Sequence[CdEDBObject]] = None,
-               ) -> Optional[subprocess.CompletedProcess[bytes]]:
+               ) -> Optional[str]:
         """Commit a single file representing an entity to a git repository.
 
         In contrast to its friends, we allow some wiggle room for errors here right now
@@ -130,56 +243,67 @@ class EntityKeeper:
 
         :param may_drop: If true, this commit may be dropped if empty. If false, an
             empty commit is made if needed. May not be true for initial commit.
-        :returns: Representation of the finished commit, if one was done, else None
+        :returns: The sha of the new commit, if one was done, else None
         """
         entity_id = affirm(int, entity_id)
         file_text = affirm(vtypes.StringType, file_text)
         commit_msg = affirm(str, commit_msg)
         full_dir = self._dir / str(entity_id)
+        git_dir = full_dir / ".git"
         filename = f"{entity_id}.json"
 
-        # Write to a file in a temporary directory, in order to be thread safe.
-        with tempfile.TemporaryDirectory() as t:
-            td = Path(t)
-            (td / filename).write_text(file_text)
-            # Declare the temporary directory to be the working tree, and specify the
-            # actual git directory.
-            self._run(["git", f"--work-tree={td}", "add", td / filename], cwd=full_dir)
-            # Then commit everything as if we were in the repository directory.
-            commit: list[Union[PathLike, bytes]]
-            commit = ["git", "-C", full_dir, "commit", "-m", commit_msg.encode("utf8")]
-            if logs and (formated_logs := self._format_logs(logs)):
-                commit.append("-m")
-                commit.append(formated_logs)
-                # set the date of the commit to the ctime of the latest log entry
-                commit.extend([
-                    "--date", self.format_datetime(logs[-1][self.log_timestamp_key]),
-                ])
-            else:
-                # explicitly set commit date. Allows mocking time for testing.
-                commit.extend([
-                    "--date", self.format_datetime(now()),
-                ])
-            if author_name or author_email:
-                commit.append("--author")
-                commit.append(f"{author_name} <{author_email}>".encode())
-
-            # Take care of potential empty commits
-            if may_drop:
-                # git diff-index reports whether the working directory is clean using
-                # its exit code. If the dir is clean it returns 0, and 1 otherwise.
-                # Does not work for the initial commit since HEAD is not defined yet.
-                completed = self._run(
-                    ["git", f"--work-tree={td}", "diff-index", "--exit-code", "HEAD"],
-                    cwd=full_dir, check=None)
-                if completed.returncode == 0:
-                    return None
-            if not may_drop:
-                commit.append("--allow-empty")
+        blob = self._write_object(git_dir, b"blob", file_text.encode("utf-8"))
+        tree = self._write_object(
+            git_dir, b"tree",
+            b"100644 " + filename.encode() + b"\0" + bytes.fromhex(blob.decode()))
+
+        paragraphs = [commit_msg.encode("utf8")]
+        if logs and (formated_logs := self._format_logs(logs)):
+            paragraphs.append(formated_logs)
+            # set the date of the commit to the ctime of the latest log entry
+            date = self.format_git_date(logs[-1][self.log_timestamp_key])
+        else:
+            # explicitly set commit date. Allows mocking time for testing.
+            date = self.format_git_date(now())
+        committer = f"{GIT_USER_NAME} <{GIT_USER_EMAIL}>".encode()
+        author = committer
+        if author_name or author_email:
+            author = f"{author_name} <{author_email}>".encode()
 
-            # Do not check here such that an error does not drag the whole request down
-            # In particular, this is expected for empty commits.
-            return self._run(commit, check=False)
+        # Lock the branch like git does, so concurrent commits do not get lost.
+        lock = git_dir / (GIT_BRANCH + ".lock")
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except OSError as e:
+            # Do not raise here such that an error does not drag the whole request
+            # down.
+            self.logger.error("Could not lock %s: %s", lock, e)
+            return None
+        try:
+            header = [b"tree " + tree]
+            if parent := self._read_ref(git_dir):
+                # Take care of potential empty commits
+                if may_drop and self._read_commit_header(
+                        full_dir, parent, b"tree") == tree:
+                    return None
+                header.append(b"parent " + parent)
+            header.append(b"author " + author + b" " + date)
+            header.append(b"committer " + committer + b" "
+                          + self.format_git_date(now()))
+            commit = self._write_object(
+                git_dir, b"commit",
+                b"\n".join(header) + b"\n\n" + self._clean_message(paragraphs))
+            os.write(fd, commit + b"\n")
+            os.close(fd)
+            fd = -1
+            os.replace(lock, git_dir / GIT_BRANCH)
+        finally:
+            if fd >= 0:
+                os.close(fd)
+                lock.unlink()
+        self.logger.debug("Committed %s to %s.", commit.decode(), full_dir)
+        self._maintain(full_dir, commit)
+        return commit.decode()
 
     def latest_logtime(self, entity_id: int) -> Optional[datetime.datetime]:
         """Retrieve the ctime of the latest log entry.
@@ -189,19 +313,17 @@ class EntityKeeper:
         """
         entity_id = affirm(int, entity_id)
         full_dir = self._dir / str(entity_id)
-        # This has a non-zero exit code if HEAD does not point to any commit. This is
-        # the case if there are no commits present yet.
-        if self._run(["git", "rev-parse", "HEAD"],
-                     check=False, cwd=full_dir).returncode:
+        # There is no commit yet.
+        if not (head := self._read_ref(full_dir / ".git")):
             return None
-        # get the timestamp of the last commit in ISO 8601 format
-        # Important: Use "%ad" instead of "%cd" to use the date excplicitly set when
-        #  committing, rather than the time of the commit.
-        response = self._run(["git", "show", "-s", "--format=%ad",
-                              "--date=iso-strict-local", "HEAD"], cwd=full_dir)
-        # the response contains a \n
-        timestamp = response.stdout.decode("utf-8").strip()
-        return datetime.datetime.fromisoformat(timestamp)
+        # Important: Use the author date instead of the committer date to use the
+        #  date explicitly set when committing, rather than the time of the commit.
+        author = self._read_commit_header(full_dir, head, b"author")
+        timestamp, offset = author.rsplit(b" ", 2)[1:]
+        sign = -1 if offset.startswith(b"-") else 1
+        tz = datetime.timezone(sign * datetime.timedelta(
+            hours=int(offset[1:3]), minutes=int(offset[3:5])))
+        return datetime.datetime.fromtimestamp(int(timestamp), tz)
 
     def _format_logs(self, logs: Sequence[CdEDBObject]) -> Optional[bytes]:
         if not self.log_keys:
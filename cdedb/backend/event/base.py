@@ -18,6 +18,7 @@ import collections
 import copy
 import datetime
 import decimal
+import time
 from collections.abc import Collection, Iterable
 from pathlib import Path
 from typing import Any, Optional, Protocol
@@ -1501,6 +1502,7 @@ class EventBaseBackend(EventLowLevelBackend):
     @access("event")
     def event_keeper_commit(self, rs: RequestState, event_id: int, commit_msg: str, *,
                             after_change: bool = False, is_initial: bool = False,
+                            is_periodic: bool = False,
                             ) -> Optional[CdEDBObject]:
         """Commit the current state of the event to its git repository.
 
@@ -1514,6 +1516,8 @@ class EventBaseBackend(EventLowLevelBackend):
 
         :param after_change: Only true for commits taken after a relevant change.
         :param is_initial: Only true for the first commit to the event keeper.
+        :param is_periodic: Only true for commits of the periodic cron job. These log
+            how long the export took and how large it is.
         :returns: The partial export or None. None may only be returned if the commit
             may be dropped.
         """
@@ -1525,8 +1529,14 @@ class EventBaseBackend(EventLowLevelBackend):
             logs = self._process_event_keeper_logs(rs, event_id)
             if logs is None and may_drop:
                 return None
+            start = time.monotonic()
             export = self.partial_export_event(rs, event_id)
         del export['timestamp']
+        file_text = json_serialize(export, sort_keys=True)
+        if is_periodic:
+            self.logger.info(
+                f"Exported event {event_id} for the event keeper in"
+                f" {time.monotonic() - start:.2f}s ({len(file_text)} bytes).")
         author_name = author_email = ""
         if rs.user.persona_id:
             persona = {"display_name": rs.user.display_name,
@@ -1535,10 +1545,26 @@ class EventBaseBackend(EventLowLevelBackend):
             author_name = make_persona_name(persona)
             author_email = rs.user.username
         self._event_keeper.commit(
-            event_id, json_serialize(export, sort_keys=True), commit_msg, author_name,
-            author_email, may_drop=may_drop, logs=logs)
+            event_id, file_text, commit_msg, author_name, author_email,
+            may_drop=may_drop, logs=logs)
         return export
 
+    @access("event_admin")
+    def get_event_log_watermarks(self, rs: RequestState, event_ids: Collection[int],
+                                 ) -> dict[int, int]:
+        """Retrieve the id of the latest log entry of each event.
+
+        This allows to cheaply detect whether anything happened to an event since
+        an earlier point in time. Events without log entries are mapped to zero.
+        """
+        event_ids = affirm_set(vtypes.ID, event_ids)
+        query = """
+            SELECT e.id AS event_id,
+                (SELECT MAX(id) FROM event.log WHERE event_id = e.id) AS log_id
+            FROM unnest(%s::integer[]) AS e(id)"""
+        data = self.query_all(rs, query, (list(event_ids),))
+        return {e['event_id']: e['log_id'] or 0 for e in data}
+
     @internal
     def _process_event_keeper_logs(self, rs: RequestState,
                                    event_id: int) -> Optional[tuple[CdEDBObject, ...]]:
@@ -4,8 +4,8 @@
 The `EventQueryBackend` subclasses the `EventBaseBackend` and provides functionality
 for querying information about an event aswell as storing and retrieving such queries.
 """
-from collections.abc import Collection
-from typing import Optional
+from collections.abc import Collection, Hashable, Iterator
+from typing import Callable, Literal, Optional, Union, overload
 
 import cdedb.common.validation.types as vtypes
 import cdedb.database.constants as const
@@ -25,6 +25,7 @@ from cdedb.common import (
     RequestState,
     json_serialize,
 )
+from cdedb.common.cache import ExpiringCache
 from cdedb.common.exceptions import PrivilegeError
 from cdedb.common.fields import (
     COURSE_FIELDS,
@@ -58,18 +59,57 @@ def _get_field_select_columns(fields: models.CdEDataclassMap[models.EventField],
     )
 
 
+# The SQL of the views for the event specific query scopes, see `_query_view_key`.
+_QUERY_VIEW_CACHE: ExpiringCache[tuple[Hashable, ...], str] = ExpiringCache(
+    max_size=128)
+
+
+def _query_view_key(scope: QueryScope, event: models.Event) -> tuple[Hashable, ...]:
+    """Construct the cache key for the view of an event specific query scope.
+
+    The views only depend on the parts, tracks, custom datafields and personalized
+    fees of the event. Since all of these are part of the key, a changed event gets
+    a new view right away, even if the change was made by another process.
+    """
+    return (
+        scope, event.id,
+        tuple(sorted(event.parts)),
+        tuple(sorted((track.id, track.part_id, track.num_choices)
+                     for track in event.tracks.values())),
+        tuple(sorted((field.field_name, field.kind, field.association)
+                     for field in event.fields.values())),
+        tuple(sorted(fee.id for fee in event.fees.values() if fee.is_personalized())),
+    )
+
+
 class EventQueryBackend(EventBaseBackend):  # pylint: disable=abstract-method
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             event_id: Optional[int] = None, aggregate: bool = False,
+                             *, stream: Literal[False] = False,
+                             ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             event_id: Optional[int] = None, aggregate: bool = False,
+                             *, stream: Literal[True],
+                             ) -> Iterator[CdEDBObject]: ...
+
     @access("event", "core_admin", "ml_admin")
     def submit_general_query(self, rs: RequestState, query: Query,
                              event_id: Optional[int] = None, aggregate: bool = False,
-                             ) -> tuple[CdEDBObject, ...]:
+                             *, stream: bool = False,
+                             ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Realm specific wrapper around
         :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.`
 
         :param event_id: For registration queries, specify the event.
+        :param stream: Retrieve the results lazily, see
+            :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
         """
         query = affirm(Query, query)
         aggregate = affirm(bool, aggregate)
+        stream = affirm(bool, stream)
         view = None
         if query.scope == QueryScope.registration:
             event_id = affirm(vtypes.ID, event_id)
@@ -289,7 +329,7 @@ class EventQueryBackend(EventBaseBackend):  # pylint: disable=abstract-method
                 """
 
             # Step 7: Construct the final view.
-            view = registration_view_template()
+            view = self._get_query_view(query.scope, event, registration_view_template)
         elif query.scope == QueryScope.quick_registration:
             event_id = affirm(vtypes.ID, event_id)
             if (not self.is_orga(rs, event_id=event_id)
@@ -488,7 +528,7 @@ class EventQueryBackend(EventBaseBackend):  # pylint: disable=abstract-method
                     GROUP BY base_id
                 """
 
-            view = course_view()
+            view = self._get_query_view(query.scope, event, course_view)
         elif query.scope == QueryScope.lodgement:
             event_id = affirm(vtypes.ID, event_id)
             assert event_id is not None
@@ -663,10 +703,22 @@ class EventQueryBackend(EventBaseBackend):  # pylint: disable=abstract-method
                 GROUP BY tmp_group_id
             """
 
-            view = lodgement_view()
+            view = self._get_query_view(query.scope, event, lodgement_view)
         else:
             raise RuntimeError(n_("Bad scope."), query.scope)
-        return self.general_query(rs, query, view=view, aggregate=aggregate)
+        return self.general_query(rs, query, view=view, aggregate=aggregate,
+                                  stream=stream)
+
+    def _get_query_view(self, scope: QueryScope, event: models.Event,
+                        construct: Callable[[], str]) -> str:
+        """Retrieve the view for an event specific query scope from the cache.
+
+        Building the view is fairly involved for large events and orgas tend to
+        query the same event over and over again.
+        """
+        return _QUERY_VIEW_CACHE.get(
+            _query_view_key(scope, event), construct,
+            self.conf["QUERY_VIEW_CACHE_TTL"].total_seconds())
 
     @access("event")
     def get_event_queries(self, rs: RequestState, event_id: int,
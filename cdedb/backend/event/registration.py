@@ -1356,16 +1356,29 @@ class EventRegistrationBackend(EventBaseBackend):
                           ) -> dict[int, decimal.Decimal]:
         """List the remaining amount owed for every registration of the given user."""
         persona_id = affirm(vtypes.ID, persona_id)
+        return self.list_many_amounts_owed(rs, (persona_id,))[persona_id]
+
+    @access("finance_admin")
+    def list_many_amounts_owed(self, rs: RequestState, persona_ids: Collection[int],
+                               ) -> dict[int, dict[int, decimal.Decimal]]:
+        """Batched version of `list_amounts_owed`.
+
+        :returns: Mapping of persona ids to mappings of event ids to the remaining
+            amount owed for the respective registration.
+        """
+        persona_ids = affirm_set(vtypes.ID, persona_ids)
         query = f"""
-            SELECT event_id, amount_owed - amount_paid AS amount
+            SELECT persona_id, event_id, amount_owed - amount_paid AS amount
             FROM {models.Registration.database_table}
-            WHERE persona_id = %s
+            WHERE persona_id = ANY(%s)
         """
-        params = [persona_id]
+        params = [persona_ids]
 
-        return {
-            e['event_id']: e['amount'] for e in self.query_all(rs, query, params)
-        }
+        ret: dict[int, dict[int, decimal.Decimal]] = {
+            persona_id: {} for persona_id in persona_ids}
+        for e in self.query_all(rs, query, params):
+            ret[e['persona_id']][e['event_id']] = e['amount']
+        return ret
 
     @access("finance_admin")
     def get_amount_owed(self, rs: RequestState, persona_id: int, event_id: int,
@@ -1408,8 +1421,7 @@ class EventRegistrationBackend(EventBaseBackend):
         """Helper to only calculate return the fee amount for a single registration."""
         return self._calculate_complex_fee(rs, reg, event=event).amount
 
-    @staticmethod
-    def _calculate_complex_fee(rs: RequestState, reg: CdEDBObject, *,
+    def _calculate_complex_fee(self, rs: RequestState, reg: CdEDBObject, *,
                                event: models.Event, visual_debug: bool = False,
                                ) -> ComplexRegistrationFee:
         """Helper function to calculate the fee for one registration.
@@ -1418,61 +1430,78 @@ class EventRegistrationBackend(EventBaseBackend):
         so we take the full registration and event as input instead of
         retrieving them via id.
 
-        For the set of parts the registration has to pay for, every subset is checked.
-        If the subset does not violate any MEP constraints, the total of all it's parts'
-        fees is calculated. The final fee will be the maximum of all such totals.
+        :param visual_debug: If True, create a html representation of the
+            evaluated condition.
+        """
+        return self._calculate_complex_fees(
+            rs, {reg.get('id', -1): reg}, event=event,
+            visual_debug=visual_debug).popitem()[1]
+
+    def _calculate_complex_fees(self, rs: RequestState, regs: CdEDBObjectMap, *,
+                                event: models.Event, visual_debug: bool = False,
+                                ) -> dict[int, ComplexRegistrationFee]:
+        """Helper function to calculate the fees for many registrations of one event.
+
+        Every conditional fee is evaluated for all registrations at once, using the
+        compiled condition.
 
         :param visual_debug: If True, create a html representation of the
             evaluated condition.
         """
-        reg_part_involvement = {
-            event.parts[part_id].shortname: rp['status'].has_to_pay()
-            for part_id, rp in reg['parts'].items()
-        }
-        reg_bool_fields = {
-            str(f.field_name): reg['fields'].get(f.field_name, False)
-            for f in event.fields.values()
-            if f.association == const.FieldAssociations.registration
-               and f.kind == const.FieldDatatypes.bool
-        }
-        # Other bools can be added here, but also require adjustment to the parser.
-        other_bools = {
-            'is_orga': reg.get('is_orga', reg['persona_id'] in event.orgas),
-            'is_member': reg['is_member'],
-            'any_part': any(reg_part_involvement.values()),
-            'all_parts': all(reg_part_involvement.values()),
+        inputs = []
+        for reg in regs.values():
+            reg_part_involvement = {
+                event.parts[part_id].shortname: rp['status'].has_to_pay()
+                for part_id, rp in reg['parts'].items()
+            }
+            reg_bool_fields = {
+                str(f.field_name): reg['fields'].get(f.field_name, False)
+                for f in event.fields.values()
+                if f.association == const.FieldAssociations.registration
+                   and f.kind == const.FieldDatatypes.bool
+            }
+            # Other bools can be added here, but also require adjustment to the parser.
+            other_bools = {
+                'is_orga': reg.get('is_orga', reg['persona_id'] in event.orgas),
+                'is_member': reg['is_member'],
+                'any_part': any(reg_part_involvement.values()),
+                'all_parts': all(reg_part_involvement.values()),
+            }
+            inputs.append((reg_bool_fields, reg_part_involvement, other_bools))
+
+        ret = {
+            reg_id: ComplexRegistrationFee(
+                amount=decimal.Decimal(0), active_fees=set(), visual_debug={},
+                by_kind=defaultdict(decimal.Decimal),
+            )
+            for reg_id in regs
         }
-        amount = decimal.Decimal(0)
-        active_fees = set()
-        fees_by_kind: dict[const.EventFeeType, decimal.Decimal] = defaultdict(
-            decimal.Decimal)
-        visual_debug_data: dict[int, str] = {}
         for fee in event.fees.values():
             if fee.is_conditional():
                 assert fee.amount is not None
-                parse_result = fcp_parsing.parse(fee.condition)
-                if fcp_evaluation.evaluate(
-                        parse_result, reg_bool_fields, reg_part_involvement,
-                        other_bools):
-                    amount += fee.amount
-                    active_fees.add(fee.id)
-                    fees_by_kind[fee.kind] += fee.amount
+                assert fee.condition is not None
+                evaluator = fcp_evaluation.compile_condition(fee.condition)
+                for reg_id, active in zip(ret, evaluator(inputs)):
+                    if active:
+                        complex_fee = ret[reg_id]
+                        complex_fee.amount += fee.amount
+                        complex_fee.active_fees.add(fee.id)
+                        complex_fee.by_kind[fee.kind] += fee.amount
                 if visual_debug:
-                    visual_debug_data[fee.id] = fcp_roundtrip.visual_debug(
-                        parse_result, reg_bool_fields, reg_part_involvement,
-                        other_bools,
-                    )[1]
+                    parse_result = fcp_parsing.parse(fee.condition)
+                    for reg_id, reg_inputs in zip(ret, inputs):
+                        ret[reg_id].visual_debug[fee.id] = fcp_roundtrip.visual_debug(
+                            parse_result, *reg_inputs)[1]
             else:
-                personalized_amount = reg['personalized_fees'].get(fee.id)
-                if personalized_amount is not None:
-                    amount += personalized_amount
-                    active_fees.add(fee.id)
-                    fees_by_kind[fee.kind] += personalized_amount
-
-        return ComplexRegistrationFee(
-            amount=amount, active_fees=active_fees,
-            visual_debug=visual_debug_data, by_kind=fees_by_kind,
-        )
+                for reg_id, reg in regs.items():
+                    personalized_amount = reg['personalized_fees'].get(fee.id)
+                    if personalized_amount is not None:
+                        complex_fee = ret[reg_id]
+                        complex_fee.amount += personalized_amount
+                        complex_fee.active_fees.add(fee.id)
+                        complex_fee.by_kind[fee.kind] += personalized_amount
+
+        return ret
 
     @access("event")
     def precompute_fee(self, rs: RequestState, event_id: int, persona_id: Optional[int],
@@ -1575,9 +1604,8 @@ class EventRegistrationBackend(EventBaseBackend):
 
             event = self.get_event(rs, event_id)
 
-            ret: dict[int, decimal.Decimal] = {}
-            for reg_id, reg in regs.items():
-                ret[reg_id] = self._calculate_single_fee(rs, reg, event=event)
+            complex_fees = self._calculate_complex_fees(rs, regs, event=event)
+            ret = {reg_id: fee.amount for reg_id, fee in complex_fees.items()}
         return ret
 
     class _CalculateFeeProtocol(Protocol):
@@ -1609,8 +1637,10 @@ class EventRegistrationBackend(EventBaseBackend):
             # Create an entry in the defaultdict.
             kind_stats = stats[fee.kind]  # noqa: F841
 
-        for reg in self.get_registrations(rs, reg_ids).values():
-            complex_fee = self._calculate_complex_fee(rs, reg, event=event)
+        regs = self.get_registrations(rs, reg_ids)
+        complex_fees = self._calculate_complex_fees(rs, regs, event=event)
+        for reg_id, reg in regs.items():
+            complex_fee = complex_fees[reg_id]
 
             if reg['amount_owed'] > reg['amount_paid']:
                 if reg['amount_paid']:
@@ -4,8 +4,8 @@
 event and assembly realm in the form of specific mailing lists.
 """
 import itertools
-from collections.abc import Collection
-from typing import Any, Optional, Protocol, overload
+from collections.abc import Collection, Hashable, Iterator
+from typing import Any, Literal, Optional, Protocol, Union, overload
 
 import subman
 
@@ -13,6 +13,7 @@ import cdedb.common.validation.types as vtypes
 import cdedb.database.constants as const
 from cdedb.backend.assembly import AssemblyBackend
 from cdedb.backend.common import (
+    DEFECT_ADDRESS_CACHE,
     AbstractBackend,
     access,
     affirm_array_validation as affirm_array,
@@ -44,14 +45,39 @@ from cdedb.models.ml import (
     AssemblyAssociatedMailinglist,
     BackendContainer,
     EventAssociatedMeta as EventAssociatedMetaMailinglist,
+    ImplicitsSubscribableMeta,
     Mailinglist,
     MLType,
+    SubscriptionInputChanges,
     get_ml_type,
 )
 from cdedb.uncommon.submanshim import SubscriptionAction, SubscriptionPolicy
 
 SubStates = Collection[const.SubscriptionState]
 
+# The logs recording changes to the inputs of the subscription states.
+SUBSCRIPTION_INPUT_LOGS = (
+    "core.changelog", "core.log", "event.log", "assembly.log", "ml.log")
+
+# The logs recording changes to the inputs of the mailman sync, besides the changes
+# of the subscribers which are tracked in ml.subscription_changes.
+MAILMAN_SYNC_INPUT_LOGS = ("core.changelog", "core.log", "ml.log")
+
+# The codes of core.log entries which may have changed the defect addresses.
+EMAIL_STATUS_LOG_CODES = {
+    const.CoreLogCodes.modify_email_status,
+    const.CoreLogCodes.delete_email_status,
+}
+
+# The codes of ml.log entries which may have changed the moderators of any list.
+MODERATOR_LOG_CODES = {
+    const.MlLogCodes.list_created,
+    const.MlLogCodes.list_changed,
+    const.MlLogCodes.list_deleted,
+    const.MlLogCodes.moderator_added,
+    const.MlLogCodes.moderator_removed,
+}
+
 
 class MlBackend(AbstractBackend):
     """Take note of the fact that some personas are moderators and thus have
@@ -255,21 +281,36 @@ class MlBackend(AbstractBackend):
         :param atomized: Whether this function should enforce an atomized context
             to be present.
         """
-        if rs.is_quiet:
+        return self.ml_log_many(rs, code, [(mailinglist_id, persona_id)],
+                                change_note=change_note, atomized=atomized)
+
+    def ml_log_many(self, rs: RequestState, code: const.MlLogCodes,
+                    entries: Collection[tuple[Optional[int], Optional[int]]],
+                    change_note: Optional[str] = None, atomized: bool = True,
+                    ) -> DefaultReturnCode:
+        """Make several entries with the same code in the log at once.
+
+        :param entries: Pairs of mailinglist id and persona id, one for each entry.
+        :param atomized: Whether this function should enforce an atomized context
+            to be present.
+        """
+        if rs.is_quiet or not entries:
             return 0
         # To ensure logging is done if and only if the corresponding action happened,
         # we require atomization by default.
         if atomized:
             self.affirm_atomized_context(rs)
-        new_log = {
-            "code": code,
-            "mailinglist_id": mailinglist_id,
-            "submitted_by": rs.user.persona_id,
-            "persona_id": persona_id,
-            "change_note": change_note,
-
-        }
-        return self.sql_insert(rs, "ml.log", new_log)
+        new_logs = [
+            {
+                "code": code,
+                "mailinglist_id": mailinglist_id,
+                "submitted_by": rs.user.persona_id,
+                "persona_id": persona_id,
+                "change_note": change_note,
+            }
+            for mailinglist_id, persona_id in entries
+        ]
+        return self.sql_insert_many(rs, "ml.log", new_logs)
 
     @access("ml", "auditor")
     def retrieve_log(self, rs: RequestState, log_filter: MlLogFilter) -> CdEDBLog:
@@ -297,14 +338,30 @@ class MlBackend(AbstractBackend):
             raise PrivilegeError(n_("Not privileged."))
         return self.generic_retrieve_log(rs, log_filter)
 
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False, *,
+                             stream: Literal[False] = False,
+                             ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False, *, stream: Literal[True],
+                             ) -> Iterator[CdEDBObject]: ...
+
     @access("core_admin", "ml_admin")
     def submit_general_query(self, rs: RequestState, query: Query,
-                             aggregate: bool = False) -> tuple[CdEDBObject, ...]:
+                             aggregate: bool = False, *, stream: bool = False,
+                             ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Realm specific wrapper around
         :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.`
+
+        :param stream: Retrieve the results lazily, see
+            :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
         """
         query = affirm(Query, query)
         aggregate = affirm(bool, aggregate)
+        stream = affirm(bool, stream)
         if query.scope in {QueryScope.ml_user, QueryScope.all_ml_users}:
             # Potentially restrict to non-archived users.
             if not query.scope.includes_archived:
@@ -321,7 +378,7 @@ class MlBackend(AbstractBackend):
                 query.spec[f"is_{realm}_realm"] = QuerySpecEntry("bool", "")
         else:
             raise RuntimeError(n_("Bad scope."))
-        return self.general_query(rs, query, aggregate=aggregate)
+        return self.general_query(rs, query, aggregate=aggregate, stream=stream)
 
     @access("ml")
     def list_mailinglists(self, rs: RequestState, active_only: bool = True,
@@ -832,10 +889,11 @@ class MlBackend(AbstractBackend):
                 num += self._remove_subscriptions(rs, remove_data)
 
             if set_data:
-                if not all(datum['persona_id'] == rs.user.persona_id
-                           or self.may_manage(rs, datum['mailinglist_id'],
-                                              allow_restricted=False)
-                           for datum in set_data):
+                # Check privileges only once per mailinglist.
+                managed_ids = {datum['mailinglist_id'] for datum in set_data
+                               if datum['persona_id'] != rs.user.persona_id}
+                if not all(self.may_manage(rs, ml_id, allow_restricted=False)
+                           for ml_id in managed_ids):
                     raise PrivilegeError(n_("Not privileged."))
 
                 keys = ("subscription_state", "mailinglist_id", "persona_id")
@@ -869,18 +927,18 @@ class MlBackend(AbstractBackend):
         data = affirm_array(vtypes.SubscriptionIdentifier, data)
 
         with Atomizer(rs):
-            if not all(datum['persona_id'] == rs.user.persona_id
-                       or self.may_manage(rs, datum['mailinglist_id'])
-                       for datum in data):
+            # Check privileges only once per mailinglist.
+            managed_ids = {datum['mailinglist_id'] for datum in data
+                           if datum['persona_id'] != rs.user.persona_id}
+            if not all(self.may_manage(rs, ml_id) for ml_id in managed_ids):
                 raise PrivilegeError(n_("Not privileged."))
 
-            # noinspection SqlWithoutWhere
-            query = "DELETE FROM ml.subscription_states"
-            phrase = "mailinglist_id = %s AND persona_id = %s"
-            query = query + " WHERE " + " OR ".join((phrase,) * len(data))
-            params: list[Any] = []
-            for datum in data:
-                params.extend((datum['mailinglist_id'], datum['persona_id']))
+            # Pass the pairs as two arrays, so this scales to many rows at once.
+            query = """DELETE FROM ml.subscription_states AS s
+                USING unnest(%s::integer[], %s::integer[]) AS d(ml_id, p_id)
+                WHERE s.mailinglist_id = d.ml_id AND s.persona_id = d.p_id"""
+            params = ([datum['mailinglist_id'] for datum in data],
+                      [datum['persona_id'] for datum in data])
 
             ret = self.query_exec(rs, query, params)
 
@@ -989,7 +1047,7 @@ class MlBackend(AbstractBackend):
                 self.ml_log(
                     rs, const.MlLogCodes.subscription_changed,
                     mailinglist_id, persona_id, change_note=email)
-
+        DEFECT_ADDRESS_CACHE.invalidate(persona_id)
         return ret
 
     @access("ml")
@@ -1012,7 +1070,7 @@ class MlBackend(AbstractBackend):
 
             self.ml_log(rs, const.MlLogCodes.subscription_changed,
                         mailinglist_id, persona_id)
-
+        DEFECT_ADDRESS_CACHE.invalidate(persona_id)
         return ret
 
     @access("ml")
@@ -1246,6 +1304,37 @@ class MlBackend(AbstractBackend):
 
         return ret
 
+    @access("ml")
+    def get_many_subscription_addresses(
+            self, rs: RequestState, mailinglist_ids: Collection[int],
+    ) -> dict[int, dict[int, Optional[str]]]:
+        """Retrieve the explicit addresses of all subscribers of the mailinglists.
+
+        This is a batched variant of `get_subscription_addresses` with
+        `explicits_only = True`, using a single query for all mailinglists.
+
+        :returns: Dict mapping mailinglist ids to a dict mapping the persona ids of
+            all subscribers to their explicit subscription address or None.
+        """
+        mailinglist_ids = affirm_set(vtypes.ID, mailinglist_ids)
+
+        if not all(self.may_manage(rs, ml_id) for ml_id in mailinglist_ids):
+            raise PrivilegeError(n_("Not privileged."))
+
+        query = """
+            SELECT ss.mailinglist_id, ss.persona_id, sa.address
+            FROM ml.subscription_states AS ss
+                LEFT JOIN ml.subscription_addresses AS sa
+                    ON ss.mailinglist_id = sa.mailinglist_id
+                    AND ss.persona_id = sa.persona_id
+            WHERE ss.mailinglist_id = ANY(%s) AND ss.subscription_state = ANY(%s)"""
+        params = (mailinglist_ids, const.SubscriptionState.subscribing_states())
+        ret: dict[int, dict[int, Optional[str]]] = {
+            ml_id: {} for ml_id in mailinglist_ids}
+        for e in self.query_all(rs, query, params):
+            ret[e["mailinglist_id"]][e["persona_id"]] = e["address"] or None
+        return ret
+
     @access("ml")
     def get_subscription_address(self, rs: RequestState,
                                  mailinglist_id: int, persona_id: int,
@@ -1348,19 +1437,82 @@ class MlBackend(AbstractBackend):
         state = self.get_subscription(rs, persona_id, mailinglist_id)
         return state.is_subscribed()
 
+    @access("ml_admin")
+    def get_subscription_input_marker(self, rs: RequestState) -> dict[str, int]:
+        """Mark the current state of the inputs of the subscription states.
+
+        This is the highest id of each log recording changes to these inputs. Pass
+        the result as `since` to `write_subscription_states` later on, to only handle
+        the mailinglists whose inputs changed in the meantime.
+
+        Ids are assigned when a row is inserted, not when it is committed, so a
+        marker misses changes of transactions which were running while it was
+        taken. Callers should therefore keep some overlap, see
+        `cdedb.frontend.ml.MlFrontend.sync_subscriptions`.
+        """
+        query = "SELECT " + ", ".join(
+            f'(SELECT COALESCE(MAX(id), 0) FROM {table}) AS "{table}"'
+            for table in SUBSCRIPTION_INPUT_LOGS)
+        data = self.query_one(rs, query, ())
+        assert data is not None
+        return dict(data)
+
+    def _get_subscription_input_changes(self, rs: RequestState,
+                                        since: dict[str, int],
+                                        ) -> SubscriptionInputChanges:
+        """Summarize the changes to the inputs of the subscription states.
+
+        :param since: A marker from `get_subscription_input_marker`.
+        """
+        query = """SELECT
+            EXISTS(SELECT 1 FROM core.changelog WHERE id > %s)
+            OR EXISTS(SELECT 1 FROM core.log WHERE id > %s) AS personas"""
+        personas = bool(unwrap(self.query_one(
+            rs, query, (since["core.changelog"], since["core.log"]))))
+        query = ("SELECT DISTINCT event_id FROM event.log"
+                 " WHERE id > %s AND event_id IS NOT NULL")
+        event_ids = {e['event_id'] for e in self.query_all(
+            rs, query, (since["event.log"],))}
+        query = ("SELECT DISTINCT assembly_id FROM assembly.log"
+                 " WHERE id > %s AND assembly_id IS NOT NULL")
+        assembly_ids = {e['assembly_id'] for e in self.query_all(
+            rs, query, (since["assembly.log"],))}
+        query = "SELECT DISTINCT mailinglist_id, code FROM ml.log WHERE id > %s"
+        ml_changes = self.query_all(rs, query, (since["ml.log"],))
+        return SubscriptionInputChanges(
+            personas=personas,
+            moderators=any(e['code'] in MODERATOR_LOG_CODES for e in ml_changes),
+            event_ids=event_ids,
+            assembly_ids=assembly_ids,
+            mailinglist_ids={e['mailinglist_id'] for e in ml_changes
+                             if e['mailinglist_id'] is not None},
+        )
+
     @access("ml")
     def write_subscription_states(self, rs: RequestState,
                                   mailinglist_ids: Optional[Collection[int]] = None,
+                                  since: Optional[dict[str, int]] = None,
                                   ) -> DefaultReturnCode:
         """This takes care of writing implicit subscriptions to the db.
 
         This also checks the integrity of existing subscriptions.
+
+        All mailinglists are handled at once: inputs shared by several mailinglists
+        (like the current members or the registrations of an event) are retrieved
+        only once and all changes are written with a few batched queries.
+
+        :param since: A marker from `get_subscription_input_marker`. If given, only
+            mailinglists whose inputs changed since then are handled.
         """
-        if mailinglist_ids is None:
+        if mailinglist_ids is None or since is not None:
             if not self.is_admin(rs):
                 raise PrivilegeError("Must be admin.")
+        if mailinglist_ids is None:
             mailinglist_ids = self.list_mailinglists(rs)
         mailinglist_ids = affirm_set(vtypes.ID, mailinglist_ids)
+        if since is not None:
+            since = {table: affirm(vtypes.NonNegativeInt, since[table])
+                     for table in SUBSCRIPTION_INPUT_LOGS}
 
         # States we may not touch.
         protected_states = (self.subman.written_states
@@ -1381,6 +1533,10 @@ class MlBackend(AbstractBackend):
             mailinglist_ids = {
                 ml_id for ml_id, ml in ml_data.items()
                 if ml_data[ml_id].periodic_cleanup(rs) and ml.is_active}
+            if since is not None:
+                changes = self._get_subscription_input_changes(rs, since)
+                mailinglist_ids = {ml_id for ml_id in mailinglist_ids
+                                   if ml_data[ml_id].inputs_changed(changes)}
 
             # Gather old subscription data.
             old_subscribers = self.get_many_subscription_states(
@@ -1388,62 +1544,152 @@ class MlBackend(AbstractBackend):
             protected = self.get_many_subscription_states(
                 rs, mailinglist_ids, states=protected_states)
 
-            for mailinglist_id in mailinglist_ids:
+            # Retrieve the personas for all mailinglists with role based policies
+            # at once.
+            role_persona_ids = set().union(*(
+                old_subscribers[ml_id] for ml_id in mailinglist_ids
+                if ml_data[ml_id].has_role_policies()))
+            personas = self.core.get_personas(rs, role_persona_ids)
+            implicits_cache: dict[Hashable, set[int]] = {}
+
+            delete: list[CdEDBObject] = []
+            write: list[CdEDBObject] = []
+            for mailinglist_id in xsorted(mailinglist_ids):
                 ml = ml_data[mailinglist_id]
+                subscribers = old_subscribers[mailinglist_id]
 
                 # This is dependant on mailinglist type
-                new_implicits = ml.get_implicit_subscribers(rs, self.backends)
+                key = ml.implicit_subscribers_key()
+                if key not in implicits_cache:
+                    implicits_cache[key] = ml.get_implicit_subscribers(
+                        rs, self.backends)
+                new_implicits = implicits_cache[key]
 
                 # Check whether current subscribers may stay subscribed.
                 # This is the case if they are still implicit subscribers of
                 # the list or if `get_subscription_policy` says so.
-                delete = []
-                policies = ml.get_subscription_policies(
-                    rs, self.backends, persona_ids=old_subscribers[mailinglist_id])
-                for persona_id in old_subscribers[mailinglist_id]:
-                    old_state = old_subscribers[mailinglist_id][persona_id]
+                if ml.has_role_policies():
+                    policies = ml.get_role_policies(
+                        {anid: personas[anid] for anid in subscribers})
+                elif isinstance(ml, ImplicitsSubscribableMeta):
+                    policies = ml.get_implicit_policies(subscribers, new_implicits)
+                else:
+                    policies = ml.get_subscription_policies(
+                        rs, self.backends, persona_ids=subscribers)
+                removed = [
+                    persona_id for persona_id, old_state in subscribers.items()
                     if self.subman.is_obsolete(policy=policies[persona_id],
                                                old_state=old_state,
-                                               is_implied=persona_id in new_implicits):
-                        datum = {
-                            'mailinglist_id': mailinglist_id,
-                            'persona_id': persona_id,
-                        }
-                        delete.append(datum)
-                        # Log this to prevent confusion especially for team lists
-                        self.ml_log(rs, const.MlLogCodes.automatically_removed,
-                                    mailinglist_id, persona_id=persona_id)
-
-                # Remove those who may not stay subscribed.
-                if delete:
-                    num = self._remove_subscriptions(rs, delete)
-                    ret *= num
-                    self.logger.info(f"Removed {num} subscribers from mailinglist"
-                                     f" {mailinglist_id}.")
+                                               is_implied=persona_id in new_implicits)
+                ]
+                if removed:
+                    delete.extend({'mailinglist_id': mailinglist_id,
+                                   'persona_id': persona_id}
+                                  for persona_id in removed)
+                    self.logger.info(f"Removing {len(removed)} subscribers from"
+                                     f" mailinglist {mailinglist_id}.")
 
                 # Check whether any implicit subscribers need to be written.
                 # This is the case if they are not already old subscribers and
                 # they don't have a protected subscription.
-                write = (set(new_implicits) - set(old_subscribers[mailinglist_id])
+                added = (new_implicits - set(subscribers)
                          - set(protected[mailinglist_id]))
-
-                # Set implicit subscriptions.
-                data = [
-                    {
+                if added:
+                    write.extend({
                         'mailinglist_id': mailinglist_id,
                         'persona_id': persona_id,
                         'subscription_state': const.SubscriptionState.implicit,
-                    }
-                    for persona_id in write
-                ]
-                if data:
-                    self._set_subscriptions(rs, data)
-                    ret *= len(data)
-                    self.logger.info(f"Added {len(write)} subscribers to mailinglist"
-                                     f" {mailinglist_id}.")
+                    } for persona_id in xsorted(added))
+                    self.logger.info(f"Adding {len(added)} subscribers to"
+                                     f" mailinglist {mailinglist_id}.")
+
+            # Remove those who may not stay subscribed.
+            if delete:
+                ret *= self._remove_subscriptions(rs, delete)
+                # Log this to prevent confusion especially for team lists
+                self.ml_log_many(
+                    rs, const.MlLogCodes.automatically_removed,
+                    [(datum['mailinglist_id'], datum['persona_id'])
+                     for datum in delete])
+
+            # Set implicit subscriptions.
+            if write:
+                self._set_subscriptions(rs, write)
+                ret *= len(write)
 
         return ret
 
+    @access("ml_admin")
+    def get_mailman_sync_marker(self, rs: RequestState) -> dict[str, int]:
+        """Mark the current state of the inputs of the mailman sync.
+
+        This is the highest id of each log recording changes to these inputs. Pass
+        the result to `list_changed_mailinglists` later on, to only sync the
+        mailinglists which changed in the meantime.
+
+        Ids are assigned when a row is inserted, not when it is committed, so a
+        marker misses changes of transactions which were running while it was
+        taken. Callers should therefore keep some overlap, see
+        `cdedb.frontend.ml.MlFrontend.sync_subscriptions`.
+        """
+        query = "SELECT " + ", ".join(
+            f'(SELECT COALESCE(MAX(id), 0) FROM {table}) AS "{table}"'
+            for table in MAILMAN_SYNC_INPUT_LOGS + ("ml.subscription_changes",))
+        data = self.query_one(rs, query, ())
+        assert data is not None
+        return dict(data)
+
+    @access("ml_admin")
+    def prune_subscription_changes(self, rs: RequestState, until: dict[str, int],
+                                   ) -> DefaultReturnCode:
+        """Delete the subscription changes which are no longer needed.
+
+        :param until: A marker from `get_mailman_sync_marker`. All changes up to
+            this marker are deleted, so it may not be used afterwards.
+        """
+        until_id = affirm(vtypes.NonNegativeInt, until["ml.subscription_changes"])
+        query = "DELETE FROM ml.subscription_changes WHERE id <= %s"
+        return self.query_exec(rs, query, (until_id,))
+
+    @access("ml_admin")
+    def list_changed_mailinglists(self, rs: RequestState, since: dict[str, int],
+                                  ) -> set[int]:
+        """List the mailinglists whose mailman representation may have changed.
+
+        These are the mailinglists which were changed themselves or whose
+        subscriptions changed, as well as those having a changed persona as
+        subscriber or moderator. If any email status changed, all mailinglists are
+        returned, since the defect addresses are excluded from every mailinglist.
+
+        :param since: A marker from `get_mailman_sync_marker`.
+        """
+        since = {table: affirm(vtypes.NonNegativeInt, since[table])
+                 for table in MAILMAN_SYNC_INPUT_LOGS + ("ml.subscription_changes",)}
+        query = "SELECT EXISTS(SELECT 1 FROM core.log WHERE id > %s AND code = ANY(%s))"
+        if unwrap(self.query_one(
+                rs, query, (since["core.log"], EMAIL_STATUS_LOG_CODES))):
+            return set(self.list_mailinglists(rs, active_only=False))
+        query = """
+            WITH personas AS (
+                SELECT persona_id FROM core.changelog WHERE id > %s
+                UNION
+                SELECT persona_id FROM core.log
+                WHERE id > %s AND persona_id IS NOT NULL
+            )
+            SELECT mailinglist_id FROM ml.subscription_changes WHERE id > %s
+            UNION
+            SELECT mailinglist_id FROM ml.log
+            WHERE id > %s AND mailinglist_id IS NOT NULL
+            UNION
+            SELECT mailinglist_id FROM ml.subscription_states
+            WHERE persona_id IN (SELECT persona_id FROM personas)
+            UNION
+            SELECT mailinglist_id FROM ml.moderators
+            WHERE persona_id IN (SELECT persona_id FROM personas)"""
+        params = (since["core.changelog"], since["core.log"],
+                  since["ml.subscription_changes"], since["ml.log"])
+        return {e["mailinglist_id"] for e in self.query_all(rs, query, params)}
+
     @access("persona")
     def verify_existence(self, rs: RequestState, address: str) -> bool:
         """Check whether a mailinglist with the given address is known."""
@@ -5,8 +5,8 @@ concluded events.
 """
 
 import datetime
-from collections.abc import Collection
-from typing import Any, Optional, Protocol, Union
+from collections.abc import Collection, Iterator
+from typing import Any, Literal, Optional, Protocol, Union, overload
 
 import cdedb.common.validation.types as vtypes
 import cdedb.database.constants as const
@@ -760,16 +760,32 @@ class PastEventBackend(AbstractBackend):
                     raise ValueError(n_("No event parts have any participants."))
         return new_ids, None
 
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False, *,
+                             stream: Literal[False] = False,
+                             ) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def submit_general_query(self, rs: RequestState, query: Query,
+                             aggregate: bool = False, *, stream: Literal[True],
+                             ) -> Iterator[CdEDBObject]: ...
+
     @access("member", "cde_admin")
     def submit_general_query(self, rs: RequestState, query: Query,
-                             aggregate: bool = False) -> tuple[CdEDBObject, ...]:
+                             aggregate: bool = False, *, stream: bool = False,
+                             ) -> Union[tuple[CdEDBObject, ...], Iterator[CdEDBObject]]:
         """Realm specific wrapper around
         :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.`
+
+        :param stream: Retrieve the results lazily, see
+            :py:meth:`cdedb.backend.common.AbstractBackend.general_query`.
         """
         query = affirm(Query, query)
         aggregate = affirm(bool, aggregate)
+        stream = affirm(bool, stream)
         if query.scope == QueryScope.past_event_course:
             pass
         else:
             raise RuntimeError(n_("Bad scope."))
-        return self.general_query(rs, query, aggregate=aggregate)
+        return self.general_query(rs, query, aggregate=aggregate, stream=stream)
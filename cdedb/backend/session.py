@@ -16,13 +16,17 @@ import psycopg2.extensions
 from passlib.utils import consteq
 
 import cdedb.common.validation.types as vtypes
-from cdedb.backend.common import inspect_validation as inspect, verify_password
-from cdedb.common import User, n_, now, setup_logger
+from cdedb.backend.common import (
+    META_INFO_CACHE,
+    inspect_validation as inspect,
+    verify_password,
+)
+from cdedb.common import CdEDBObject, User, n_, now, setup_logger
 from cdedb.common.exceptions import APITokenError
 from cdedb.common.fields import PERSONA_STATUS_FIELDS
 from cdedb.common.roles import extract_roles
 from cdedb.config import Config, SecretsConfig
-from cdedb.database.connection import connection_pool_factory
+from cdedb.database.connection import connection_pool_factory, pooled_connection
 from cdedb.models.droid import DynamicAPIToken, StaticAPIToken, resolve_droid_name
 
 
@@ -60,18 +64,27 @@ class SessionBackend:
         self.connpool = connection_pool_factory(
             self.conf["CDB_DATABASE_NAME"], ("cdb_anonymous", "cdb_persona"),
             secrets, self.conf["DB_HOST"], self.conf["DB_PORT"],
-            isolation_level=psycopg2.extensions.ISOLATION_LEVEL_READ_COMMITTED)
+            isolation_level=psycopg2.extensions.ISOLATION_LEVEL_READ_COMMITTED,
+            pool_size=self.conf["DB_POOL_SIZE"], max_idle=self.conf["DB_POOL_MAX_IDLE"],
+            timeout=self.conf["DB_POOL_TIMEOUT"])
 
     def _is_locked_down(self) -> bool:
         """Helper to determine if CdEDB is locked."""
         if self.conf["LOCKDOWN"]:
             return True
+        data = META_INFO_CACHE.get(
+            None, self._retrieve_meta_info,
+            self.conf["META_INFO_CACHE_TTL"].total_seconds())
+        return bool(data.get("lockdown_web"))
+
+    def _retrieve_meta_info(self) -> CdEDBObject:
+        """Helper to retrieve the raw meta info, see `CoreBackend.get_meta_info`."""
         # we do not have the core backend, so we have to query meta info by hand
-        with self.connpool["cdb_anonymous"] as conn:
+        with pooled_connection(self.connpool, "cdb_anonymous") as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT info FROM core.meta_info LIMIT 1")
                 data = dict(cur.fetchone() or {})
-        return data['info'].get("lockdown_web")
+        return data.get('info') or {}
 
     def lookupsession(self, sessionkey: Optional[str], ip: Optional[str]) -> User:
         """Raison d'etre.
@@ -80,77 +93,97 @@ class SessionBackend:
         User wrapper required for a :py:class:`cdedb.common.RequestState`. We
         bind sessions to IPs, so they get automatically invalidated if
         the IP changes.
+
+        This also retrieves the entity related privileges (orga, moderator and
+        presider) of the persona, all with a single query.
         """
         persona_id = None
         data = None
         sessionkey, sessionkey_errs = inspect(vtypes.PrintableASCII, sessionkey)
         ip, ip_errs = inspect(vtypes.PrintableASCII, ip)
-        if not sessionkey_errs and not ip_errs:
-            query = ("SELECT persona_id, ip, is_active, atime, ctime"
-                     " FROM core.sessions WHERE sessionkey = %s")
-            with self.connpool["cdb_anonymous"] as conn:
-                with conn.cursor() as cur:
-                    cur.execute(query, (sessionkey,))
-                    if cur.rowcount == 1:
-                        data = cur.fetchone()
-                    else:
-                        # log message to be picked up by fail2ban
-                        self.logger.warning(
-                            f"CdEDB invalid session key from {ip}")
-        if data:
-            deactivate = False
-            if data["is_active"]:
-                if data["ip"] == ip:
-                    timestamp = now()
-                    if (data["atime"] + self.conf["SESSION_TIMEOUT"]
-                            >= timestamp):
-                        if (data["ctime"] + self.conf["SESSION_LIFESPAN"]
+        if sessionkey_errs or ip_errs:
+            return User()
+        # Retrieve the session together with everything needed to construct the
+        # user, so that a request needs only a single round trip to the database.
+        # The persona data is only used once the session has been verified below.
+        query = f"""
+            SELECT
+                s.persona_id, s.ip, s.is_active AS session_is_active, s.atime,
+                s.ctime, p.display_name, p.given_names, p.family_name, p.username,
+                {', '.join(f'p.{field}' for field in PERSONA_STATUS_FIELDS)},
+                ARRAY(SELECT event_id FROM event.orgas
+                      WHERE persona_id = s.persona_id) AS orga,
+                ARRAY(SELECT mailinglist_id FROM ml.moderators
+                      WHERE persona_id = s.persona_id) AS moderator,
+                ARRAY(SELECT assembly_id FROM assembly.presiders
+                      WHERE persona_id = s.persona_id) AS presider,
+                (SELECT info->'lockdown_web' FROM core.meta_info
+                 LIMIT 1) AS lockdown_web
+            FROM core.sessions AS s
+                JOIN core.personas AS p ON s.persona_id = p.id
+            WHERE s.sessionkey = %s"""
+        with pooled_connection(self.connpool, "cdb_persona") as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (sessionkey,))
+                if cur.rowcount == 1:
+                    data = cur.fetchone()
+                else:
+                    # log message to be picked up by fail2ban
+                    self.logger.warning(
+                        f"CdEDB invalid session key from {ip}")
+                    return User()
+                assert data is not None
+                timestamp = now()
+                deactivate = False
+                if data["session_is_active"]:
+                    if data["ip"] == ip:
+                        if (data["atime"] + self.conf["SESSION_TIMEOUT"]
                                 >= timestamp):
-                            # here we finally verified the session key
-                            persona_id = data["persona_id"]
+                            if (data["ctime"] + self.conf["SESSION_LIFESPAN"]
+                                    >= timestamp):
+                                # here we finally verified the session key
+                                persona_id = data["persona_id"]
+                            else:
+                                deactivate = True
+                                self.logger.info(f"TTL exceeded for {sessionkey}")
                         else:
                             deactivate = True
-                            self.logger.info(f"TTL exceeded for {sessionkey}")
+                            self.logger.info(f"Session timed out: {sessionkey}")
                     else:
                         deactivate = True
-                        self.logger.info(f"Session timed out: {sessionkey}")
+                        self.logger.info(
+                            f"IP mismatch ({ip} vs {data['ip']}) for {sessionkey}")
                 else:
-                    deactivate = True
-                    self.logger.info(
-                        f"IP mismatch ({ip} vs {data['ip']}) for {sessionkey}")
-            else:
-                self.logger.info(f"Got inactive session key {sessionkey}.")
-            if deactivate:
-                query = ("UPDATE core.sessions SET is_active = False"
-                         " WHERE sessionkey = %s")
-                with self.connpool["cdb_anonymous"] as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(query, (sessionkey,))
+                    self.logger.info(f"Got inactive session key {sessionkey}.")
+                if deactivate:
+                    query = ("UPDATE core.sessions SET is_active = False"
+                             " WHERE sessionkey = %s")
+                    cur.execute(query, (sessionkey,))
+                elif (persona_id and data["atime"]
+                        + self.conf["SESSION_ATIME_RESOLUTION"] < timestamp):
+                    # Coalesce the updates of the access time, since they are
+                    # only needed with a precision far below the session timeout.
+                    query = ("UPDATE core.sessions SET atime = now()"
+                             " WHERE sessionkey = %s")
+                    cur.execute(query, (sessionkey,))
 
         if not persona_id:
             return User()
-
-        query = "UPDATE core.sessions SET atime = now() WHERE sessionkey = %s"
-        query2 = (f"SELECT id AS persona_id, display_name, given_names,"
-                  f" family_name, username, {', '.join(PERSONA_STATUS_FIELDS)}"
-                  f" FROM core.personas WHERE id = %s")
-        with self.connpool["cdb_persona"] as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (sessionkey,))
-                cur.execute(query2, (persona_id,))
-                data = cur.fetchone()
-                assert data is not None
-        if self._is_locked_down() and not (data['is_meta_admin']
-                                           or data['is_core_admin']):
+        if ((self.conf["LOCKDOWN"] or data["lockdown_web"])
+                and not (data['is_meta_admin'] or data['is_core_admin'])):
             # Short circuit in case of lockdown
             return User()
         if not data["is_active"]:
             self.logger.warning(f"Found inactive user {persona_id}")
             return User()
 
+        roles = extract_roles(data)
         vals = {k: data[k] for k in ('persona_id', 'username', 'given_names',
                                      'display_name', 'family_name')}
-        return User(roles=extract_roles(data), **vals)
+        return User(roles=roles, **vals,
+                    orga=data["orga"] if "event" in roles else None,
+                    moderator=data["moderator"] if "ml" in roles else None,
+                    presider=data["presider"] if "assembly" in roles else None)
 
     def lookuptoken(self, apitoken: Optional[str], ip: Optional[str]) -> User:
         """Raison d'etre deux.
@@ -201,7 +234,7 @@ class SessionBackend:
         if self.conf['CDEDB_OFFLINE_DEPLOYMENT']:
             raise APITokenError(n_("This API is not available in offline mode."))
 
-        with self.connpool["cdb_anonymous"] as conn:
+        with pooled_connection(self.connpool, "cdb_anonymous") as conn:
             with conn.cursor() as cur:
                 query = f"""
                     SELECT
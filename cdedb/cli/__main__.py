@@ -23,6 +23,7 @@ from cdedb.cli.dev.sql2json import sql2json
 from cdedb.cli.storage import (
     create_log,
     create_storage,
+    create_template_cache,
     populate_event_keeper,
     populate_sample_event_keepers,
     populate_storage,
@@ -149,6 +150,22 @@ def create_log_cmd(config: TestConfig, ownership: dict[str, str]) -> None:
         create_log(config)
 
 
+@filesystem.group(name="templates")
+def templates() -> None:
+    """Compiled templates."""
+
+
+@templates.command(name="compile")
+@click.pass_obj
+@pass_config
+def compile_templates_cmd(config: TestConfig, ownership: dict[str, str]) -> None:
+    """Precompile all templates into the template cache."""
+    click.echo(f"Compile templates into {config['TEMPLATE_CACHE_DIR']}.")
+    with switch_user(**ownership):
+        num = create_template_cache(config)
+    click.echo(f"Compiled {num} templates.")
+
+
 @cli.group(name="db")
 def database() -> None:
     """Preparations regarding the database."""
@@ -30,6 +30,7 @@ ignored_tables = {
     "core.sessions",
     "core.quota",
     "core.postal_code_locations",
+    "ml.subscription_changes",
 }
 
 # mark some columns which shall not be filled with information extracted from the
@@ -41,6 +42,7 @@ ignored_columns = {
 # mark some columns which shall not be filled with information extracted from the
 # database, because they can be filled by sql automatically.
 implicit_columns = {
+    "core.personas": {"fulltext_normalized"},
     "core.changelog": {"id"},
     "core.log": {"id"},
     "core.email_states": {"id"},
@@ -14,6 +14,7 @@ from cdedb.cli.util import (
 )
 from cdedb.common import get_hash
 from cdedb.config import Config, SecretsConfig, get_configpath
+from cdedb.frontend.common import compile_templates, make_jinja_environments
 
 
 def _recreate_directory(directory: pathlib.Path) -> None:
@@ -165,6 +166,19 @@ def create_log(conf: Config) -> None:
     _recreate_directory(log_dir)
 
 
+def create_template_cache(conf: Config) -> int:
+    """Compile all templates into the template cache directory.
+
+    This removes the previous content, so it should be run after each deployment.
+
+    :returns: The number of compiled templates.
+    """
+    cache_dir: pathlib.Path = conf["TEMPLATE_CACHE_DIR"]
+
+    _recreate_directory(cache_dir)
+    return compile_templates(make_jinja_environments(conf))
+
+
 @sanity_check
 def reset_config(conf: Config) -> tuple[Config, SecretsConfig]:
     """Replace the current config file with the sample config."""
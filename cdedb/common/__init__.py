@@ -1317,6 +1317,42 @@ def inverse_diacritic_patterns(s: str) -> str:
     return s.translate(UMLAUT_TRANSLATE_TABLE)
 
 
+# This has to match the generated column `core.personas.fulltext_normalized`.
+NORMALIZE_TRANSLATE_TABLE = str.maketrans(
+    "àáâãäåąæçčćèéêëęìíîïłñńòóôõöøőœùúûüűýÿźżß", "aaaaaaaaccceeeeeiiiilnnoooooooouuuuuyyzzs")
+
+
+def normalize_fulltext(s: str) -> str:
+    """Lowercase a string and replace every letter with a diacritic known to
+    :func:`diacritic_patterns` by a single ASCII letter.
+
+    Since this keeps the length of the string, positions and word boundaries are
+    preserved.
+    """
+    return s.lower().translate(NORMALIZE_TRANSLATE_TABLE)
+
+
+def normalized_search_pattern(term: str) -> Optional[str]:
+    """Translate a search term into a regex for normalized strings.
+
+    Whenever the :func:`diacritic_patterns` of the term matches a string, this
+    pattern matches its :func:`normalize_fulltext`. In contrast to the former,
+    this pattern is simple enough to be answered by a trigram index. Terms using
+    regular expression syntax (apart from word boundaries) can not be translated,
+    in which case None is returned.
+    """
+    term = term.removeprefix(r"\m").removesuffix(r"\M").lower()
+    if not term or any(char in term for char in r"\.^$*+?{}()[]|"):
+        return None
+    # Letters without diacritic are always matched by this.
+    ret = "".join(char if char.isalnum() or char.isspace() else "\\" + char
+                  for char in term)
+    # An ASCII digraph may also stand for a single letter with diacritic.
+    for digraph in ("ae", "oe", "ue", "ss"):
+        ret = ret.replace(digraph, digraph + "?")
+    return normalize_fulltext(ret)
+
+
 def abbreviation_mapper(data: Sequence[T]) -> dict[T, str]:
     """Assign an unique combination of ascii letters to each element."""
     num_letters = ((len(data) - 1) // 26) + 1
@@ -0,0 +1,100 @@
+"""Small process-wide caches for rarely changing data.
+
+Every process keeps its own copy, so a change made by another process is only
+noticed after the time to live of the cached entry. Changes made in this process
+invalidate the respective entries immediately.
+"""
+
+import collections
+import threading
+import time
+import weakref
+from collections.abc import Hashable
+from typing import Callable, Generic, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_ALL_CACHES: "weakref.WeakSet[ExpiringCache[Hashable, object]]" = weakref.WeakSet()
+
+
+class ExpiringCache(Generic[K, V]):
+    """Thread-safe, size bounded mapping whose entries expire after some time.
+
+    Invalidation increments a generation counter. A retrieved value is only stored
+    if no invalidation happened in the meantime, so a concurrent change can not sneak
+    a stale value into the cache.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._data: collections.OrderedDict[K, tuple[float, V]] = (
+            collections.OrderedDict())
+        self._generation = 0
+        _ALL_CACHES.add(self)  # type: ignore[arg-type]
+
+    def get(self, key: K, retrieve: Callable[[], V], ttl: float) -> V:
+        """Get the value for the key, retrieving it if missing or expired.
+
+        :param ttl: Time to live of a newly retrieved value in seconds. If this is
+            not positive, the cache is bypassed.
+        """
+        if ttl <= 0:
+            return retrieve()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                return entry[1]
+            generation = self._generation
+        value = retrieve()
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value, ttl)
+        return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """Get the value for the key if present and not expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                return entry[1]
+        return None
+
+    def put(self, key: K, value: V, ttl: float) -> None:
+        """Store a value for the key, which was retrieved elsewhere.
+
+        :param ttl: Time to live of the value in seconds. If this is not positive,
+            nothing is stored.
+        """
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: K, value: V, ttl: float) -> None:
+        """Store a value while holding the lock, evicting the oldest entries."""
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop the entry for the given key."""
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+
+def clear_all_caches() -> None:
+    """Drop the entries of all caches, e.g. after modifying the database directly."""
+    for cache in list(_ALL_CACHES):
+        cache.clear()
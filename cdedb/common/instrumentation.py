@@ -0,0 +1,162 @@
+"""Opt-in instrumentation of the time spent serving requests.
+
+The application starts a :py:class:`RequestTiming` for each request, if enabled by
+the ``INSTRUMENTATION`` config option. While it is active, the database layer and
+the template rendering record their durations into it. Finished requests are
+aggregated per endpoint into the :py:data:`STATISTICS` of the process.
+"""
+
+import collections
+import dataclasses
+import heapq
+import math
+import random
+import threading
+import time
+from typing import Any, Optional
+
+_CURRENT = threading.local()
+
+
+@dataclasses.dataclass(order=True)
+class QueryTiming:
+    """Duration of a single database query in seconds."""
+    duration: float
+    query: str = dataclasses.field(compare=False)
+
+
+class RequestTiming:
+    """Collect the timings of a single request."""
+
+    def __init__(self, slow_queries: int) -> None:
+        self.endpoint = "unknown"
+        self.begin = time.perf_counter()
+        self.total = 0.0
+        self.query_count = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+        self.num_slow_queries = slow_queries
+        # Min-heap, so the fastest of the slow queries is replaced first.
+        self.slow_queries: list[QueryTiming] = []
+
+    def record_query(self, query: str, duration: float) -> None:
+        self.query_count += 1
+        self.query_time += duration
+        entry = QueryTiming(duration, query)
+        if len(self.slow_queries) < self.num_slow_queries:
+            heapq.heappush(self.slow_queries, entry)
+        elif self.slow_queries and entry > self.slow_queries[0]:
+            heapq.heapreplace(self.slow_queries, entry)
+
+    def record_render(self, duration: float) -> None:
+        self.render_time += duration
+
+    def finish(self) -> None:
+        self.total = time.perf_counter() - self.begin
+
+    def server_timing(self) -> str:
+        """Format the timings as value of a Server-Timing header."""
+        return (f'db;dur={self.query_time * 1000:.1f};desc="{self.query_count}'
+                f' queries", render;dur={self.render_time * 1000:.1f},'
+                f' total;dur={self.total * 1000:.1f}')
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the timings for a structured log line. Durations are in ms."""
+        return {
+            'endpoint': self.endpoint,
+            'total': round(self.total * 1000, 1),
+            'render': round(self.render_time * 1000, 1),
+            'queries': self.query_count,
+            'db': round(self.query_time * 1000, 1),
+            'slow_queries': [
+                {'duration': round(entry.duration * 1000, 1),
+                 'query': " ".join(entry.query.split())}
+                for entry in sorted(self.slow_queries, reverse=True)
+            ],
+        }
+
+
+def start_request(slow_queries: int) -> RequestTiming:
+    """Start recording the timings of a request in the current thread."""
+    timing = RequestTiming(slow_queries)
+    _CURRENT.timing = timing
+    return timing
+
+
+def current_request() -> Optional[RequestTiming]:
+    """Return the timings of the request handled by the current thread, if any."""
+    return getattr(_CURRENT, 'timing', None)
+
+
+def finish_request() -> Optional[RequestTiming]:
+    """Stop recording the timings of the current request and aggregate them."""
+    timing = current_request()
+    _CURRENT.timing = None
+    if timing is not None:
+        timing.finish()
+        STATISTICS.add(timing)
+    return timing
+
+
+class EndpointStatistics:
+    """Aggregate the durations of the requests per endpoint.
+
+    To bound the memory usage, the percentiles are computed from a uniform random
+    sample of all requests since the start of the process (reservoir sampling).
+    """
+
+    def __init__(self, samples: int = 1000) -> None:
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._counts: collections.Counter[str] = collections.Counter()
+        self._totals: dict[str, float] = collections.defaultdict(float)
+        self._queries: collections.Counter[str] = collections.Counter()
+        self._durations: dict[str, list[float]] = collections.defaultdict(list)
+        self._rng = random.Random()
+
+    def add(self, timing: RequestTiming) -> None:
+        with self._lock:
+            endpoint = timing.endpoint
+            self._counts[endpoint] += 1
+            self._totals[endpoint] += timing.total
+            self._queries[endpoint] += timing.query_count
+            durations = self._durations[endpoint]
+            if len(durations) < self.samples:
+                durations.append(timing.total)
+            else:
+                index = self._rng.randrange(self._counts[endpoint])
+                if index < self.samples:
+                    durations[index] = timing.total
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Return count, mean, p50 and p95 (in ms) and mean number of queries
+        per endpoint, sorted by the total time spent."""
+        with self._lock:
+            ret = []
+            for endpoint, count in self._counts.items():
+                durations = sorted(self._durations[endpoint])
+                ret.append({
+                    'endpoint': endpoint,
+                    'count': count,
+                    'total': self._totals[endpoint] * 1000,
+                    'mean': self._totals[endpoint] / count * 1000,
+                    'p50': _percentile(durations, 0.5) * 1000,
+                    'p95': _percentile(durations, 0.95) * 1000,
+                    'queries': self._queries[endpoint] / count,
+                })
+        return sorted(ret, key=lambda e: e['total'], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
+            self._queries.clear()
+            self._durations.clear()
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list."""
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+STATISTICS = EndpointStatistics()
@@ -50,6 +50,10 @@ class GenericLogFilter:
     _offset: Optional[int] = dataclasses.field(default=None)  # Unmodified offset.
     length: int = 0  # How many entries to list. Set default in post_init.
     _length: int = dataclasses.field(default=0)  # Unmodified length.
+    # Keyset pagination, which takes precedence over the offset if given. The offset
+    # is then only used to determine the page number.
+    before_id: Optional[int] = None  # List the entries directly older than this.
+    after_id: Optional[int] = None  # List the entries directly newer than this.
 
     # Generic attributes available for all logs.
     codes: list[int] = dataclasses.field(default_factory=list)  # Log codes to filter.
@@ -111,6 +115,20 @@ class GenericLogFilter:
         conditions, params = self._get_sql_conditions()
         return f"WHERE {' AND '.join(conditions)}" if conditions else "", tuple(params)
 
+    def to_sql_keyset_condition(self) -> tuple[str, tuple[DatabaseValue_s, ...]]:
+        """Like `to_sql_condition`, but additionally restrict to the keyset page.
+
+        This does not include the WHERE, but is never empty.
+        """
+        conditions, params = self._get_sql_conditions()
+        if self.before_id is not None:
+            conditions.append("id < %s")
+            params.append(self.before_id)
+        if self.after_id is not None:
+            conditions.append("id > %s")
+            params.append(self.after_id)
+        return " AND ".join(conditions) or "TRUE", tuple(params)
+
     @classmethod
     def get_columns(cls) -> tuple[str, ...]:
         """Get a list of columns in the respective log table."""
@@ -191,10 +191,39 @@ class ValidationSummary(ValueError, Sequence[Exception]):
 
 
 class ValidatorStorage(dict[type[Any], Callable[..., Any]]):
+    """Registry of the validators for all types.
+
+    Looking up a type compiles its validator once: Optional and container types
+    are resolved to the respective wrappers and some trivial types get a fast path,
+    see `_FAST_PATHS`. The result is cached by the identity of the type, since
+    hashing the nested typing constructs is not exactly cheap either.
+    """
+    MAX_COMPILED = 4096
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._compiled: dict[int, tuple[Any, Callable[..., Any]]] = {}
+
     def __setitem__(self, type_: type[T], validator: Callable[..., T]) -> None:
         super().__setitem__(type_, validator)
+        self._compiled.clear()
+
+    def __delitem__(self, type_: type[Any]) -> None:
+        super().__delitem__(type_)
+        self._compiled.clear()
 
     def __getitem__(self, type_: type[T]) -> Callable[..., T]:
+        entry = self._compiled.get(id(type_))
+        # The cached type is kept alive by the entry, so its id can not be reused.
+        if entry is not None and entry[0] is type_:
+            return entry[1]
+        validator = self._compile(type_)
+        if len(self._compiled) >= self.MAX_COMPILED:
+            self._compiled.clear()
+        self._compiled[id(type_)] = (type_, validator)
+        return validator
+
+    def _compile(self, type_: type[T]) -> Callable[..., T]:
         origin = typing.get_origin(type_)
         if origin is Union or origin is UnionType:
             inner_type, none_type = typing.get_args(type_)
@@ -215,7 +244,10 @@ class ValidatorStorage(dict[type[Any], Callable[..., Any]]):
                 if type_a is type_b:
                     return cast(Callable[..., T], make_pair_validator(type_a))
         # TODO more container types like tuple
-        return super().__getitem__(type_)
+        validator = super().__getitem__(type_)
+        if (is_canonical := _FAST_PATHS.get(type_)) is not None:
+            return _with_fast_path(validator, is_canonical)
+        return validator
 
 
 _ALL_TYPED = ValidatorStorage()
@@ -290,14 +322,38 @@ def validate_assert(type_: type[T], value: Any, ignore_warnings: bool,
     try:
         return _ALL_TYPED[type_](value, ignore_warnings=ignore_warnings, **kwargs)
     except ValidationSummary as errs:
-        old_format = [(e.args[0], e.__class__(*e.args[1:])) for e in errs]
-        _LOGGER.debug(
-            f"{old_format} for '{str(type_)}'"
-            f" with input {value}, {kwargs}.",
-        )
-        e = errs[0]
-        e.args = (f"{e.args[1]} ({e.args[0]})",) + e.args[2:]
-        raise e from errs  # pylint: disable=raising-bad-type
+        _raise_first_error(type_, value, errs, **kwargs)
+
+
+def validate_assert_all(type_: type[T], values: Iterable[Any], ignore_warnings: bool,
+                        **kwargs: Any) -> list[T]:
+    """Like `validate_assert`, but for each of the values.
+
+    This looks up the validator only once, which matters for large collections.
+    """
+    if "ignore_warnings" in kwargs:
+        raise RuntimeError("Not allowed to set 'ignore_warnings' toggle.")
+    validator = _ALL_TYPED[type_]
+    ret = []
+    for value in values:
+        try:
+            ret.append(validator(value, ignore_warnings=ignore_warnings, **kwargs))
+        except ValidationSummary as errs:
+            _raise_first_error(type_, value, errs, **kwargs)
+    return ret
+
+
+def _raise_first_error(type_: type[Any], value: Any, errs: ValidationSummary,
+                       **kwargs: Any) -> typing.NoReturn:
+    """Log all errors of a failed assertion, but only raise the first one."""
+    old_format = [(e.args[0], e.__class__(*e.args[1:])) for e in errs]
+    _LOGGER.debug(
+        f"{old_format} for '{str(type_)}'"
+        f" with input {value}, {kwargs}.",
+    )
+    e = errs[0]
+    e.args = (f"{e.args[1]} ({e.args[0]})",) + e.args[2:]
+    raise e from errs  # pylint: disable=raising-bad-type
 
 
 def validate_assert_optional(type_: type[T], value: Any, ignore_warnings: bool,
@@ -389,6 +445,23 @@ def _allow_None(fun: Callable[..., T]) -> Callable[..., Optional[T]]:
     return new_fun
 
 
+def _with_fast_path(fun: Callable[..., T], is_canonical: Callable[..., bool],
+                    ) -> Callable[..., T]:
+    """Wrap a validator to return values which are already valid right away.
+
+    :param is_canonical: Takes the value and the keyword arguments of the validator.
+        It may only return True, if the validator would return the value unchanged.
+    """
+
+    @functools.wraps(fun)
+    def new_fun(val: Any, argname: Optional[str] = None, **kwargs: Any) -> T:
+        if is_canonical(val, **kwargs):
+            return cast(T, val)
+        return fun(val, argname, **kwargs)
+
+    return new_fun
+
+
 def _add_typed_validator(fun: F, return_type: Optional[type[Any]] = None) -> F:
     """Mark a typed function for processing into validators."""
     # TODO get rid of dynamic return types for enum
@@ -413,19 +486,33 @@ def _create_optional_mapping_validator(inner_type: type[Any], return_type: type[
     _add_typed_validator(the_validator, return_type)
 
 
-def _create_dataclass_validator(type_: type[DC], return_type: type[T],
-                                ) -> Callable[[F], F]:
-    def the_validator(val: Any, argname: str = type_.__qualname__, *,
-                      creation: bool = False, **kwargs: Any) -> T:
-        val = _mapping(val, argname, **kwargs)
+_VALIDATION_FIELDS: dict[tuple[type[Any], bool], tuple[TypeMapping, TypeMapping]] = {}
+
 
+def _validation_fields(type_: type[Any], *, creation: bool = False,
+                       ) -> tuple[TypeMapping, TypeMapping]:
+    """Cached specification of the fields of a dataclass for validation.
+
+    The fields only depend on the class, so they are determined only once. The
+    returned mappings are shared and must therefore not be modified.
+    """
+    key = (type_, creation)
+    if key not in _VALIDATION_FIELDS:
         if issubclass(type_, GenericLogFilter):
-            mandatory, optional = type_.validation_fields()
+            _VALIDATION_FIELDS[key] = type_.validation_fields()
         elif issubclass(type_, CdEDataclass):
-            mandatory, optional = type_.validation_fields(creation=creation)
+            _VALIDATION_FIELDS[key] = type_.validation_fields(creation=creation)
         else:
             raise RuntimeError("Impossible.")
+    return _VALIDATION_FIELDS[key]
+
 
+def _create_dataclass_validator(type_: type[DC], return_type: type[T],
+                                ) -> Callable[[F], F]:
+    def the_validator(val: Any, argname: str = type_.__qualname__, *,
+                      creation: bool = False, **kwargs: Any) -> T:
+        val = _mapping(val, argname, **kwargs)
+        mandatory, optional = _validation_fields(type_, creation=creation)
         val = _examine_dictionary_fields(val, mandatory, optional, **kwargs)
 
         return cast(T, val)
@@ -993,6 +1080,23 @@ def _bool(
                 "Invalid input for boolean."))) from e
 
 
+def _is_plain_str(val: Any, *, zap: str = '', sieve: str = '', **kwargs: Any,
+                  ) -> bool:
+    return type(val) is str and not zap and not sieve and "\r" not in val
+
+
+# Predicates for values which the validator of the type would return unchanged.
+# These are checked first by the compiled validators, since the bulk of the
+# validated values are ids, numbers and strings, which are already fine.
+_FAST_PATHS: dict[Any, Callable[..., bool]] = {
+    ID: lambda val, **kwargs: type(val) is int and 0 < val < 2 ** 31,
+    int: lambda val, **kwargs: type(val) is int and -2 ** 31 <= val < 2 ** 31,
+    bool: lambda val, **kwargs: type(val) is bool,
+    StringType: _is_plain_str,
+    str: lambda val, **kwargs: bool(val) and _is_plain_str(val, **kwargs),
+}
+
+
 @_add_typed_validator
 def _empty_dict(
     val: Any, argname: Optional[str] = None, **kwargs: Any,
@@ -1140,8 +1244,8 @@ def _anonymous_mesage(
 ) -> AnonymousMessage:
     val = _mapping(val, argname, **kwargs)
 
-    mandatory, optional = models_core.AnonymousMessageData.validation_fields(
-        creation=creation)
+    mandatory, optional = _validation_fields(
+        models_core.AnonymousMessageData, creation=creation)
     val = _examine_dictionary_fields(val, mandatory, optional, **kwargs)
 
     return AnonymousMessage(val)
@@ -1169,11 +1273,12 @@ def _list_of(
         val = [v for v in val.split(",") if v]
     # TODO raise ValueError if val is string and _parse_csv is False?
     val = _iterable(val, argname, **kwargs)
+    validator = _ALL_TYPED[atype]
     vals: list[T] = []
     errs = ValidationSummary()
     for v in val:
         with errs:
-            vals.append(_ALL_TYPED[atype](v, argname, **kwargs))
+            vals.append(validator(v, argname, **kwargs))
     if errs:
         raise errs
 
@@ -1220,7 +1325,8 @@ def _set_of(
 ) -> set[T]:
     # TODO maybe disallow strings here (see also _list_of)
     val = _iterable(val, argname=argname, **kwargs)
-    return {_ALL_TYPED[atype](v, argname, **kwargs) for v in val}
+    validator = _ALL_TYPED[atype]
+    return {validator(v, argname, **kwargs) for v in val}
 
 
 class SetValidator(Protocol[T]):
@@ -1322,7 +1428,7 @@ def _orga_token(
 ) -> OrgaToken:
     val = _mapping(val, argname, **kwargs)
 
-    mandatory, optional = models_droid.OrgaToken.validation_fields(creation=creation)
+    mandatory, optional = _validation_fields(models_droid.OrgaToken, creation=creation)
     val = _examine_dictionary_fields(
         val, mandatory, optional, **kwargs)
 
@@ -4213,7 +4319,7 @@ def _mailinglist(
         raise ValidationSummary(ValueError(
             "ml_type", "Must provide ml_type for setting mailinglist."))
 
-    mandatory_fields, optional_fields = subtype.validation_fields(creation=creation)
+    mandatory_fields, optional_fields = _validation_fields(subtype, creation=creation)
     val = _examine_dictionary_fields(
         val, mandatory_fields, optional_fields, **kwargs)
 
@@ -4646,8 +4752,8 @@ def _custom_query_filter(
         val = dict(val)
         val['fields'] = set(fields.split(","))
 
-    mandatory, optional = models_event.CustomQueryFilter.validation_fields(
-        creation=creation)
+    mandatory, optional = _validation_fields(
+        models_event.CustomQueryFilter, creation=creation)
     val = _examine_dictionary_fields(val, mandatory, optional, **kwargs)
 
     errs = ValidationSummary()
@@ -5015,7 +5121,7 @@ def _log_filter(
     if not val.get('length'):
         val['length'] = _CONFIG['DEFAULT_LOG_LENGTH']
 
-    mandatory, optional = subtype.validation_fields()
+    mandatory, optional = _validation_fields(subtype)
     val = _examine_dictionary_fields(val, mandatory, optional)
 
     return LogFilter(val)
@@ -110,6 +110,14 @@ _DEFAULTS = {
     # port of the db itself, for skipping pooler during tests or deploys.
     "DIRECT_DB_PORT": 5432,
 
+    # number of database connections per role kept open inside each process,
+    # zero disables this and creates a new connection for every usage
+    "DB_POOL_SIZE": 0,
+    # pooled connections which were unused for this long are closed
+    "DB_POOL_MAX_IDLE": datetime.timedelta(minutes=5),
+    # maximum time to wait for a pooled connection if all are in use
+    "DB_POOL_TIMEOUT": datetime.timedelta(seconds=10),
+
     # host name where the ldap server is running
     "LDAP_HOST": "sandbox.cdedb.virtual",
     # port on which the ldap server listens
@@ -119,6 +127,11 @@ _DEFAULTS = {
                       "ldap.pem"),
     "LDAP_KEY_PATH": _repopath / "related" / "auto-build" / "files" / "stage2" /
                      "ldap.key",
+    # lifetime and maximal number of cached group memberships of the ldap server
+    "LDAP_CACHE_TTL": datetime.timedelta(minutes=10),
+    "LDAP_CACHE_MAX_SIZE": 50000,
+    # interval in which the ldap server logs the hit and miss counters of its cache
+    "LDAP_CACHE_STATS_INTERVAL": datetime.timedelta(hours=1),
 
     # True for offline versions running on academies
     "CDEDB_OFFLINE_DEPLOYMENT": False,
@@ -148,6 +161,14 @@ _DEFAULTS = {
     # Logging level for stdout
     "CONSOLE_LOG_LEVEL": None,
 
+    # Record the time spent in the database and in rendering templates for every
+    # request. This is reported via Server-Timing header, in the log and
+    # aggregated per endpoint on an admin page.
+    "INSTRUMENTATION": False,
+
+    # Number of slowest database queries to log per request if instrumented.
+    "INSTRUMENTATION_SLOW_QUERIES": 3,
+
     # hash id of the current HEAD/running version
     "GIT_COMMIT": _git_commit,
 
@@ -192,6 +213,12 @@ _DEFAULTS = {
     "I18N_ADVERTISED_LANGUAGES": ("de", "en"),
     # timeout for cleaning up genesis cases
     "GENESIS_CLEANUP_TIMEOUT": datetime.timedelta(days=90),
+    # Directory for the compiled templates, shared by all processes. It is filled
+    # at deploy time by `cdedb filesystem templates compile`, or lazily otherwise.
+    # If it is not writable, templates are compiled in memory only.
+    "TEMPLATE_CACHE_DIR": pathlib.Path("/var/cache/cdedb/templates/"),
+    # Load all templates when the application starts instead of on first use.
+    "TEMPLATE_WARM_UP": False,
 
     ###############
     # email stuff #
@@ -249,6 +276,8 @@ _DEFAULTS = {
     "MAILMAN_USER": "restadmin",
     # user for mailman to retrieve templates
     "MAILMAN_BASIC_AUTH_USER": "mailman",
+    # number of mailinglists synced to mailman concurrently
+    "MAILMAN_SYNC_WORKERS": 8,
     # aliases which are recognized for mailinglists
     "MAILMAN_ACCEPTABLE_ALIASES": {
         "verwaltung@lists.cde-ev.de": ["datenbank@cde-ev.de"],
@@ -263,6 +292,26 @@ _DEFAULTS = {
     # Backend stuff #
     #################
 
+    # if the planner estimates more log entries matching a filter, the estimate is
+    # used as total instead of counting the entries exactly
+    "LOG_COUNT_ESTIMATE_THRESHOLD": 100000,
+
+    # how long each process may use the meta info (including the lockdown flag)
+    # without reading it again, changes made by the same process apply immediately
+    "META_INFO_CACHE_TTL": datetime.timedelta(seconds=30),
+
+    # how long each process may use the defect address reports of a persona
+    # without reading them again, changes made by the same process apply immediately
+    "DEFECT_ADDRESS_CACHE_TTL": datetime.timedelta(minutes=5),
+
+    # how long each process keeps the generated views of the registration, course
+    # and lodgement queries, changes to the structure of an event apply immediately
+    "QUERY_VIEW_CACHE_TTL": datetime.timedelta(days=1),
+
+    # how long each process remembers which vote belongs to a voting secret, the
+    # remembered vote is verified against the secret on every use
+    "VOTE_ID_CACHE_TTL": datetime.timedelta(days=1),
+
     #
     # Core stuff
     #
@@ -278,6 +327,8 @@ _DEFAULTS = {
     "SESSION_TIMEOUT": datetime.timedelta(days=2),
     # maximum time which a session may remain active
     "SESSION_LIFESPAN": datetime.timedelta(days=7),
+    # minimum time between two updates of the last access time of a session
+    "SESSION_ATIME_RESOLUTION": datetime.timedelta(minutes=1),
     # minimum time which sessions stay in the database
     "SESSION_SAVETIME": datetime.timedelta(days=30),
 
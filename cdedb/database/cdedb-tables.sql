@@ -196,7 +196,14 @@ CREATE TABLE core.personas (
             CHECK(is_cde_realm = (paper_expuls IS NOT NULL)),
         -- automatically managed attribute containing all above values as a
         -- string for fulltext search
-        fulltext                varchar NOT NULL
+        fulltext                varchar NOT NULL,
+        -- lowercase fulltext without diacritics for the trigram index,
+        -- keep in sync with cdedb.common.normalize_fulltext
+        fulltext_normalized     varchar GENERATED ALWAYS AS (
+            translate(lower(fulltext),
+                      'àáâãäåąæçčćèéêëęìíîïłñńòóôõöøőœùúûüűýÿźżß',
+                      'aaaaaaaaccceeeeeiiiilnnoooooooouuuuuyyzzs')
+        ) STORED
 );
 CREATE INDEX personas_username_idx ON core.personas(username);
 CREATE INDEX personas_is_cde_realm_idx ON core.personas(is_cde_realm);
@@ -205,6 +212,8 @@ CREATE INDEX personas_is_ml_realm_idx ON core.personas(is_ml_realm);
 CREATE INDEX personas_is_assembly_realm_idx ON core.personas(is_assembly_realm);
 CREATE INDEX personas_is_member_idx ON core.personas(is_member);
 CREATE INDEX personas_is_searchable_idx ON core.personas(is_searchable);
+CREATE INDEX personas_fulltext_normalized_idx ON core.personas
+    USING gin(fulltext_normalized gin_trgm_ops);
 GRANT SELECT (id, username, password_hash, is_active, is_meta_admin, is_core_admin, is_cde_admin, is_finance_admin, is_event_admin, is_ml_admin, is_assembly_admin, is_cdelokal_admin, is_auditor, is_cde_realm, is_event_realm, is_ml_realm, is_assembly_realm, is_member, is_searchable, is_archived, is_purged) ON core.personas TO cdb_anonymous, cdb_ldap;
 GRANT SELECT (display_name, given_names, family_name, title, name_supplement) ON core.personas TO cdb_ldap;
 -- required for _changelog_resolve_change_unsafe
@@ -354,8 +363,8 @@ CREATE TABLE core.log (
         change_note             varchar
 );
 -- TODO: Add additional indexes and/or expand the columns?
-CREATE INDEX core_log_code_idx ON core.log(code);
-CREATE INDEX core_log_persona_id_idx ON core.log(persona_id);
+CREATE INDEX core_log_code_idx ON core.log(code, id);
+CREATE INDEX core_log_persona_id_idx ON core.log(persona_id, id);
 GRANT SELECT ON core.log TO cdb_member;
 GRANT UPDATE (change_note), DELETE ON core.log TO cdb_admin;
 GRANT INSERT ON core.log TO cdb_anonymous;
@@ -442,8 +451,8 @@ CREATE TABLE core.changelog (
         foto                    varchar,
         paper_expuls            boolean
 );
-CREATE INDEX changelog_code_idx ON core.changelog(code);
-CREATE INDEX changelog_persona_id_idx ON core.changelog(persona_id);
+CREATE INDEX changelog_code_idx ON core.changelog(code, id);
+CREATE INDEX changelog_persona_id_idx ON core.changelog(persona_id, id);
 CREATE UNIQUE INDEX changelog_persona_id_pending ON core.changelog(persona_id) WHERE code = 1;
 -- SELECT can not be easily restricted here due to change displacement logic
 GRANT SELECT, INSERT ON core.changelog TO cdb_persona;
@@ -500,6 +509,9 @@ CREATE TABLE core.postal_code_locations (
         lat             float8,
         long            float8
 );
+-- Allows to look up nearby postal codes via earth_box.
+CREATE INDEX postal_code_locations_earth_location_idx
+    ON core.postal_code_locations USING gist(earth_location);
 GRANT SELECT ON core.postal_code_locations TO cdb_persona;
 
 ---
@@ -621,8 +633,8 @@ CREATE TABLE cde.finance_log (
         -- sum of all member balances (SELECT SUM(balance) FROM core.personas)
         total                   numeric(11, 2) NOT NULL
 );
-CREATE INDEX cde_finance_log_code_idx ON cde.finance_log(code);
-CREATE INDEX cde_finance_log_persona_id_idx ON cde.finance_log(persona_id);
+CREATE INDEX cde_finance_log_code_idx ON cde.finance_log(code, id);
+CREATE INDEX cde_finance_log_persona_id_idx ON cde.finance_log(persona_id, id);
 GRANT SELECT, INSERT ON cde.finance_log TO cdb_member;
 GRANT SELECT, UPDATE ON cde.finance_log_id_seq TO cdb_member;
 -- In contrast to other logs, UPDATE and DELETE are not possible for cdb_admin to ensure integrity.
@@ -641,8 +653,8 @@ CREATE TABLE cde.log (
         CONSTRAINT cde_log_anonymous CHECK (persona_id is NULL),
         change_note             varchar
 );
-CREATE INDEX cde_log_code_idx ON cde.log(code);
-CREATE INDEX cde_log_persona_id_idx ON cde.log(persona_id);
+CREATE INDEX cde_log_code_idx ON cde.log(code, id);
+CREATE INDEX cde_log_persona_id_idx ON cde.log(persona_id, id);
 GRANT SELECT ON cde.log TO cdb_member;
 -- These are global state changes on the semester change, which shall never be deleted.
 GRANT INSERT ON cde.log TO cdb_admin;
@@ -721,8 +733,8 @@ CREATE TABLE past_event.log (
         persona_id              integer REFERENCES core.personas(id),
         change_note             varchar
 );
-CREATE INDEX past_event_log_code_idx ON past_event.log(code);
-CREATE INDEX past_event_log_event_id_idx ON past_event.log(pevent_id);
+CREATE INDEX past_event_log_code_idx ON past_event.log(code, id);
+CREATE INDEX past_event_log_event_id_idx ON past_event.log(pevent_id, id);
 GRANT SELECT ON past_event.log TO cdb_member;
 GRANT INSERT, UPDATE (change_note), DELETE ON past_event.log TO cdb_admin;
 GRANT SELECT, UPDATE ON past_event.log_id_seq TO cdb_admin;
@@ -1178,8 +1190,8 @@ CREATE TABLE event.log (
         persona_id              integer REFERENCES core.personas(id),
         change_note             varchar
 );
-CREATE INDEX event_log_code_idx ON event.log(code);
-CREATE INDEX event_log_event_id_idx ON event.log(event_id);
+CREATE INDEX event_log_code_idx ON event.log(code, id);
+CREATE INDEX event_log_event_id_idx ON event.log(event_id, id);
 GRANT SELECT, INSERT ON event.log TO cdb_persona;
 GRANT SELECT, UPDATE ON event.log_id_seq TO cdb_persona;
 GRANT UPDATE (change_note), DELETE ON event.log TO cdb_admin;
@@ -1268,6 +1280,11 @@ CREATE TABLE assembly.ballots (
         comment                 varchar
 );
 CREATE INDEX ballots_assembly_id_idx ON assembly.ballots(assembly_id);
+-- the next deadline of untallied ballots, to find ballots to extend or tally,
+-- keep in sync with cdedb.backend.assembly.BALLOT_DEADLINE
+CREATE INDEX ballots_deadline_idx ON assembly.ballots(
+        (CASE WHEN extended THEN vote_extension_end ELSE vote_end END))
+        WHERE NOT is_tallied;
 GRANT SELECT, INSERT, UPDATE, DELETE ON assembly.ballots TO cdb_member;
 GRANT SELECT, UPDATE ON assembly.ballots_id_seq TO cdb_member;
 
@@ -1371,8 +1388,8 @@ CREATE TABLE assembly.log (
         persona_id              integer REFERENCES core.personas(id),
         change_note             varchar
 );
-CREATE INDEX assembly_log_code_idx ON assembly.log(code);
-CREATE INDEX assembly_log_assembly_id_idx ON assembly.log(assembly_id);
+CREATE INDEX assembly_log_code_idx ON assembly.log(code, id);
+CREATE INDEX assembly_log_assembly_id_idx ON assembly.log(assembly_id, id);
 GRANT UPDATE (change_note), DELETE ON assembly.log TO cdb_admin;
 GRANT SELECT, INSERT ON assembly.log TO cdb_member;
 GRANT SELECT, UPDATE ON assembly.log_id_seq TO cdb_member;
@@ -1503,8 +1520,106 @@ CREATE TABLE ml.log (
         persona_id              integer REFERENCES core.personas(id),
         change_note             varchar
 );
-CREATE INDEX ml_log_code_idx ON ml.log(code);
-CREATE INDEX ml_log_mailinglist_id_idx ON ml.log(mailinglist_id);
+CREATE INDEX ml_log_code_idx ON ml.log(code, id);
+CREATE INDEX ml_log_mailinglist_id_idx ON ml.log(mailinglist_id, id);
 GRANT SELECT, INSERT ON ml.log TO cdb_persona;
 GRANT UPDATE (change_note), DELETE ON ml.log TO cdb_admin;
 GRANT SELECT, UPDATE ON ml.log_id_seq TO cdb_persona;
+
+---
+--- Subscription changes
+---
+
+-- The mailinglists whose subscribers changed, appended to by the triggers below
+-- once per statement. This allows the mailman sync to skip unchanged
+-- mailinglists. Rows are only ever inserted, so concurrent changes of the same
+-- mailinglist do not conflict, and the mailman sync prunes those it no longer
+-- needs. There is no foreign key, so deleting a mailinglist is not blocked.
+CREATE TABLE ml.subscription_changes (
+        id                      bigserial PRIMARY KEY,
+        mailinglist_id          integer NOT NULL
+);
+GRANT SELECT, INSERT ON ml.subscription_changes TO cdb_persona;
+GRANT DELETE ON ml.subscription_changes TO cdb_admin;
+GRANT SELECT, UPDATE ON ml.subscription_changes_id_seq TO cdb_persona;
+
+CREATE FUNCTION ml.mark_subscription_changes() RETURNS trigger AS $$
+BEGIN
+        IF TG_OP = 'INSERT' THEN
+                INSERT INTO ml.subscription_changes (mailinglist_id)
+                        SELECT DISTINCT mailinglist_id FROM new_rows;
+        ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO ml.subscription_changes (mailinglist_id)
+                        SELECT DISTINCT mailinglist_id FROM old_rows;
+        ELSE
+                INSERT INTO ml.subscription_changes (mailinglist_id)
+                        SELECT mailinglist_id FROM old_rows
+                        UNION SELECT mailinglist_id FROM new_rows;
+        END IF;
+        RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables are only available for triggers on a single event.
+CREATE TRIGGER subscription_states_mark_insert
+        AFTER INSERT ON ml.subscription_states
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+CREATE TRIGGER subscription_states_mark_update
+        AFTER UPDATE ON ml.subscription_states
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+CREATE TRIGGER subscription_states_mark_delete
+        AFTER DELETE ON ml.subscription_states
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+CREATE TRIGGER subscription_addresses_mark_insert
+        AFTER INSERT ON ml.subscription_addresses
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+CREATE TRIGGER subscription_addresses_mark_update
+        AFTER UPDATE ON ml.subscription_addresses
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+CREATE TRIGGER subscription_addresses_mark_delete
+        AFTER DELETE ON ml.subscription_addresses
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+
+---
+--- LDAP cache invalidation
+---
+
+-- The ldap server caches group memberships. These triggers notify it about
+-- changes of the underlying tables, see cdedb.ldap.cache.
+CREATE FUNCTION core.notify_ldap_cache() RETURNS trigger AS $$
+BEGIN
+        PERFORM pg_notify('ldap_cache', TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME);
+        RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER personas_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON core.personas
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER assemblies_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON assembly.assemblies
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER presiders_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON assembly.presiders
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER events_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON event.events
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER orgas_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON event.orgas
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER mailinglists_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml.mailinglists
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER moderators_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml.moderators
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+CREATE TRIGGER subscription_states_notify_ldap_cache
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml.subscription_states
+        FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
@@ -8,8 +8,13 @@ contexts for database transactions across arbitrary backend logic.
 This should be the only module which makes subsistantial use of psycopg.
 """
 
+import contextlib
+import datetime
 import logging
-from collections.abc import Collection, Mapping
+import threading
+import time
+import weakref
+from collections.abc import Callable, Collection, Iterator, Mapping
 from types import TracebackType
 from typing import Any, NoReturn, Optional
 
@@ -74,9 +79,14 @@ def _create_connection(dbname: str, dbuser: str, password: str, host: str,
 def connection_pool_factory(dbname: str, roles: Collection[Role],
                             secrets: SecretsConfig, host: str, port: int,
                             isolation_level: Optional[int] = SERIALIZABLE,
+                            pool_size: int = 0,
+                            max_idle: datetime.timedelta = datetime.timedelta(
+                                minutes=5),
+                            timeout: datetime.timedelta = datetime.timedelta(
+                                seconds=10),
                             ) -> Mapping[str, "IrradiatedConnection"]:
     """This returns a dict-like object which has database roles as keys and
-    database connections as values (which are created on the fly).
+    database connections as values.
 
     Database connections are a costly good (in memory terms), so it is
     wise to create them only when necessary. Since this is costly in
@@ -87,17 +97,42 @@ def connection_pool_factory(dbname: str, roles: Collection[Role],
     The first implementation of this interface was a caching connection
     factory, which used crazy amounts of resources.
 
+    If a positive `pool_size` is given, a :py:class:`PersistentConnectionPool`
+    is returned instead, which keeps up to `pool_size` connections per role
+    open and hands them out again after they have been closed. The pool is
+    shared by all callers in this process with the same database parameters.
+
+    In both cases the caller has to :py:meth:`IrradiatedConnection.close` the
+    connection after usage, see also :py:func:`pooled_connection`.
+
     :param roles: roles for which database connections shall be available
     :param secrets: container for db passwords
     :param isolation_level: Isolation level of database connection, a
         constant coming from :py:mod:`psycopg2.extensions`. This should be used
         very sparingly!
+    :param pool_size: Maximum number of connections per role kept by a
+        persistent pool. Zero disables persistent pooling.
+    :param max_idle: Idle time after which a pooled connection is closed.
+    :param timeout: Maximum time to wait for a free pooled connection.
     :returns: dict-like object with semantics {str :
                 :py:class:`IrradiatedConnection`}
     """
     # local variable to prevent closure over secrets
     db_passwords = secrets["CDB_DATABASE_ROLES"]
 
+    if pool_size > 0:
+        key = (dbname, tuple(sorted(roles)), host, port, isolation_level)
+        with _PERSISTENT_POOLS_LOCK:
+            if key not in _PERSISTENT_POOLS:
+                _PERSISTENT_POOLS[key] = PersistentConnectionPool(
+                    lambda role: _create_connection(
+                        dbname, role, db_passwords[role], host, port,
+                        isolation_level),
+                    roles, isolation_level, pool_size, max_idle, timeout)
+                _LOGGER.debug(f"Initialised persistent connection pool for roles"
+                              f" {roles} with size {pool_size}")
+            return _PERSISTENT_POOLS[key]
+
     class InstantConnectionPool(Mapping[Role, "IrradiatedConnection"]):
         """Dict-like for providing database connections."""
 
@@ -127,6 +162,199 @@ def connection_pool_factory(dbname: str, roles: Collection[Role],
     return InstantConnectionPool(roles)
 
 
+class PoolTimeoutError(RuntimeError):
+    """No pooled connection became available in time."""
+
+
+class PersistentConnectionPool(Mapping[Role, "IrradiatedConnection"]):
+    """Dict-like which keeps database connections open between usages.
+
+    Looking up a role checks out an idle connection (or creates a new one if
+    less than `size` connections of this role are in use). Closing the
+    connection afterwards checks it back in, which rolls back any unfinished
+    transaction and resets the session characteristics. If all connections
+    of a role are in use, the lookup blocks until one is checked in or the
+    timeout is reached.
+
+    Checked out connections are only tracked weakly, so a connection which
+    is dropped without being closed frees its slot once it is garbage
+    collected.
+
+    This is thread-safe.
+    """
+    #: Idle connections older than this are pinged before being handed out.
+    PING_INTERVAL = 30.0
+
+    def __init__(self, connect: Callable[[Role], "IrradiatedConnection"],
+                 roles: Collection[Role], isolation_level: Optional[int],
+                 size: int, max_idle: datetime.timedelta,
+                 timeout: datetime.timedelta):
+        self.roles = tuple(roles)
+        self.size = size
+        self.max_idle = max_idle.total_seconds()
+        self.timeout = timeout.total_seconds()
+        self._connect = connect
+        self._isolation_level = isolation_level
+        self._cond = threading.Condition()
+        # Idle connections with the time of their last checkin, newest last.
+        self._idle: dict[Role, list[tuple[float, IrradiatedConnection]]] = {
+            role: [] for role in self.roles}
+        self._in_use: dict[Role, weakref.WeakSet[IrradiatedConnection]] = {
+            role: weakref.WeakSet() for role in self.roles}
+        self._connecting: dict[Role, int] = {role: 0 for role in self.roles}
+        self._stats: dict[Role, dict[str, float]] = {
+            role: {"created": 0, "reused": 0, "evicted": 0, "discarded": 0,
+                   "waits": 0, "wait_time": 0.0, "max_wait_time": 0.0}
+            for role in self.roles}
+
+    def __getitem__(self, role: Role) -> "IrradiatedConnection":
+        if role not in self.roles:
+            raise ValueError(n_("role %(role)s not available"),
+                             {'role': role})
+        begin = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                self._evict(role)
+                while self._idle[role]:
+                    checkin_time, conn = self._idle[role].pop()
+                    if self._is_healthy(conn, time.monotonic() - checkin_time):
+                        self._stats[role]["reused"] += 1
+                        return self._checkout(role, conn, begin, waited)
+                    self._discard(role, conn)
+                if len(self._in_use[role]) + self._connecting[role] < self.size:
+                    break
+                remaining = self.timeout - (time.monotonic() - begin)
+                if remaining <= 0:
+                    _LOGGER.warning(f"Timeout waiting for connection as {role}.")
+                    raise PoolTimeoutError(n_("No database connection available."))
+                waited = True
+                self._cond.wait(remaining)
+            # Reserve the slot while connecting outside of the lock.
+            self._connecting[role] += 1
+        try:
+            conn = self._connect(role)
+        finally:
+            with self._cond:
+                self._connecting[role] -= 1
+                self._cond.notify()
+        with self._cond:
+            self._stats[role]["created"] += 1
+            return self._checkout(role, conn, begin, waited)
+
+    def _checkout(self, role: Role, conn: "IrradiatedConnection", begin: float,
+                  waited: bool) -> "IrradiatedConnection":
+        """Mark a connection as in use. Needs to hold the lock."""
+        conn._pool = self
+        conn._pool_role = role
+        self._in_use[role].add(conn)
+        if waited:
+            wait_time = time.monotonic() - begin
+            stats = self._stats[role]
+            stats["waits"] += 1
+            stats["wait_time"] += wait_time
+            stats["max_wait_time"] = max(stats["max_wait_time"], wait_time)
+            _LOGGER.debug(f"Waited {wait_time:.3f}s for connection as {role}.")
+        return conn
+
+    def checkin(self, conn: "IrradiatedConnection") -> None:
+        """Return a connection to the pool.
+
+        This is called by :py:meth:`IrradiatedConnection.close`.
+        """
+        role = conn._pool_role
+        reusable = not conn.closed and not conn.is_contaminated
+        if reusable:
+            try:
+                if (conn.get_transaction_status()
+                        != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+                    conn.rollback()
+                conn.set_session(self._isolation_level, readonly=False,
+                                 deferrable=False, autocommit=False)
+            except psycopg2.Error:
+                reusable = False
+        with self._cond:
+            self._in_use[role].discard(conn)
+            if reusable:
+                self._idle[role].append((time.monotonic(), conn))
+            else:
+                self._discard(role, conn)
+            self._cond.notify()
+
+    def _is_healthy(self, conn: "IrradiatedConnection", idle_time: float) -> bool:
+        """Check whether an idle connection may be handed out again."""
+        if conn.closed or (conn.get_transaction_status()
+                           != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+            return False
+        if idle_time > self.PING_INTERVAL:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        return True
+
+    def _evict(self, role: Role) -> None:
+        """Close connections which have been idle for too long."""
+        cutoff = time.monotonic() - self.max_idle
+        idle = self._idle[role]
+        while idle and idle[0][0] < cutoff:
+            _, conn = idle.pop(0)
+            self._stats[role]["evicted"] += 1
+            conn._pool = None
+            conn.close()
+
+    def _discard(self, role: Role, conn: "IrradiatedConnection") -> None:
+        self._stats[role]["discarded"] += 1
+        conn._pool = None
+        if not conn.closed:
+            conn.close()
+
+    def stats(self) -> dict[Role, dict[str, float]]:
+        """Provide usage metrics of the pool per role."""
+        with self._cond:
+            return {
+                role: dict(self._stats[role], in_use=len(self._in_use[role]),
+                           idle=len(self._idle[role]), size=self.size)
+                for role in self.roles
+            }
+
+    def clear(self) -> None:
+        """Close all idle connections."""
+        with self._cond:
+            for role in self.roles:
+                while self._idle[role]:
+                    _, conn = self._idle[role].pop()
+                    self._discard(role, conn)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __iter__(self) -> Iterator[Role]:
+        return iter(self.roles)
+
+
+_PERSISTENT_POOLS: dict[tuple[Any, ...], PersistentConnectionPool] = {}
+_PERSISTENT_POOLS_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def pooled_connection(connpool: Mapping[Role, "IrradiatedConnection"], role: Role,
+                      ) -> Iterator["IrradiatedConnection"]:
+    """Use a connection of a pool for one transaction and release it afterwards.
+
+    This works for both kinds of pools returned by
+    :py:func:`connection_pool_factory`.
+    """
+    conn = connpool[role]
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
 # noinspection PyProtectedMember
 class Atomizer:
     """Helper to create atomic transactions.
@@ -189,6 +417,9 @@ class IrradiatedConnection(psycopg2.extensions.connection):
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
         self._radiation_level = 0
+        # set by PersistentConnectionPool while the connection is checked out
+        self._pool: Optional[PersistentConnectionPool] = None
+        self._pool_role: Role = ""
         # keep a copy of any exception we encounter.
         self._saved_etype: Optional[type[BaseException]] = None
         self._saved_evalue: Optional[BaseException] = None
@@ -228,6 +459,14 @@ class IrradiatedConnection(psycopg2.extensions.connection):
                 raise RuntimeError(n_("Suppressed exception detected"))
             return super().__exit__(etype, evalue, tb)
 
+    def close(self) -> None:
+        """Close the connection or return it to its pool."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            pool.checkin(self)
+        else:
+            super().close()
+
     # Override this to annotate, that we always use a RealDictCursor.
     def cursor(self, *args: Any, **kwargs: Any) -> RealDictCursor:  # type: ignore[override]
         return super().cursor(*args, **kwargs)
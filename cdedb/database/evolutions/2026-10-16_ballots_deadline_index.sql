@@ -0,0 +1,5 @@
+BEGIN;
+    CREATE INDEX ballots_deadline_idx ON assembly.ballots(
+        (CASE WHEN extended THEN vote_extension_end ELSE vote_end END))
+        WHERE NOT is_tallied;
+COMMIT;
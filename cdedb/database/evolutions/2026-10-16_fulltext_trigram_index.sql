@@ -0,0 +1,12 @@
+BEGIN;
+    -- Lowercase fulltext without diacritics, which allows to prefilter fulltext
+    -- searches via a trigram index.
+    ALTER TABLE core.personas ADD COLUMN fulltext_normalized varchar
+        GENERATED ALWAYS AS (
+            translate(lower(fulltext),
+                      'àáâãäåąæçčćèéêëęìíîïłñńòóôõöøőœùúûüűýÿźżß',
+                      'aaaaaaaaccceeeeeiiiilnnoooooooouuuuuyyzzs')
+        ) STORED;
+    CREATE INDEX personas_fulltext_normalized_idx ON core.personas
+        USING gin(fulltext_normalized gin_trgm_ops);
+COMMIT;
@@ -0,0 +1,35 @@
+BEGIN;
+    -- The ldap server caches group memberships. These triggers notify it about
+    -- changes of the underlying tables, see cdedb.ldap.cache.
+    CREATE FUNCTION core.notify_ldap_cache() RETURNS trigger AS $$
+    BEGIN
+            PERFORM pg_notify('ldap_cache', TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME);
+            RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER personas_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON core.personas
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER assemblies_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON assembly.assemblies
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER presiders_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON assembly.presiders
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER events_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON event.events
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER orgas_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON event.orgas
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER mailinglists_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml.mailinglists
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER moderators_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml.moderators
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+    CREATE TRIGGER subscription_states_notify_ldap_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml.subscription_states
+            FOR EACH STATEMENT EXECUTE FUNCTION core.notify_ldap_cache();
+COMMIT;
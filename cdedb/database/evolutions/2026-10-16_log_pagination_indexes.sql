@@ -0,0 +1,35 @@
+BEGIN;
+    -- Composite indexes allow to filter the logs and paginate them by id at once.
+    DROP INDEX core.core_log_code_idx;
+    CREATE INDEX core_log_code_idx ON core.log(code, id);
+    DROP INDEX core.core_log_persona_id_idx;
+    CREATE INDEX core_log_persona_id_idx ON core.log(persona_id, id);
+    DROP INDEX core.changelog_code_idx;
+    CREATE INDEX changelog_code_idx ON core.changelog(code, id);
+    DROP INDEX core.changelog_persona_id_idx;
+    CREATE INDEX changelog_persona_id_idx ON core.changelog(persona_id, id);
+    DROP INDEX cde.cde_finance_log_code_idx;
+    CREATE INDEX cde_finance_log_code_idx ON cde.finance_log(code, id);
+    DROP INDEX cde.cde_finance_log_persona_id_idx;
+    CREATE INDEX cde_finance_log_persona_id_idx ON cde.finance_log(persona_id, id);
+    DROP INDEX cde.cde_log_code_idx;
+    CREATE INDEX cde_log_code_idx ON cde.log(code, id);
+    DROP INDEX cde.cde_log_persona_id_idx;
+    CREATE INDEX cde_log_persona_id_idx ON cde.log(persona_id, id);
+    DROP INDEX past_event.past_event_log_code_idx;
+    CREATE INDEX past_event_log_code_idx ON past_event.log(code, id);
+    DROP INDEX past_event.past_event_log_event_id_idx;
+    CREATE INDEX past_event_log_event_id_idx ON past_event.log(pevent_id, id);
+    DROP INDEX event.event_log_code_idx;
+    CREATE INDEX event_log_code_idx ON event.log(code, id);
+    DROP INDEX event.event_log_event_id_idx;
+    CREATE INDEX event_log_event_id_idx ON event.log(event_id, id);
+    DROP INDEX assembly.assembly_log_code_idx;
+    CREATE INDEX assembly_log_code_idx ON assembly.log(code, id);
+    DROP INDEX assembly.assembly_log_assembly_id_idx;
+    CREATE INDEX assembly_log_assembly_id_idx ON assembly.log(assembly_id, id);
+    DROP INDEX ml.ml_log_code_idx;
+    CREATE INDEX ml_log_code_idx ON ml.log(code, id);
+    DROP INDEX ml.ml_log_mailinglist_id_idx;
+    CREATE INDEX ml_log_mailinglist_id_idx ON ml.log(mailinglist_id, id);
+COMMIT;
@@ -0,0 +1,5 @@
+BEGIN;
+    -- Allows to look up nearby postal codes via earth_box instead of a full scan.
+    CREATE INDEX postal_code_locations_earth_location_idx
+        ON core.postal_code_locations USING gist(earth_location);
+COMMIT;
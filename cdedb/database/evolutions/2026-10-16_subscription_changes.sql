@@ -0,0 +1,57 @@
+BEGIN;
+    -- The mailinglists whose subscribers changed, appended to by the triggers below
+    -- once per statement. This allows the mailman sync to skip unchanged
+    -- mailinglists. Rows are only ever inserted, so concurrent changes of the same
+    -- mailinglist do not conflict, and the mailman sync prunes those it no longer
+    -- needs. There is no foreign key, so deleting a mailinglist is not blocked.
+    CREATE TABLE ml.subscription_changes (
+            id                      bigserial PRIMARY KEY,
+            mailinglist_id          integer NOT NULL
+    );
+    GRANT SELECT, INSERT ON ml.subscription_changes TO cdb_persona;
+    GRANT DELETE ON ml.subscription_changes TO cdb_admin;
+    GRANT SELECT, UPDATE ON ml.subscription_changes_id_seq TO cdb_persona;
+
+    CREATE FUNCTION ml.mark_subscription_changes() RETURNS trigger AS $$
+    BEGIN
+            IF TG_OP = 'INSERT' THEN
+                    INSERT INTO ml.subscription_changes (mailinglist_id)
+                            SELECT DISTINCT mailinglist_id FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                    INSERT INTO ml.subscription_changes (mailinglist_id)
+                            SELECT DISTINCT mailinglist_id FROM old_rows;
+            ELSE
+                    INSERT INTO ml.subscription_changes (mailinglist_id)
+                            SELECT mailinglist_id FROM old_rows
+                            UNION SELECT mailinglist_id FROM new_rows;
+            END IF;
+            RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    -- Transition tables are only available for triggers on a single event.
+    CREATE TRIGGER subscription_states_mark_insert
+            AFTER INSERT ON ml.subscription_states
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+    CREATE TRIGGER subscription_states_mark_update
+            AFTER UPDATE ON ml.subscription_states
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+    CREATE TRIGGER subscription_states_mark_delete
+            AFTER DELETE ON ml.subscription_states
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+    CREATE TRIGGER subscription_addresses_mark_insert
+            AFTER INSERT ON ml.subscription_addresses
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+    CREATE TRIGGER subscription_addresses_mark_update
+            AFTER UPDATE ON ml.subscription_addresses
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+    CREATE TRIGGER subscription_addresses_mark_delete
+            AFTER DELETE ON ml.subscription_addresses
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION ml.mark_subscription_changes();
+COMMIT;
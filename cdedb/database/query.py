@@ -8,15 +8,18 @@ This is used by :py:class:`AbstractBackend` to access the database.
 import datetime
 import decimal
 import enum
+import itertools
 import logging
-from collections.abc import Collection, Sequence
+import time
+from collections.abc import Collection, Iterator, Sequence
 from typing import Optional, Union, cast
 
 import psycopg2.extensions
 import psycopg2.extras
 
 from cdedb.common import CdEDBObject, DefaultReturnCode, PsycoJson, unwrap
-from cdedb.database.connection import ConnectionContainer, n_
+from cdedb.common.instrumentation import current_request
+from cdedb.database.connection import Atomizer, ConnectionContainer, n_
 from cdedb.database.conversions import from_db_output, to_db_input
 from cdedb.models.common import CdEDataclass
 
@@ -35,6 +38,9 @@ EntityKey = Union[int, str]
 # of the corresponding entities. Note that we do not use string identifiers for this.
 EntityKeys = Collection[int]
 
+# Server-side cursors need a name which is unique for their connection.
+_CURSOR_IDS = itertools.count()
+
 
 class SqlQueryBackend:
     """Python backend to access the SQL database layer.
@@ -62,7 +68,13 @@ class SqlQueryBackend:
         sanitized_params = tuple(to_db_input(p) for p in params)
         self.logger.debug(f"Execute PostgreSQL query"
                           f" {cur.mogrify(query, sanitized_params).decode()}.")
+        timing = current_request()
+        if timing is None:
+            cur.execute(query, sanitized_params)
+            return
+        begin = time.perf_counter()
         cur.execute(query, sanitized_params)
+        timing.record_query(query, time.perf_counter() - begin)
 
     def query_exec(self, container: ConnectionContainer, query: str,
                    params: Sequence[DatabaseValue_s]) -> int:
@@ -96,6 +108,34 @@ class SqlQueryBackend:
                     cast(CdEDBObject, from_db_output(x))
                     for x in cur.fetchall())
 
+    def query_iter(self, container: ConnectionContainer, query: str,
+                   params: Sequence[DatabaseValue_s], batch_size: int = 1000,
+                   ) -> Iterator[CdEDBObject]:
+        """Execute a query in a safe way, retrieving the results lazily.
+
+        This uses a named (server-side) cursor, so only `batch_size` rows at a time
+        are transferred and kept in memory. Like with an :py:class:`Atomizer`, the
+        transaction stays open until the returned iterator is exhausted or closed,
+        so queries issued in the meantime become part of it.
+
+        :returns: iterator over the results of query
+        """
+        rows = self._query_iter(container, query, params, batch_size)
+        # Declare the cursor right away, so that errors are raised here.
+        next(rows)
+        return cast(Iterator[CdEDBObject], rows)
+
+    def _query_iter(self, container: ConnectionContainer, query: str,
+                    params: Sequence[DatabaseValue_s], batch_size: int,
+                    ) -> Iterator[Optional[CdEDBObject]]:
+        with Atomizer(container) as conn:
+            with conn.cursor(name=f"query_iter_{next(_CURSOR_IDS)}") as cur:
+                cur.itersize = batch_size
+                self.execute_db_query(cur, query, params)
+                yield None
+                for x in cur:
+                    yield cast(CdEDBObject, from_db_output(x))
+
     def sql_insert(self, container: ConnectionContainer, table: str, data: CdEDBObject,
                    entity_key: str = "id", drop_on_conflict: bool = False,
                    update_on_conflict: bool = False,
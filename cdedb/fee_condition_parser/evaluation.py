@@ -1,11 +1,13 @@
 # pylint: disable=line-too-long,bad-builtin,missing-module-docstring
 import dataclasses
-from collections.abc import Set as AbstractSet
-from functools import partial
+from collections.abc import Iterable, Set as AbstractSet
+from functools import lru_cache
 from typing import Callable
 
 import pyparsing as pp
 
+import cdedb.fee_condition_parser.parsing as fcp_parsing
+
 
 @dataclasses.dataclass
 class ReferencedNames:
@@ -61,25 +63,54 @@ def evaluate(result: pp.ParseResults, field_values: dict[str, bool], part_values
     return functions[result.get_name()](result)
 
 
-#: Tuple (evaluator, evaluate_args) for each result Group name.
-_EVALUATOR_FUNCTIONS: dict[str, tuple[Callable[..., bool], bool]] = {
-    'and': (lambda x, y, f, p, o: x(f, p, o) and y(f, p, o), True),
-    'or': (lambda x, y, f, p, o: x(f, p, o) or y(f, p, o), True),
-    'xor': (lambda x, y, f, p, o: x(f, p, o) != y(f, p, o), True),
-    'not': (lambda x, f, p, o: not x(f, p, o), True),
-    'true': (lambda f, p, o: True, False),
-    'false': (lambda f, p, o: False, False),
-    'field': (lambda t, f, p, o: f[t], False),
-    'part': (lambda t, f, p, o: p[t], False),
-    'bool': (lambda t, f, p, o: o[t], False),
-}
-
-
-# TODO: Do we need this? We don't use it?
-def create_evaluator(result: pp.ParseResults) -> Callable[[dict[str, bool], dict[str, bool]], bool]:
-    # num_bound_args = _EVALUATOR_NARY[result.get_name()]
-    evaluator, evaluate_args = _EVALUATOR_FUNCTIONS[result.get_name()]
-    if evaluate_args:
-        return partial(evaluator, *(create_evaluator(token) for token in result))
-    else:
-        return partial(evaluator, *result)
+#: Signature of a compiled condition: (field_values, part_values, other_values) -> bool
+ConditionEvaluator = Callable[[dict[str, bool], dict[str, bool], dict[str, bool]], bool]
+#: Signature of a compiled condition evaluating many sets of values at once.
+VectorizedConditionEvaluator = Callable[[Iterable[tuple[dict[str, bool], dict[str, bool], dict[str, bool]]]], list[bool]]
+
+
+def _to_python(result: pp.ParseResults) -> str:
+    """Translate a parse result into an equivalent python expression.
+
+    The expression uses the names `f`, `p` and `o` for the field, part and other
+    values respectively. Names are inserted as string literals, so arbitrary part
+    shortnames are safe. The operators behave exactly like in `evaluate`.
+    """
+    functions = {
+        'and': lambda x: f"({_to_python(x[0])} and {_to_python(x[1])})",
+        'or': lambda x: f"({_to_python(x[0])} or {_to_python(x[1])})",
+        'xor': lambda x: f"({_to_python(x[0])} != {_to_python(x[1])})",
+        'not': lambda x: f"(not {_to_python(x[0])})",
+        'true': lambda x_: "True",
+        'false': lambda x_: "False",
+        'field': lambda x: f"f[{str(x[0])!r}]",
+        'part': lambda x: f"p[{str(x[0])!r}]",
+        'bool': lambda x: f"o[{str(x[0])!r}]",
+    }
+    return functions[result.get_name()](result)
+
+
+def create_evaluator(result: pp.ParseResults) -> ConditionEvaluator:
+    """Compile a parse result into a flat function.
+
+    This is equivalent to calling `evaluate` with the parse result, but avoids
+    walking the parse tree for every evaluation.
+    """
+    code = f"lambda f, p, o: bool({_to_python(result)})"
+    return eval(compile(code, "<fee condition>", "eval"), {"__builtins__": {"bool": bool}})  # pylint: disable=eval-used
+
+
+def create_vectorized_evaluator(result: pp.ParseResults) -> VectorizedConditionEvaluator:
+    """Compile a parse result into a function evaluating many value sets in one call.
+
+    The function takes an iterable of (field_values, part_values, other_values)
+    tuples and returns the list of results in the same order.
+    """
+    code = f"lambda values: [bool({_to_python(result)}) for f, p, o in values]"
+    return eval(compile(code, "<fee condition>", "eval"), {"__builtins__": {"bool": bool}})  # pylint: disable=eval-used
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(condition: str) -> VectorizedConditionEvaluator:
+    """Parse and compile a condition string, caching the result."""
+    return create_vectorized_evaluator(fcp_parsing.parse(condition))
@@ -2,6 +2,7 @@
 
 """The WSGI-application to tie it all together."""
 
+import functools
 import json
 import os
 import pathlib
@@ -15,10 +16,8 @@ import werkzeug.exceptions
 import werkzeug.routing
 import werkzeug.wrappers
 
-from cdedb.backend.assembly import AssemblyBackend
+import cdedb.common.instrumentation as instrumentation
 from cdedb.backend.core import CoreBackend
-from cdedb.backend.event import EventBackend
-from cdedb.backend.ml import MlBackend
 from cdedb.backend.session import SessionBackend
 from cdedb.common import (
     IGNORE_WARNINGS_NAME,
@@ -35,7 +34,7 @@ from cdedb.common.n_ import n_
 from cdedb.common.roles import ADMIN_VIEWS_COOKIE_NAME, roles_to_db_role
 from cdedb.config import SecretsConfig
 from cdedb.database import DATABASE_ROLES
-from cdedb.database.connection import connection_pool_factory
+from cdedb.database.connection import IrradiatedConnection, connection_pool_factory
 from cdedb.frontend.assembly import AssemblyFrontend
 from cdedb.frontend.cde import CdEFrontend
 from cdedb.frontend.common import (
@@ -44,8 +43,10 @@ from cdedb.frontend.common import (
     BaseApp,
     FrontendEndpoint,
     Response,
+    compile_templates,
     construct_redirect,
     docurl,
+    get_jinja_environments,
     sanitize_None,
     setup_translations,
     staticurl,
@@ -70,9 +71,6 @@ class Application(BaseApp):
     def __init__(self) -> None:
         super().__init__()
         self.coreproxy = make_proxy(CoreBackend())
-        self.eventproxy = make_proxy(EventBackend())
-        self.mlproxy = make_proxy(MlBackend())
-        self.assemblyproxy = make_proxy(AssemblyBackend())
         # do not use a make_proxy since the only usage here is before the
         # RequestState exists
         self.sessionproxy = SessionBackend()
@@ -95,7 +93,9 @@ class Application(BaseApp):
         secrets = SecretsConfig()
         self.connpool = connection_pool_factory(
             self.conf["CDB_DATABASE_NAME"], DATABASE_ROLES,
-            secrets, self.conf["DB_HOST"], self.conf["DB_PORT"])
+            secrets, self.conf["DB_HOST"], self.conf["DB_PORT"],
+            pool_size=self.conf["DB_POOL_SIZE"], max_idle=self.conf["DB_POOL_MAX_IDLE"],
+            timeout=self.conf["DB_POOL_TIMEOUT"])
         # Construct a reduced Jinja environment for rendering error pages.
         self.jinja_env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(
@@ -113,6 +113,10 @@ class Application(BaseApp):
         self.jinja_env.filters.update(JINJA_FILTERS)
         self.jinja_env.policies['ext.i18n.trimmed'] = True
         self.translations = setup_translations(self.conf)
+        if self.conf["TEMPLATE_WARM_UP"]:
+            # Avoid compiling the templates during the first requests.
+            num = compile_templates(get_jinja_environments(self.core))
+            self.logger.info(f"Loaded {num} templates.")
         if pathlib.Path("/PRODUCTIONVM").is_file():  # pragma: no cover
             # Sanity checks for the live instance
             if self.conf["CDEDB_DEV"] or self.conf["CDEDB_OFFLINE_DEPLOYMENT"]:
@@ -195,6 +199,22 @@ class Application(BaseApp):
 
     @werkzeug.wrappers.Request.application  # type: ignore[arg-type]
     def __call__(self, request: werkzeug.wrappers.Request) -> "WSGIApplication":
+        if not self.conf["INSTRUMENTATION"]:
+            return self.handle_request(request)
+        instrumentation.start_request(self.conf["INSTRUMENTATION_SLOW_QUERIES"])
+        try:
+            response = self.handle_request(request)
+        finally:
+            timing = instrumentation.finish_request()
+        if timing is not None:
+            self.logger.info(f"Request timing {json.dumps(timing.as_dict())}")
+            if isinstance(response, Response):
+                response.headers.add('Server-Timing', timing.server_timing())
+        return response
+
+    def handle_request(self, request: werkzeug.wrappers.Request,
+                       ) -> "WSGIApplication":
+        """Construct the request state and dispatch to the appropriate frontend."""
         # note time for performance measurement
         begin = now()
         user = User()
@@ -238,6 +258,8 @@ class Application(BaseApp):
                     return ret
 
             endpoint, args = urls.match()  # pylint: disable=unpacking-non-sequence
+            if timing := instrumentation.current_request():
+                timing.endpoint = endpoint
 
             lang = self.get_locale(request)
             rs = RequestState(
@@ -292,27 +314,12 @@ class Application(BaseApp):
             # It will be made accessible for the backends by the make_proxy.
             rs._conn = self.connpool[roles_to_db_role(user.roles)]
 
-            # Retrieve entity related privileges for personas.
-            # The session backend takes care of this for droids.
+            # Entity related privileges are retrieved by the session backend.
             if user.persona_id:
-                # Insert orga and moderator status context
-                orga: set[int] = set()
-                if "event" in user.roles:
-                    orga = self.eventproxy.orga_info(rs, user.persona_id)
-                moderator: set[int] = set()
-                if "ml" in user.roles:
-                    moderator = self.mlproxy.moderator_info(
-                        rs, user.persona_id)
-                presider: set[int] = set()
-                if "assembly" in user.roles:
-                    presider = self.assemblyproxy.presider_info(
-                        rs, user.persona_id)
-                user.orga = orga
-                user.moderator = moderator
-                user.presider = presider
                 user.init_admin_views_from_cookie(
                     request.cookies.get(ADMIN_VIEWS_COOKIE_NAME, ''))
 
+            release_connection = True
             try:
                 ret = handler(rs, **args)
                 if rs.validation_appraised is False:
@@ -320,6 +327,13 @@ class Application(BaseApp):
                         f"User {rs.user.persona_id} has evaded input validation"
                         f" with errors {rs.retrieve_validation_errors()}")
                     raise RuntimeError(f"Input validation forgotten: {handler}")
+                # noinspection PyProtectedMember
+                if ret.is_streamed and rs._conn.is_contaminated:
+                    # The response is still being retrieved from the database (see
+                    # `query_iter`), so keep the transaction open until it is sent.
+                    ret.call_on_close(functools.partial(
+                        self._release_connection, rs._conn))
+                    release_connection = False
                 return ret
             except QuotaException as e:
                 # Handle this earlier, since it needs database access.
@@ -334,10 +348,9 @@ class Application(BaseApp):
                        "some false positive restrictions. Your limit will be "
                        "reset in the next days."))
             finally:
-                # noinspection PyProtectedMember
-                rs._conn.commit()
-                # noinspection PyProtectedMember
-                rs._conn.close()
+                if release_connection:
+                    # noinspection PyProtectedMember
+                    self._release_connection(rs._conn)
         except werkzeug.routing.RequestRedirect as e:
             return e.get_response(request.environ)
         except werkzeug.exceptions.HTTPException as e:
@@ -376,6 +389,12 @@ class Application(BaseApp):
             # TODO add original_error after upgrading to werkzeug 1.0
             return self.make_error_page(e, request, user)
 
+    @staticmethod
+    def _release_connection(conn: IrradiatedConnection) -> None:
+        """Commit the transaction of a request and give back its connection."""
+        conn.commit()
+        conn.close()
+
     def get_locale(self, request: werkzeug.wrappers.Request) -> str:
         """
         Extract a locale from the request headers (cookie and/or
@@ -104,9 +104,7 @@ class AssemblyBallotMixin(AssemblyBaseFrontend):
 
         votes = {}
         if self.assemblyproxy.does_attend(rs, assembly_id=assembly_id):
-            for ballot_id in ballots:
-                votes[ballot_id] = self.assemblyproxy.get_vote(
-                    rs, ballot_id, secret=None)
+            votes = self.assemblyproxy.get_votes(rs, ballots, secret=None)
 
         return self.render(rs, "ballot/list_ballots", {
             'ballots': ballots, 'grouped_ballots': grouped, 'votes': votes,
@@ -486,10 +484,15 @@ class AssemblyBallotMixin(AssemblyBaseFrontend):
             in order extended, tallied, unchanged
         """
         ballot_ids = self.assemblyproxy.list_ballots(rs, assembly_id)
-        ballots = self.assemblyproxy.get_ballots(rs, ballot_ids)
-        extended = tallied = unchanged = 0
+        due_ids = self.assemblyproxy.list_due_ballots(rs, assembly_id)
+        if not due_ids:
+            return 0, 0, len(ballot_ids)
+        ballots = self.assemblyproxy.get_ballots(rs, due_ids)
+        extended = tallied = 0
+        unchanged = len(ballot_ids) - len(ballots)
 
         timestamp = now()
+        finished_ballots = []
         # sort ballots, so especially tallying is done in a meaningful order
         for ballot in xsorted(ballots.values(), key=EntitySorter.ballot):
             # check for extension
@@ -505,10 +508,16 @@ class AssemblyBallotMixin(AssemblyBaseFrontend):
             finished = (timestamp > ballot['vote_end']
                         and (not ballot['extended']
                              or timestamp > ballot['vote_extension_end']))
-            # check whether we need to initiate tallying
-            # tally_ballot returns None if ballot was already tallied
-            ballot_id = ballot['id']
-            if finished and (result := self.assemblyproxy.tally_ballot(rs, ballot_id)):
+            if finished:
+                finished_ballots.append(ballot)
+            else:
+                unchanged += 1
+
+        # tally_ballots omits ballots which were already tallied
+        results = self.assemblyproxy.tally_ballots(
+            rs, [ballot['id'] for ballot in finished_ballots])
+        for ballot in finished_ballots:
+            if result := results.get(ballot['id']):
                 afile = io.BytesIO(result)
                 my_hash = get_hash(result)
                 attachment_result: Attachment = {
@@ -530,11 +539,11 @@ class AssemblyBallotMixin(AssemblyBaseFrontend):
                     attachments=(attachment_result,),
                     params={'sha': my_hash, 'title': ballot['title']})
                 tallied += 1
-                continue
-            unchanged += 1
+            else:
+                unchanged += 1
 
         ret = (extended, tallied, unchanged)
-        if sum(ret) != len(ballots):
+        if sum(ret) != len(ballot_ids):
             raise RuntimeError(n_("Impossible."))
         return ret
 
@@ -607,7 +616,9 @@ class AssemblyBallotMixin(AssemblyBaseFrontend):
         """Check whether any ballots need to be tallied or extended."""
         tally_count = 0
         extension_count = 0
-        assembly_ids = self.assemblyproxy.list_assemblies(rs, is_active=True)
+        # Only assemblies with ballots past their deadline need an update.
+        assembly_ids = set(
+            self.assemblyproxy.list_due_ballots(rs, is_active=True).values())
         assemblies = self.assemblyproxy.get_assemblies(rs, assembly_ids)
         for assembly_id, assembly in assemblies.items():
             rs.ambience['assembly'] = assembly
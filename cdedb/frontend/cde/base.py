@@ -220,6 +220,7 @@ class CdEBaseFrontend(AbstractUserFrontend):
 
         result: Optional[Sequence[CdEDBObject]] = None
         count = 0
+        nearby: dict[str, Any] = {}
 
         if not is_search:
             query = None
@@ -268,18 +269,13 @@ class CdEBaseFrontend(AbstractUserFrontend):
                     rs.append_validation_error(
                         ('near_radius', ValueError(n_("Must not be empty."))),
                     )
+                elif not self.cdeproxy.is_known_postal_code(rs, near_pc):
+                    rs.append_validation_error(
+                        ('near_pc', ValueError(n_("Unknown postal code."))),
+                    )
                 else:
-                    defaults['qop_postal_code,postal_code2'] = QueryOperators.oneof
-                    nearby_postal_codes = self.cdeproxy.get_nearby_postal_codes(
-                        rs, near_pc, near_radius)
-                    if not nearby_postal_codes:
-                        # Whenever near_pc is known, near_pc will be contained in
-                        # nearby_postal_codes.
-                        rs.append_validation_error(
-                            ('near_pc', ValueError(n_("Unknown postal code."))),
-                        )
-                    defaults['qval_postal_code,postal_code2'] = " ".join(
-                        nearby_postal_codes)
+                    # The backend filters by distance itself.
+                    nearby = {'near_postal_code': near_pc, 'near_radius': near_radius}
                     defaults['qval_country,country2'] = self.conf["DEFAULT_COUNTRY"]
             query = check(rs, vtypes.QueryInput,
                           scope.mangle_query_input(rs, defaults), "query", spec=spec,
@@ -315,7 +311,7 @@ class CdEBaseFrontend(AbstractUserFrontend):
 
             query.constraints = [restrict(constrain)
                                  for constrain in query.constraints]
-            result = self.cdeproxy.submit_general_query(rs, query)
+            result = self.cdeproxy.submit_general_query(rs, query, **nearby)
             count = len(result)
             if count == 1:
                 return self.redirect_show_user(
@@ -432,8 +428,9 @@ class CdEBaseFrontend(AbstractUserFrontend):
                               ) -> CdEDBObject:
         """Check one line of batch admission.
 
-        We test for fitness of the data itself, as well as possible
-        existing duplicate accounts.
+        We test for fitness of the data itself. Possible existing duplicate
+        accounts are checked by :py:meth:`examine_doppelgangers_for_admission`
+        afterwards.
 
         :returns: The processed input datum.
         """
@@ -527,16 +524,36 @@ class CdEBaseFrontend(AbstractUserFrontend):
         else:
             warnings.append(("course", ValueError(n_("No course available."))))
 
-        doppelgangers: CdEDBObjectMap = {}
+        datum.update({
+            'persona': persona,
+            'pevent_id': pevent_id,
+            'pcourse_id': pcourse_id,
+            'warnings': warnings,
+            'problems': problems,
+        })
+        return datum
+
+    def examine_doppelgangers_for_admission(
+            self, rs: RequestState, datum: CdEDBObject, doppelgangers: CdEDBObjectMap,
+    ) -> CdEDBObject:
+        """Finish checking one line of batch admission.
+
+        This takes the existing accounts similar to the line, which are searched
+        for all lines at once after :py:meth:`examine_for_admission`.
+
+        :returns: The processed input datum.
+        """
+        persona = datum['persona']
+        pevent_id = datum['pevent_id']
+        pcourse_id = datum['pcourse_id']
+        warnings: list[Error] = datum['warnings']
+        problems: list[Error] = datum['problems']
         if persona:
             if (datum['resolution'] == LineResolutions.create
                     and self.coreproxy.verify_existence(rs, persona['username'])
                     and not bool(datum['doppelganger_id'])):
                 problems.append(
                     ("persona", ValueError(n_("Email address already taken."))))
-            temp = copy.deepcopy(persona)
-            temp['id'] = 1
-            doppelgangers = self.coreproxy.find_doppelgangers(rs, temp)
         if doppelgangers:
             warnings.append(("persona", ValueError(n_("Doppelgangers found."))))
         if bool(datum['doppelganger_id']) != datum['resolution'].is_modification():
@@ -586,9 +603,6 @@ class CdEBaseFrontend(AbstractUserFrontend):
         problems = get_errors(problems)
 
         datum.update({
-            'persona': persona,
-            'pevent_id': pevent_id,
-            'pcourse_id': pcourse_id,
             'doppelgangers': doppelgangers,
             'warnings': warnings,
             'problems': problems,
@@ -725,6 +739,19 @@ class CdEBaseFrontend(AbstractUserFrontend):
             dataset['lineno'] = lineno
             data.append(self.examine_for_admission(rs, dataset))
 
+        # Lines which could not be examined at all have no persona key.
+        examined = [dataset for dataset in data if 'persona' in dataset]
+        candidates = {}
+        for dataset in examined:
+            if dataset['persona']:
+                temp = copy.deepcopy(dataset['persona'])
+                temp['id'] = 1
+                candidates[dataset['lineno']] = temp
+        doppelgangers = self.coreproxy.find_doppelgangers_batch(rs, candidates)
+        for dataset in examined:
+            self.examine_doppelgangers_for_admission(
+                rs, dataset, doppelgangers.get(dataset['lineno'], {}))
+
         if rs.has_validation_errors():
             return self.batch_admission_form(rs, data=data, csvfields=fields)
 
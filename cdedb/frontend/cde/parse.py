@@ -179,14 +179,16 @@ class CdEParseMixin(CdEBaseFrontend):
                 rs.append_validation_error(p)
                 continue
             line["id"] = i
-            t = parse.Transaction.from_csv(line)
-            t.parse(rs, self.coreproxy, self.eventproxy)
-            t.validate(rs, self.coreproxy, self.eventproxy)
-
-            transactions.append(t)
+            transactions.append(parse.Transaction.from_csv(line))
         if rs.has_validation_errors():
             return self.parse_statement_form(rs)
 
+        context = parse.StatementContext.retrieve(
+            rs, self.coreproxy, self.eventproxy, transactions)
+        for t in transactions:
+            t.parse(context)
+            t.validate(context)
+
         data, params = self.organize_transaction_data(rs, transactions, date)
 
         return self.parse_statement_form(rs, data, params)
@@ -210,9 +212,11 @@ class CdEParseMixin(CdEBaseFrontend):
         transactions = []
         for i in range(1, count + 1):
             t_data = request_extractor(rs, parse.Transaction.get_request_params(i))
-            t = parse.Transaction(t_data, index=i)
-            t.validate(rs, self.coreproxy, self.eventproxy)
-            transactions.append(t)
+            transactions.append(parse.Transaction(t_data, index=i))
+        context = parse.StatementContext.retrieve(
+            rs, self.coreproxy, self.eventproxy, transactions)
+        for t in transactions:
+            t.validate(context)
 
         data, params = self.organize_transaction_data(rs, transactions, date)
 
@@ -3,8 +3,10 @@
 import dataclasses
 import datetime
 import decimal
+import functools
 import json
 import re
+from collections.abc import Collection
 from typing import TYPE_CHECKING, Callable, Optional, Union
 
 import cdedb.common.validation.types as vtypes
@@ -64,6 +66,35 @@ class EventMatch:
         return self.confidence < other.confidence
 
 
+@dataclasses.dataclass
+class StatementContext:
+    """Data needed to match the transactions of one statement.
+
+    This is retrieved once for all transactions, so that matching them does not
+    need to query the database again for every transaction.
+    """
+    events: CdEDataclassMap[models_event.Event]
+    personas: CdEDBObjectMap
+    # Maps persona ids to event ids to the remaining amount owed.
+    amounts_owed: dict[int, dict[int, decimal.Decimal]]
+
+    @classmethod
+    def retrieve(cls, rs: RequestState, core: "CoreBackend", event: "EventBackend",
+                 transactions: Collection["Transaction"]) -> "StatementContext":
+        """Retrieve everything the given transactions might reference."""
+        persona_ids: set[int] = set()
+        for t in transactions:
+            if t.persona_id:
+                persona_ids.add(t.persona_id)
+            persona_ids.update(t.scan_cdedbids(t.reference))
+        personas = core.get_personas(rs, persona_ids)
+        return cls(
+            events=event.get_events(rs, event.list_events(rs)),
+            personas=personas,
+            amounts_owed=event.list_many_amounts_owed(rs, personas),
+        )
+
+
 class StatementCSVKeys:
     """CSV keys present in the export from BFS.
 
@@ -212,6 +243,13 @@ class ParseAmountError(Exception):
     """Thrown if the amount string for a transaction could not be parsed."""
 
 
+@functools.lru_cache(maxsize=4096)
+def name_pattern(name: str) -> re.Pattern[str]:
+    """Compile the pattern to search a reference for a part of a name."""
+    return re.compile(
+        diacritic_patterns(re.escape(name), two_way_replace=True), flags=re.I)
+
+
 def parse_amount(amount: str) -> decimal.Decimal:
     """Safely determine how to interpret a string as Decimal."""
     if not amount:
@@ -406,17 +444,21 @@ class Transaction:
             })
         return ret
 
-    def _find_cdedbids(self, confidence: ConfidenceLevel = ConfidenceLevel.Full,
-                       ) -> dict[int, ConfidenceLevel]:
-        """Find db_ids in a reference.
+    @property
+    def persona_id(self) -> Optional[int]:
+        """The id of the persona explicitly given for this transaction, if any."""
+        return self._persona_id
 
-        Check the reference parts in order of relevancy.
-        """
+    @staticmethod
+    def scan_cdedbids(reference: str,
+                      confidence: ConfidenceLevel = ConfidenceLevel.Full,
+                      ) -> dict[int, ConfidenceLevel]:
+        """Find valid db_ids in a reference, without judging the result."""
         ret: dict[int, ConfidenceLevel] = {}
         patterns = (IDPatterns.persona, IDPatterns.persona_close)
         orig_confidence = confidence
         for pattern in patterns:
-            if result := re.findall(pattern, self.reference):
+            if result := re.findall(pattern, reference):
                 for persona_id_str, checkdigit in result:
                     persona_id, problems = inspect(
                         vtypes.CdedbID, f"DB-{persona_id_str}-{checkdigit}")
@@ -424,6 +466,15 @@ class Transaction:
                         ret[persona_id] = confidence
 
             confidence = orig_confidence.decrease(1)
+        return ret
+
+    def _find_cdedbids(self, confidence: ConfidenceLevel = ConfidenceLevel.Full,
+                       ) -> dict[int, ConfidenceLevel]:
+        """Find db_ids in a reference.
+
+        Check the reference parts in order of relevancy.
+        """
+        ret = self.scan_cdedbids(self.reference, confidence)
 
         if len(ret) > 1:
             ids = []
@@ -439,31 +490,25 @@ class Transaction:
 
         return ret
 
-    def parse(self, rs: RequestState, core: "CoreBackend", event: "EventBackend",
-              ) -> None:
+    def parse(self, context: StatementContext) -> None:
         """Try to determine the type of the transaction and referenced entities."""
-        self._get_entities(rs, core, event)
-        self._match_persona(rs, core)
-        self._match_event(rs, event)
+        self._get_entities(context)
+        self._match_persona(context)
+        self._match_event(context)
         self._determine_type()
 
-    def _get_entities(self, rs: RequestState, core: "CoreBackend",
-                      event: "EventBackend") -> None:
+    def _get_entities(self, context: StatementContext) -> None:
         """Try retrieving the persona and event belonging to this transaction."""
         if self._persona_id:
-            try:
-                self.persona = core.get_persona(rs, self._persona_id)
-            except KeyError:
+            self.persona = context.personas.get(self._persona_id)
+            if self.persona is None:
                 self._persona_id = None
-                self.persona = None
         if self._event_id:
-            try:
-                self.event = event.get_event(rs, self._event_id)
-            except KeyError:
+            self.event = context.events.get(self._event_id)
+            if self.event is None:
                 self._event_id = None
-                self.event = None
 
-    def _match_persona(self, rs: RequestState, core: "CoreBackend") -> None:
+    def _match_persona(self, context: StatementContext) -> None:
         """Try to match a persona to this transaction."""
         if self.persona:
             persona_matches = {
@@ -472,7 +517,7 @@ class Transaction:
         else:
             persona_matches = self._find_cdedbids()
 
-        personas = core.get_personas(rs, persona_matches)
+        personas = context.personas
 
         for persona_id, confidence in persona_matches.items():
             # Check that the persona exists.
@@ -490,11 +535,7 @@ class Transaction:
             # Search reference for given_names.
             try:
                 if not any(
-                    re.search(
-                        d_p(re.escape(gn), two_way_replace=True),
-                        self.reference,
-                        flags=re.I,
-                    )
+                    name_pattern(gn).search(self.reference)
                     for gn in persona['given_names'].split()
                 ):
                     self.warnings.append((
@@ -516,11 +557,7 @@ class Transaction:
             # Search reference for family_name.
             try:
                 if not any(
-                        re.search(
-                            d_p(re.escape(fn), two_way_replace=True),
-                            self.reference,
-                            flags=re.I,
-                        )
+                        name_pattern(fn).search(self.reference)
                         for fn in persona['family_name'].split()
                 ):
                     self.warnings.append((
@@ -547,19 +584,18 @@ class Transaction:
             self.persona = personas[best_persona_id]
             self.persona_confidence = persona_matches[best_persona_id]
 
-    def _match_event(self, rs: RequestState, event_backend: "EventBackend") -> None:
+    def _match_event(self, context: StatementContext) -> None:
         """Try to match an event to this transaction."""
         if self.event:
             return
 
-        events = event_backend.get_events(rs, event_backend.list_events(rs))
         if not self.persona:
             amounts_owed = {}
         else:
-            amounts_owed = event_backend.list_amounts_owed(rs, self.persona['id'])
+            amounts_owed = context.amounts_owed.get(self.persona['id'], {})
 
         event_matches = [
-            match for event in events.values()
+            match for event in context.events.values()
             if (match := self._match_one_event(event, amounts_owed.get(event.id)))
         ]
 
@@ -576,6 +612,7 @@ class Transaction:
             self.warnings.extend(best_match.warnings)
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def compile_pattern(s: str, strict: bool) -> re.Pattern[str]:
         s = "|".join(map(
             re.escape,
@@ -739,10 +776,9 @@ class Transaction:
         else:
             raise RuntimeError(n_("Impossible."))
 
-    def validate(self, rs: RequestState, core: "CoreBackend", event: "EventBackend",
-                 ) -> None:
+    def validate(self, context: StatementContext) -> None:
         """Inspect transaction for problems."""
-        self._get_entities(rs, core, event)
+        self._get_entities(context)
 
         cutoff = ConfidenceLevel.High
         if not self.type:
@@ -777,8 +813,8 @@ class Transaction:
 
             if self.type == TransactionType.EventFee:
                 if self.event and self.persona:
-                    amount_owed = event.get_amount_owed(
-                        rs, self.persona['id'], self.event.id)
+                    amount_owed = context.amounts_owed.get(
+                        self.persona['id'], {}).get(self.event.id)
                     if amount_owed is None:
                         self.warnings.append((
                             'event',
@@ -6,6 +6,7 @@ overall topic.
 
 import abc
 import cgitb
+import codecs
 import collections
 import collections.abc
 import copy
@@ -28,6 +29,7 @@ import gettext
 import io
 import json
 import logging
+import os
 import pathlib
 import re
 import shutil
@@ -36,11 +38,19 @@ import subprocess
 import sys
 import tempfile
 import threading
+import time
 import typing
 import urllib.error
 import urllib.parse
 import weakref
-from collections.abc import Collection, Iterable, Mapping, Sequence, Set as AbstractSet
+from collections.abc import (
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    Set as AbstractSet,
+)
 from email.mime.nonmultipart import MIMENonMultipart
 from secrets import token_hex
 from types import TracebackType
@@ -118,6 +128,7 @@ from cdedb.common.attachment import AttachmentStore
 from cdedb.common.exceptions import PrivilegeError, ValidationWarning
 from cdedb.common.fields import REALM_SPECIFIC_GENESIS_FIELDS
 from cdedb.common.i18n import format_country_code, get_localized_country_codes
+from cdedb.common.instrumentation import current_request
 from cdedb.common.n_ import n_
 from cdedb.common.query import Query
 from cdedb.common.query.defaults import DEFAULT_QUERIES
@@ -312,6 +323,17 @@ def raise_jinja(val: str) -> None:
 PeriodicMethod = Callable[[Any, RequestState, CdEDBObject], CdEDBObject]
 
 
+class GeneralQuerySubmitter(Protocol):
+    """The realm specific `submit_general_query` used by `generic_user_search`."""
+    @overload
+    def __call__(self, rs: RequestState, query: Query, *, aggregate: bool = False,
+                 stream: Literal[False] = False) -> tuple[CdEDBObject, ...]: ...
+
+    @overload
+    def __call__(self, rs: RequestState, query: Query, *, aggregate: bool = False,
+                 stream: Literal[True]) -> Iterator[CdEDBObject]: ...
+
+
 class PeriodicJob(Protocol):
     cron: CdEDBObject
 
@@ -357,6 +379,155 @@ class CdEDBUndefined(jinja2.StrictUndefined):
     __bool__ = jinja2.Undefined.__bool__  # type: ignore[assignment]
 
 
+class JinjaEnvironments(NamedTuple):
+    """The Jinja environments for the different kinds of templates."""
+    web: jinja2.Environment
+    mail: jinja2.Environment
+    tex: jinja2.Environment
+
+    def for_template(self, name: str) -> jinja2.Environment:
+        """Select the environment by the top level directory of the template."""
+        if name.startswith("mail/"):
+            return self.mail
+        elif name.startswith("tex/"):
+            return self.tex
+        return self.web
+
+
+# The Jinja environments shared by all frontends of a process, per config file.
+_JINJA_ENVIRONMENTS: dict[pathlib.Path, JinjaEnvironments] = {}
+_JINJA_ENVIRONMENTS_LOCK = threading.Lock()
+
+
+def make_template_cache(conf: Config, name: str) -> Optional[jinja2.BytecodeCache]:
+    """Create the on-disk cache for the compiled templates of an environment.
+
+    Jinja stores the checksum of the template source and the Python version with
+    each entry, so outdated entries are recompiled and overwritten automatically.
+    """
+    directory = pathlib.Path(conf["TEMPLATE_CACHE_DIR"])
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    if not os.access(directory, os.R_OK | os.W_OK | os.X_OK):
+        return None
+    return jinja2.FileSystemBytecodeCache(str(directory), f"__jinja2_{name}_%s.cache")
+
+
+def make_jinja_environments(conf: Config,
+                            logger: Optional[logging.Logger] = None,
+                            ) -> JinjaEnvironments:
+    """Construct the Jinja environments for all frontends.
+
+    This does not provide the globals which need the secrets, see
+    :py:func:`get_jinja_environments`.
+    """
+    template_dir = pathlib.Path(conf["REPOSITORY_PATH"], "cdedb", "frontend",
+                                "templates")
+    undefined: type[jinja2.Undefined]
+    if conf['CDEDB_DEV'] or conf['CDEDB_TEST']:
+        undefined = CdEDBUndefined
+    else:
+        undefined = jinja2.make_logging_undefined(
+            logger or logging.getLogger("cdedb.frontend"), jinja2.Undefined)
+        undefined.__bool__ = jinja2.Undefined.__bool__  # type: ignore[method-assign]
+    jinja_env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(template_dir)),
+        extensions=['jinja2.ext.i18n', 'jinja2.ext.do', 'jinja2.ext.loopcontrols'],
+        finalize=sanitize_None, autoescape=True, auto_reload=conf["CDEDB_DEV"],
+        undefined=undefined, bytecode_cache=make_template_cache(conf, "web"))
+    jinja_env.policies['ext.i18n.trimmed'] = True
+    jinja_env.policies['json.dumps_kwargs']['cls'] = CustomJSONEncoder
+    jinja_env.filters.update(JINJA_FILTERS)
+    jinja_env.globals.update({
+        'now': now,
+        'nbsp': "\u00A0",
+        'query_mod': query_mod,
+        'get_hash': get_hash,
+        'glue': glue,
+        'enums': ENUMS_DICT,
+        'raise': raise_jinja,
+        'staticurl': functools.partial(staticurl, version=conf["GIT_COMMIT"][:8]),
+        'docurl': docurl,
+        "drow_name": drow_name,
+        "drow_create": drow_create,
+        "drow_delete": drow_delete,
+        "drow_last_index": drow_last_index,
+        'CDEDB_OFFLINE_DEPLOYMENT': conf["CDEDB_OFFLINE_DEPLOYMENT"],
+        'CDEDB_DEV': conf["CDEDB_DEV"],
+        'UNCRITICAL_PARAMETER_TIMEOUT': conf["UNCRITICAL_PARAMETER_TIMEOUT"],
+        'ANTI_CSRF_TOKEN_NAME': ANTI_CSRF_TOKEN_NAME,
+        'ANTI_CSRF_TOKEN_PAYLOAD': ANTI_CSRF_TOKEN_PAYLOAD,
+        'IGNORE_WARNINGS_NAME': IGNORE_WARNINGS_NAME,
+        'GIT_COMMIT': conf["GIT_COMMIT"],
+        'I18N_LANGUAGES': conf["I18N_LANGUAGES"],
+        'I18N_ADVERTISED_LANGUAGES': conf["I18N_ADVERTISED_LANGUAGES"],
+        'DEFAULT_COUNTRY': conf["DEFAULT_COUNTRY"],
+        'ALL_MOD_ADMIN_VIEWS': ALL_MOD_ADMIN_VIEWS,
+        'ALL_MGMT_ADMIN_VIEWS': ALL_MGMT_ADMIN_VIEWS,
+        'EntitySorter': EntitySorter,
+        'roles_allow_genesis_management':
+            lambda roles: roles & ({'core_admin'} | set(
+                f"{realm}_admin"
+                for realm in REALM_SPECIFIC_GENESIS_FIELDS)),
+        'unwrap': unwrap,
+        'MANAGEMENT_ADDRESS': conf['MANAGEMENT_ADDRESS'],
+        'MAX_QUERY_ORDERS': query_mod.MAX_QUERY_ORDERS,
+    })
+    # The overlays need their own caches, since they compile differently.
+    jinja_env_tex = jinja_env.overlay(
+        autoescape=False,
+        block_start_string="<<%",
+        block_end_string="%>>",
+        variable_start_string="<<<",
+        variable_end_string=">>>",
+        comment_start_string="<<#",
+        comment_end_string="#>>",
+        bytecode_cache=make_template_cache(conf, "tex"),
+    )
+    jinja_env_tex.filters.update({'persona_name': make_persona_name})
+    jinja_env_mail = jinja_env.overlay(
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=make_template_cache(conf, "mail"),
+    )
+    return JinjaEnvironments(web=jinja_env, mail=jinja_env_mail, tex=jinja_env_tex)
+
+
+def get_jinja_environments(app: "BaseApp") -> JinjaEnvironments:
+    """Get the Jinja environments shared by all frontends of this process.
+
+    Thus every template is compiled only once per process, instead of once per
+    frontend.
+    """
+    configpath = app.conf._configpath  # pylint: disable=protected-access
+    with _JINJA_ENVIRONMENTS_LOCK:
+        if configpath not in _JINJA_ENVIRONMENTS:
+            envs = make_jinja_environments(app.conf, app.logger)
+            # The overlays share the globals with their parent environment.
+            envs.web.globals.update({
+                'encode_parameter': app.encode_parameter,
+                'encode_anti_csrf': app.encode_anti_csrf_token,
+            })
+            _JINJA_ENVIRONMENTS[configpath] = envs
+        return _JINJA_ENVIRONMENTS[configpath]
+
+
+def compile_templates(envs: JinjaEnvironments) -> int:
+    """Load all templates, compiling them if not already present in the cache.
+
+    :returns: The number of templates.
+    """
+    loader = envs.web.loader
+    assert loader is not None
+    names = loader.list_templates()
+    for name in names:
+        envs.for_template(name).get_template(name)
+    return len(names)
+
+
 class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
     """Common base class for all frontends."""
     #: to be overridden by children
@@ -365,74 +536,8 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
         super().__init__(*args, **kwargs)
         self.template_dir = pathlib.Path(self.conf["REPOSITORY_PATH"], "cdedb",
                                          "frontend", "templates")
-        undefined: type[jinja2.Undefined]
-        if self.conf['CDEDB_DEV'] or self.conf['CDEDB_TEST']:
-            undefined = CdEDBUndefined
-        else:
-            undefined = jinja2.make_logging_undefined(self.logger, jinja2.Undefined)
-            undefined.__bool__ = jinja2.Undefined.__bool__  # type: ignore[method-assign]
-        self.jinja_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(str(self.template_dir)),
-            extensions=['jinja2.ext.i18n', 'jinja2.ext.do', 'jinja2.ext.loopcontrols'],
-            finalize=sanitize_None, autoescape=True, auto_reload=self.conf["CDEDB_DEV"],
-            undefined=undefined)
-        self.jinja_env.policies['ext.i18n.trimmed'] = True
-        self.jinja_env.policies['json.dumps_kwargs']['cls'] = CustomJSONEncoder
-        self.jinja_env.filters.update(JINJA_FILTERS)
-        self.jinja_env.globals.update({
-            'now': now,
-            'nbsp': "\u00A0",
-            'query_mod': query_mod,
-            'get_hash': get_hash,
-            'glue': glue,
-            'enums': ENUMS_DICT,
-            'raise': raise_jinja,
-            'encode_parameter': self.encode_parameter,
-            'encode_anti_csrf': self.encode_anti_csrf_token,
-            'staticurl': functools.partial(staticurl,
-                                           version=self.conf["GIT_COMMIT"][:8]),
-            'docurl': docurl,
-            "drow_name": drow_name,
-            "drow_create": drow_create,
-            "drow_delete": drow_delete,
-            "drow_last_index": drow_last_index,
-            'CDEDB_OFFLINE_DEPLOYMENT': self.conf["CDEDB_OFFLINE_DEPLOYMENT"],
-            'CDEDB_DEV': self.conf["CDEDB_DEV"],
-            'UNCRITICAL_PARAMETER_TIMEOUT': self.conf[
-                "UNCRITICAL_PARAMETER_TIMEOUT"],
-            'ANTI_CSRF_TOKEN_NAME': ANTI_CSRF_TOKEN_NAME,
-            'ANTI_CSRF_TOKEN_PAYLOAD': ANTI_CSRF_TOKEN_PAYLOAD,
-            'IGNORE_WARNINGS_NAME': IGNORE_WARNINGS_NAME,
-            'GIT_COMMIT': self.conf["GIT_COMMIT"],
-            'I18N_LANGUAGES': self.conf["I18N_LANGUAGES"],
-            'I18N_ADVERTISED_LANGUAGES': self.conf["I18N_ADVERTISED_LANGUAGES"],
-            'DEFAULT_COUNTRY': self.conf["DEFAULT_COUNTRY"],
-            'ALL_MOD_ADMIN_VIEWS': ALL_MOD_ADMIN_VIEWS,
-            'ALL_MGMT_ADMIN_VIEWS': ALL_MGMT_ADMIN_VIEWS,
-            'EntitySorter': EntitySorter,
-            'roles_allow_genesis_management':
-                lambda roles: roles & ({'core_admin'} | set(
-                    f"{realm}_admin"
-                    for realm in REALM_SPECIFIC_GENESIS_FIELDS)),
-            'unwrap': unwrap,
-            'MANAGEMENT_ADDRESS': self.conf['MANAGEMENT_ADDRESS'],
-            'MAX_QUERY_ORDERS': query_mod.MAX_QUERY_ORDERS,
-        })
-        self.jinja_env_tex = self.jinja_env.overlay(
-            autoescape=False,
-            block_start_string="<<%",
-            block_end_string="%>>",
-            variable_start_string="<<<",
-            variable_end_string=">>>",
-            comment_start_string="<<#",
-            comment_end_string="#>>",
-        )
-        self.jinja_env_tex.filters.update({'persona_name': make_persona_name})
-        self.jinja_env_mail = self.jinja_env.overlay(
-            autoescape=False,
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.jinja_env, self.jinja_env_mail, self.jinja_env_tex = (
+            get_jinja_environments(self))
         # Always provide all backends -- they are cheap
         self.assemblyproxy = make_proxy(AssemblyBackend())
         self.cdeproxy = make_proxy(CdEBackend())
@@ -603,7 +708,13 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
         if not (self.template_dir / tmpl).is_file():
             raise ValueError(n_("Template not found: %(file)s"), {'file': tmpl})
         t = jinja_env.get_template(str(tmpl))
-        return t.render(**data)
+        timing = current_request()
+        if timing is None:
+            return t.render(**data)
+        begin = time.perf_counter()
+        ret = t.render(**data)
+        timing.record_render(time.perf_counter() - begin)
+        return ret
 
     def locate_or_store_attachment(
         self, rs: RequestState, store: AttachmentStore,
@@ -644,7 +755,8 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
                       filename: Optional[str] = None, inline: bool = True, *,
                       path: Optional[Union[str, pathlib.Path]] = None,
                       afile: Optional[IO[bytes]] = None,
-                      data: Optional[AnyStr] = None) -> Response:
+                      data: Optional[AnyStr] = None,
+                      chunks: Optional[Iterable[str]] = None) -> Response:
         """Wrapper around :py:meth:`send_file` for CSV files.
 
         This makes Excel happy by adding a BOM at the beginning of the
@@ -655,13 +767,14 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
             path = pathlib.Path(path)
         return AbstractFrontend.send_file(
             rs, mimetype=mimetype, filename=filename, inline=inline, path=path,
-            afile=afile, data=data, encoding='utf-8-sig')
+            afile=afile, data=data, chunks=chunks, encoding='utf-8-sig')
 
     @staticmethod
     def send_file(rs: RequestState, mimetype: Optional[str] = None,
                   filename: Optional[str] = None, inline: bool = True, *,
                   path: Optional[PathLike] = None, afile: Optional[IO[bytes]] = None,
-                  data: Optional[AnyStr] = None, encoding: str = 'utf-8') -> Response:
+                  data: Optional[AnyStr] = None, chunks: Optional[Iterable[str]] = None,
+                  encoding: str = 'utf-8') -> Response:
         """Wrapper around :py:meth:`werkzeug.wsgi.wrap_file` to offer a file for
         download.
 
@@ -673,12 +786,15 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
         :param inline: Set content disposition to force display in browser (if
           True) or to force a download box (if False).
         :param afile: Should be opened in binary mode. Will be reset to start of file.
+        :param chunks: The file contents as a stream of text, which is encoded and
+          sent while it is being generated.
         :param encoding: The character encoding to be uses, if `data` is given
-          as str
+          as str or `chunks` are given
         """
-        if not path and not afile and data is None:
+        if not path and not afile and data is None and chunks is None:
             raise ValueError(n_("No input specified."))
-        if (path and afile) or (path and data) or (afile and data):
+        if ((path and afile) or (path and data) or (afile and data)
+                or (chunks is not None and (path or afile or data))):
             raise ValueError(n_("Ambiguous input."))
 
         payload: Union[Iterable[bytes], bytes]
@@ -690,6 +806,8 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
             # case, but this is much more easily usable.
             afile.seek(0)
             payload = werkzeug.wsgi.wrap_file(rs.request.environ, afile)
+        elif chunks is not None:
+            payload = encode_chunks(chunks, encoding)
         elif data:
             if isinstance(data, str):
                 payload = data.encode(encoding)
@@ -719,10 +837,25 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
         response.headers.add('X-Generation-Time', str(now() - rs.begin))
         return response
 
-    def send_query_download(self, rs: RequestState, result: Collection[CdEDBObject],
+    @staticmethod
+    def check_download_kind(kind: str) -> None:
+        """Make sure `send_query_download` can produce a file of this kind.
+
+        Call this before retrieving a result lazily, so that no stream is left
+        open if the kind is unknown.
+        """
+        if kind not in {"csv", "json"}:
+            raise ValueError(
+                n_("Unknown download kind {kind}."), {"kind": kind})
+
+    def send_query_download(self, rs: RequestState, result: Iterable[CdEDBObject],
                             query: Query, kind: str, filename: str) -> Response:
         """Helper to send download of query result.
 
+        The file is generated while it is being sent, so the result may be
+        retrieved lazily, e.g. via the `stream` parameter of `submit_general_query`.
+        In that case, check the kind via `check_download_kind` beforehand.
+
         :param kind: Can be either `'csv'` or `'json'`.
         :param filename: The extension will be added automatically depending on
             the kind specified.
@@ -747,15 +880,16 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
         substitutions = {k: v.choices for k, v in query.spec.items() if v.choices}
 
         if kind == "csv":
-            csv_data = csv_output(result, fields, substitutions=substitutions,
-                                  tzinfo=self.conf['DEFAULT_TIMEZONE'])
+            csv_chunks = csv_output_chunks(
+                result, fields, substitutions=substitutions,
+                tzinfo=self.conf['DEFAULT_TIMEZONE'])
             return self.send_csv_file(
-                rs, data=csv_data, inline=False, filename=filename)
+                rs, chunks=csv_chunks, inline=False, filename=filename)
         elif kind == "json":
-            json_data = query_result_to_json(
+            json_chunks = query_result_to_json_chunks(
                 result, fields, substitutions=substitutions)
             return self.send_file(
-                rs, data=json_data, inline=False, filename=filename)
+                rs, chunks=json_chunks, inline=False, filename=filename)
         else:
             raise ValueError(
                 n_("Unknown download kind {kind}."), {"kind": kind})
@@ -972,8 +1106,7 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
 
     def generic_user_search(self, rs: RequestState, download: Optional[str],
                             is_search: bool, scope: query_mod.QueryScope,
-                            submit_general_query: Callable[[RequestState, Query],
-                                                           tuple[CdEDBObject, ...]], *,
+                            submit_general_query: GeneralQuerySubmitter, *,
                             choices: Optional[Mapping[str, Mapping[Any, str]]] = None,
                             query: Optional[Query] = None) -> werkzeug.Response:
         """Perform user search.
@@ -1017,14 +1150,15 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
         }
         # Tricky logic: In case of no validation errors we perform a query
         if not rs.has_validation_errors() and is_search and query:
-            result = submit_general_query(rs, query)
-            params['result'] = result
             if download:
+                self.check_download_kind(download)
+                result = submit_general_query(rs, query, stream=True)
                 return self.send_query_download(
                     rs, result, query, kind=download,
                     filename=scope.get_target() + "_result")
+            params['result'] = submit_general_query(rs, query)
             params["aggregates"] = unwrap(submit_general_query(
-                rs, query, aggregate=True))  # type: ignore[call-arg]
+                rs, query, aggregate=True))
         else:
             if not is_search and scope.includes_archived:
                 rs.values['qop_is_archived'] = query_mod.QueryOperators.equal.value
@@ -1364,8 +1498,10 @@ class AbstractFrontend(BaseApp, metaclass=abc.ABCMeta):
                 rs, "text/csv", f"{filter_class.log_table}.csv", data=csv_data)
         else:
             # Create pagination.
-            loglinks = calculate_loglinks(rs, total, log_filter._offset,  # pylint: disable=protected-access
-                                          log_filter._length)  # pylint: disable=protected-access
+            loglinks = calculate_loglinks(
+                rs, total, log_filter._offset, log_filter._length,  # pylint: disable=protected-access
+                first_id=log[0]['id'] if log else None,
+                last_id=log[-1]['id'] if log else None)
             return self.render(rs, template, {
                 'log': log, 'total': total, 'length': log_filter.length,
                 'personas': personas, 'loglinks': loglinks,
@@ -1545,7 +1681,8 @@ class Worker(threading.Thread):
         secrets = SecretsConfig()
         connpool = connection_pool_factory(
             conf["CDB_DATABASE_NAME"], DATABASE_ROLES, secrets,
-            conf["DB_HOST"], conf["DB_PORT"])
+            conf["DB_HOST"], conf["DB_PORT"], pool_size=conf["DB_POOL_SIZE"],
+            max_idle=conf["DB_POOL_MAX_IDLE"], timeout=conf["DB_POOL_TIMEOUT"])
         rrs._conn = connpool[roles_to_db_role(rs.user.roles)]
         logger = logging.getLogger("cdedb.frontend.worker")
 
@@ -1591,7 +1728,14 @@ class Worker(threading.Thread):
             if len(task_infos) > 1:
                 logger.debug(f"{len(task_infos)} tasks completed successfully.")
 
-        super().__init__(target=runner, daemon=False)
+        def closing_runner() -> None:
+            """Release the database connection once all tasks are done."""
+            try:
+                runner()
+            finally:
+                rrs._conn.close()
+
+        super().__init__(target=closing_runner, daemon=False)
 
     @classmethod
     def create(cls, rs: RequestState, name: str, tasks: "WorkerTasks",
@@ -2633,12 +2777,34 @@ def csv_output(data: Collection[CdEDBObject], fields: Sequence[str],
       name.
     :param tzinfo: If given convert all datetimes to this timezone.
     """
+    return "".join(csv_output_chunks(
+        data, fields, writeheader=writeheader, replace_newlines=replace_newlines,
+        substitutions=substitutions, tzinfo=tzinfo))
+
+
+def csv_output_chunks(data: Iterable[CdEDBObject], fields: Sequence[str],
+                      writeheader: bool = True, replace_newlines: bool = False,
+                      substitutions: Optional[Mapping[str, Mapping[Any, Any]]] = None,
+                      tzinfo: Optional[datetime.tzinfo] = None) -> Iterator[str]:
+    """Generate a csv representation of the passed data line by line.
+
+    This only consumes the data as far as needed, so it can be used to stream
+    large results. The parameters are as for :py:func:`csv_output`.
+    """
     substitutions = substitutions or {}
     outfile = io.StringIO()
     writer = csv.DictWriter(
         outfile, fields, dialect=CustomCSVDialect())
+
+    def flush() -> str:
+        ret = outfile.getvalue()
+        outfile.seek(0)
+        outfile.truncate()
+        return ret
+
     if writeheader:
         writer.writeheader()
+        yield flush()
     for original in data:
         row = {}
         for field in fields:
@@ -2651,7 +2817,7 @@ def csv_output(data: Collection[CdEDBObject], fields: Sequence[str],
                 value = value.astimezone(tzinfo)
             row[field] = value
         writer.writerow(row)
-    return outfile.getvalue()
+        yield flush()
 
 
 def query_result_to_json(data: Collection[CdEDBObject], fields: Iterable[str],
@@ -2663,8 +2829,22 @@ def query_result_to_json(data: Collection[CdEDBObject], fields: Iterable[str],
       representations for output. The key of the outer dict is the field
       name.
     """
+    return "".join(query_result_to_json_chunks(data, fields, substitutions))
+
+
+def query_result_to_json_chunks(data: Iterable[CdEDBObject], fields: Iterable[str],
+                                substitutions: Optional[Mapping[
+                                    str, Mapping[Any, Any]]] = None,
+                                ) -> Iterator[str]:
+    """Generate a json representation of the passed data row by row.
+
+    The result is the same as serializing the list of all rows at once, but the
+    data is only consumed as far as needed, so it can be used to stream large
+    results. The parameters are as for :py:func:`query_result_to_json`.
+    """
     substitutions = substitutions or {}
-    json_data = []
+    fields = tuple(fields)
+    separator = "[\n    "
     for original in data:
         row = {}
         for field in fields:
@@ -2672,18 +2852,51 @@ def query_result_to_json(data: Collection[CdEDBObject], fields: Iterable[str],
             if field in substitutions:
                 value = substitutions[field].get(value, value)
             row[field] = value
-        json_data.append(row)
-    return json_serialize(json_data)
+        # Line breaks only occur between tokens, so this indents the row.
+        yield separator + json_serialize(row).replace("\n", "\n    ")
+        separator = ",\n    "
+    yield "\n]" if separator.startswith(",") else "[]"
+
+
+def encode_chunks(chunks: Iterable[str], encoding: str = 'utf-8',
+                  block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encode a stream of text, collecting it into blocks of reasonable size.
+
+    The first block is passed on right away, so the download starts immediately.
+    Using an incremental encoder makes sure a byte order mark is only added once.
+    """
+    encoder = codecs.getincrementalencoder(encoding)()
+    block: list[bytes] = []
+    size = 0
+    first = True
+    for chunk in chunks:
+        encoded = encoder.encode(chunk)
+        block.append(encoded)
+        size += len(encoded)
+        if first or size >= block_size:
+            yield b"".join(block)
+            block = []
+            size = 0
+            first = False
+    block.append(encoder.encode("", final=True))
+    if rest := b"".join(block):
+        yield rest
 
 
 def calculate_loglinks(rs: RequestState, total: int,
                        offset: Optional[int], length: int,
+                       first_id: Optional[int] = None, last_id: Optional[int] = None,
                        ) -> dict[str, Union[CdEDBMultiDict, list[CdEDBMultiDict]]]:
     """Calculate the target parameters for the links in the log pagination bar.
 
+    The links to the previous and next page are relative to the shown entries,
+    if given, since this is much cheaper for large logs than an offset.
+
     :param total: The total count of log entries
     :param offset: The offset, preprocessed for negative offset values
     :param length: The requested length (not necessarily the shown length)
+    :param first_id: The id of the first shown log entry.
+    :param last_id: The id of the last shown log entry.
     """
     # The true offset does represent the acutal count of log entries before
     # the first shown entry. This is done magically, if no offset has been
@@ -2695,7 +2908,10 @@ def calculate_loglinks(rs: RequestState, total: int,
 
     # Create values sets for the necessary links.
     def new_md() -> CdEDBMultiDict:
-        return werkzeug.datastructures.MultiDict(rs.values)
+        ret = werkzeug.datastructures.MultiDict(rs.values)
+        ret.pop("before_id", None)
+        ret.pop("after_id", None)
+        return ret
     loglinks = {
         "first": new_md(),
         "previous": new_md(),
@@ -2712,9 +2928,13 @@ def calculate_loglinks(rs: RequestState, total: int,
     for x, _ in enumerate(pre):
         pre[x]["offset"] = trueoffset - (len(pre) - x) * length
     loglinks["previous"]["offset"] = trueoffset - length
+    if first_id is not None:
+        loglinks["previous"]["before_id"] = first_id
     for x, _ in enumerate(post):
         post[x]["offset"] = trueoffset + (x + 1) * length
     loglinks["next"]["offset"] = trueoffset + length
+    if last_id is not None:
+        loglinks["next"]["after_id"] = last_id
     loglinks["current"]["offset"] = trueoffset
 
     # piece everything together
@@ -18,6 +18,7 @@ import segno.helpers
 import werkzeug.exceptions
 from werkzeug import Response
 
+import cdedb.common.instrumentation as instrumentation
 import cdedb.common.validation.types as vtypes
 import cdedb.database.constants as const
 import cdedb.models.core as models
@@ -260,6 +261,14 @@ class CoreBaseFrontend(AbstractFrontend):
         rs.notify_return_code(code)
         return self.redirect(rs, "core/meta_info_form")
 
+    @access("core_admin")
+    def view_request_timings(self, rs: RequestState) -> Response:
+        """Show the request durations per endpoint of this process."""
+        return self.render(rs, "view_request_timings", {
+            'enabled': self.conf["INSTRUMENTATION"],
+            'timings': instrumentation.STATISTICS.summary(),
+        })
+
     @access("anonymous", modi={"POST"})
     @REQUESTdata("username", "password", "#wants")
     def login(self, rs: RequestState, username: vtypes.Email,
@@ -42,7 +42,9 @@ class CronFrontend(BaseApp):
         secrets = SecretsConfig()
         self.connpool = connection_pool_factory(
             self.conf["CDB_DATABASE_NAME"], DATABASE_ROLES,
-            secrets, self.conf["DB_HOST"], self.conf["DB_PORT"])
+            secrets, self.conf["DB_HOST"], self.conf["DB_PORT"],
+            pool_size=self.conf["DB_POOL_SIZE"], max_idle=self.conf["DB_POOL_MAX_IDLE"],
+            timeout=self.conf["DB_POOL_TIMEOUT"])
         self.translations = setup_translations(self.conf)
         if pathlib.Path("/PRODUCTIONVM").is_file():  # pragma: no cover
             # Sanity checks for the live instance
@@ -694,7 +694,9 @@ class EventBaseFrontend(AbstractUserFrontend):
         """Regularly backup any event that got changed.
 
         :param state: Keeps track of the event schema version to do an extra commit if
-            it is outdated.
+            it is outdated, and of the latest log entry of each event at the last
+            run. Events without new log entries are skipped without asking the
+            backend for a snapshot.
         """
         if not state:
             state = {
@@ -704,6 +706,8 @@ class EventBaseFrontend(AbstractUserFrontend):
         if "events" in state:
             del state["events"]
         event_ids = self.eventproxy.list_events(rs, archived=False)
+        # Retrieve these first, so that a change during the run is not missed.
+        watermarks = self.eventproxy.get_event_log_watermarks(rs, event_ids)
         if state.get("EVENT_SCHEMA_VERSION") != list(EVENT_SCHEMA_VERSION):
             self.logger.info("Event schema version changed, creating new commit for"
                              " every event.")
@@ -713,7 +717,16 @@ class EventBaseFrontend(AbstractUserFrontend):
             state['EVENT_SCHEMA_VERSION'] = EVENT_SCHEMA_VERSION
 
         commit_msg = "Regelmäßiger Snapshot"
+        old_watermarks = state.get('log_watermarks', {})
+        skipped = 0
         for event_id in event_ids:
-            self.eventproxy.event_keeper_commit(rs, event_id, commit_msg)
+            if old_watermarks.get(str(event_id)) == watermarks[event_id]:
+                skipped += 1
+                continue
+            self.eventproxy.event_keeper_commit(
+                rs, event_id, commit_msg, is_periodic=True)
+        self.logger.info(f"Skipped {skipped} of {len(event_ids)} unchanged events.")
+        state['log_watermarks'] = {
+            str(event_id): log_id for event_id, log_id in watermarks.items()}
 
         return state
@@ -440,10 +440,11 @@ class EventDownloadMixin(EventBaseFrontend):
 
         query = Query(QueryScope.event_course, spec,
                       fields_of_interest=spec.keys(), constraints=[], order=[])
-        result = self.eventproxy.submit_general_query(rs, query, event_id=event_id)
-        if not result:
+        if not course_ids:
             rs.notify("info", n_("Empty File."))
             return self.redirect(rs, "event/downloads")
+        result = self.eventproxy.submit_general_query(
+            rs, query, event_id=event_id, stream=True)
         return self.send_query_download(
             rs, result, query, "csv",
             filename=f"{rs.ambience['event'].shortname}_courses")
@@ -462,10 +463,11 @@ class EventDownloadMixin(EventBaseFrontend):
 
         query = Query(QueryScope.lodgement, spec,
                       fields_of_interest=spec.keys(), constraints=[], order=[])
-        result = self.eventproxy.submit_general_query(rs, query, event_id=event_id)
-        if not result:
+        if not lodgement_ids:
             rs.notify("info", n_("Empty File."))
             return self.redirect(rs, "event/downloads")
+        result = self.eventproxy.submit_general_query(
+            rs, query, event_id=event_id, stream=True)
         return self.send_query_download(
             rs, result, query, "csv",
             filename=f"{rs.ambience['event'].shortname}_lodgements")
@@ -488,10 +490,11 @@ class EventDownloadMixin(EventBaseFrontend):
 
         query = Query(QueryScope.registration, spec,
                       fields_of_interest=spec.keys(), constraints=[], order=[])
-        result = self.eventproxy.submit_general_query(rs, query, event_id=event_id)
-        if not result:
+        if not self.eventproxy.list_registrations(rs, event_id):
             rs.notify("info", n_("Empty File."))
             return self.redirect(rs, "event/downloads")
+        result = self.eventproxy.submit_general_query(
+            rs, query, event_id=event_id, stream=True)
         return self.send_query_download(
             rs, result, query, "csv",
             filename=f"{rs.ambience['event'].shortname}_registrations")
@@ -9,12 +9,13 @@ import re
 from collections.abc import Mapping
 from dataclasses import dataclass
 from re import Pattern
-from typing import Optional
+from typing import Any, Optional
 
 import graphviz
 
 import cdedb.models.event as models
 from cdedb.common import (
+    UMLAUT_MAP,
     CdEDBObject,
     CdEDBObjectMap,
     Notification,
@@ -22,6 +23,7 @@ from cdedb.common import (
     inverse_diacritic_patterns,
     make_persona_name,
 )
+from cdedb.common.cache import ExpiringCache
 from cdedb.common.n_ import n_
 from cdedb.common.sorting import xsorted
 from cdedb.database.constants import Genders, RegistrationPartStati
@@ -95,12 +97,6 @@ def detect_lodgement_wishes(registrations: CdEDBObjectMap,
     :return: The list of detected wish edges for the lodgement wishes graph and
         a list of localizable problem notification messages.
     """
-    # Create a list of regex patterns, referencing the other personas, to search
-    lookup_map: list[tuple[Pattern[str], int]] = [
-        (make_identifying_regex(personas[registration['persona_id']]),
-         registration_id)
-        for registration_id, registration in registrations.items()
-    ]
     if event.lodge_field:
         wish_field_name = event.lodge_field.field_name
     else:
@@ -117,20 +113,24 @@ def detect_lodgement_wishes(registrations: CdEDBObjectMap,
         else:
             return [], []
 
+    matcher = get_wish_matcher(event.id, registrations, personas)
+    order = {registration_id: i for i, registration_id in enumerate(registrations)}
+
     # For each registration, analyze wishes
     for registration_id, registration in registrations_to_check:
         # Skip registrations with emtpy wishes field
         if not registration['fields'].get(wish_field_name):
             continue
         match_positions: list[tuple[tuple[int, int], int]] = []
-        # Check each of the regex patterns against the wishes field
-        for pattern, other_registration_id in lookup_map:
+        wishes_raw = registration['fields'].get(wish_field_name, '')
+        # Check the regex patterns of all possibly referenced registrations
+        for other_registration_id in sorted(matcher.candidates(wishes_raw),
+                                            key=order.__getitem__):
             # Self-wishes are not allowed
             if other_registration_id == registration_id:
                 continue
 
-            wishes_raw = registration['fields'].get(wish_field_name, '')
-            match = pattern.search(wishes_raw)
+            match = matcher.patterns[other_registration_id].search(wishes_raw)
             if match:
                 other_registration = registrations[other_registration_id]
 
@@ -240,6 +240,88 @@ def make_identifying_regex(persona: CdEDBObject) -> Pattern[str]:
     return re.compile('|'.join(rf"\b{p.strip()}\b" for p in patterns), flags=re.I)
 
 
+FOLD_TRANSLATE_TABLE = str.maketrans(UMLAUT_MAP)
+
+
+def _words(s: str) -> frozenset[str]:
+    """Split a string into its words, folding case and diacritics.
+
+    Every match of an identifying regex consists of whole words, so the words of
+    the family name, the CdEDB-ID or the username of a persona are a subset of
+    the words of every text the regex of the persona matches.
+    """
+    return frozenset(re.findall(r"\w+", s.translate(FOLD_TRANSLATE_TABLE).lower()))
+
+
+class WishMatcher:
+    """Find the registrations referenced in rooming preferences texts.
+
+    This holds the identifying regex of every registration together with an index
+    from words to the registrations they may refer to. Thus a text is split into
+    words once and only the regexes of the registrations whose family name,
+    CdEDB-ID or username occurs in the text need to be evaluated, instead of the
+    regexes of all registrations.
+    """
+
+    def __init__(self, registrations: CdEDBObjectMap,
+                 personas: CdEDBObjectMap) -> None:
+        self.patterns: dict[int, Pattern[str]] = {}
+        self._index: dict[str, list[tuple[frozenset[str], int]]] = {}
+        self._unindexed: set[int] = set()
+        for registration_id, registration in registrations.items():
+            persona = personas[registration['persona_id']]
+            self.patterns[registration_id] = make_identifying_regex(persona)
+            keys = [persona['family_name'], cdedbid_filter(persona['id'])]
+            if persona['username']:
+                keys.append(persona['username'])
+            for words in map(_words, keys):
+                if not words:
+                    self._unindexed.add(registration_id)
+                    continue
+                # Index by the longest word, as it is likely the most distinctive.
+                key = max(words, key=len)
+                self._index.setdefault(key, []).append((words, registration_id))
+
+    def candidates(self, text: str) -> set[int]:
+        """Return the ids of all registrations the text may refer to.
+
+        This is a superset of the registrations whose regex matches the text.
+        """
+        words = _words(text)
+        ret = set(self._unindexed)
+        for word in words:
+            for required, registration_id in self._index.get(word, ()):
+                if required <= words:
+                    ret.add(registration_id)
+        return ret
+
+
+# The cache keys contain all data the matchers depend on, so entries never become
+# stale. The time to live (in seconds) only limits how long unused matchers are kept.
+_WISH_MATCHER_CACHE: ExpiringCache[
+    tuple[int, frozenset[tuple[Any, ...]]], WishMatcher] = ExpiringCache(max_size=16)
+WISH_MATCHER_CACHE_TTL = 24*60*60
+
+
+def get_wish_matcher(event_id: int, registrations: CdEDBObjectMap,
+                     personas: CdEDBObjectMap) -> WishMatcher:
+    """Retrieve the :class:`WishMatcher` for the registrations of an event.
+
+    The matchers are cached per event. The cache key contains the identifying
+    data of all registrations, so a matcher is rebuilt as soon as a registration
+    is added or removed or a relevant persona attribute changes.
+    """
+    fingerprint = frozenset(
+        (registration_id, *(personas[registration['persona_id']][key] for key in
+                            ('id', 'given_names', 'display_name', 'family_name',
+                             'username')))
+        for registration_id, registration in registrations.items()
+    )
+    return _WISH_MATCHER_CACHE.get(
+        (event_id, fingerprint), lambda: WishMatcher(registrations, personas),
+        WISH_MATCHER_CACHE_TTL)
+
+
 PRESENT_STATI = {status for status in RegistrationPartStati
                  if status.is_present()}
 ACTIVE_STATI = PRESENT_STATI | {RegistrationPartStati.waitlist}
@@ -51,6 +51,7 @@ from cdedb.frontend.common import (
 from cdedb.frontend.event.base import EventBaseFrontend
 from cdedb.frontend.event.query_stats import (
     EventCourseStatistic,
+    EventRegistrationColumns,
     EventRegistrationInXChoiceGrouper,
     EventRegistrationPartStatistic,
     EventRegistrationTrackStatistic,
@@ -83,15 +84,14 @@ class EventQueryMixin(EventBaseFrontend):
             for part_id, reg_part in reg['parts'].items():
                 reg_part['age_class'] = determine_age_class(
                     reg['birthday'], event_parts[part_id].part_begin)
+        columns = EventRegistrationColumns(rs.ambience['event'], registrations)
 
         per_part_statistics: dict[
             EventRegistrationPartStatistic, dict[str, dict[int, set[int]]]]
         per_part_statistics = collections.OrderedDict()
         for reg_stat in EventRegistrationPartStatistic:
             _parts: dict[int, set[int]] = {
-                part_id: set(
-                    reg['id'] for reg in registrations.values()
-                    if reg_stat.test(rs.ambience['event'], reg, part_id))
+                part_id: reg_stat.get_matching_ids(columns, part_id)
                 for part_id in event_parts
             }
             _part_groups: dict[int, set[int]] = {
@@ -137,9 +137,8 @@ class EventQueryMixin(EventBaseFrontend):
                 }
             for reg_track_stat in EventRegistrationTrackStatistic:
                 _tracks = {
-                    track_id: set(
-                        reg['id'] for reg in registrations.values()
-                        if reg_track_stat.test(rs.ambience['event'], reg, track_id))
+                    track_id: reg_track_stat.get_matching_ids(
+                        rs.ambience['event'], columns, track_id)
                     for track_id in tracks
                 }
                 _parts = {
@@ -213,10 +212,6 @@ class EventQueryMixin(EventBaseFrontend):
         # Tricky logic: In case of no validation errors we perform a query
         if not rs.has_validation_errors() and is_search and query:
             query.scope = scope
-            params['result'] = self.eventproxy.submit_general_query(
-                rs, query, event_id=event_id)
-            params["aggregates"] = unwrap(self.eventproxy.submit_general_query(
-                rs, query, event_id=event_id, aggregate=True))
             return self._send_query_result(
                 rs, download, "registration_result", scope, query, params)
         else:
@@ -480,10 +475,6 @@ class EventQueryMixin(EventBaseFrontend):
 
         if not rs.has_validation_errors() and is_search and query:
             query.scope = scope
-            params['result'] = self.eventproxy.submit_general_query(
-                rs, query, event_id=event_id)
-            params["aggregates"] = unwrap(self.eventproxy.submit_general_query(
-                rs, query, event_id=event_id, aggregate=True))
             return self._send_query_result(
                 rs, download, "course_result", scope, query, params)
         else:
@@ -534,10 +525,6 @@ class EventQueryMixin(EventBaseFrontend):
 
         if not rs.has_validation_errors() and is_search and query:
             query.scope = scope
-            params['result'] = self.eventproxy.submit_general_query(
-                rs, query, event_id=event_id)
-            params["aggregates"] = unwrap(self.eventproxy.submit_general_query(
-                rs, query, event_id=event_id, aggregate=True))
             return self._send_query_result(
                 rs, download, "lodgement_result", scope, query, params)
         else:
@@ -559,12 +546,19 @@ class EventQueryMixin(EventBaseFrontend):
     def _send_query_result(self, rs: RequestState, download: Optional[str],
                            filename: str, scope: QueryScope, query: Query,
                            params: CdEDBObject) -> Response:
+        event = rs.ambience['event']
         if download:
-            shortname = rs.ambience['event'].shortname
+            self.check_download_kind(download)
+            result = self.eventproxy.submit_general_query(
+                rs, query, event_id=event.id, stream=True)
             return self.send_query_download(
-                rs, params['result'], query, kind=download,
-                filename=f"{shortname}_{filename}")
+                rs, result, query, kind=download,
+                filename=f"{event.shortname}_{filename}")
         else:
+            params['result'] = self.eventproxy.submit_general_query(
+                rs, query, event_id=event.id)
+            params["aggregates"] = unwrap(self.eventproxy.submit_general_query(
+                rs, query, event_id=event.id, aggregate=True))
             return self.render(rs, scope.get_target(redirect=False), params)
 
     @access("event")
@@ -7,6 +7,8 @@ represents a different specific statistic.
 The statistics are implemented via:
   - a `test` method that determines if a given entity (e.g. a registration or a course)
    fits that statistic
+  - for registrations additionally a `get_matching_ids` method that determines all
+   fitting registrations at once via an `EventRegistrationColumns` object
   - a `_get_query_aux` method that constructs fields, constraints and sorting order
    to construct a Query object for that statistic.
 
@@ -40,7 +42,13 @@ RPS = const.RegistrationPartStati
 StatQueryAux = tuple[list[str], Optional[list[QueryConstraint]], list[QueryOrder]]
 
 __all__ = ['EventRegistrationPartStatistic', 'EventCourseStatistic',
-           'EventRegistrationTrackStatistic', 'EventRegistrationInXChoiceGrouper']
+           'EventRegistrationTrackStatistic', 'EventRegistrationInXChoiceGrouper',
+           'EventRegistrationColumns']
+
+INVOLVED_STATI = frozenset(status for status in RPS if status.is_involved())
+HAS_TO_PAY_STATI = frozenset(status for status in RPS if status.has_to_pay())
+PRESENT_STATI = frozenset(status for status in RPS if status.is_present())
+MINOR_AGE_CLASSES = frozenset(ac for ac in AgeClasses if ac.is_minor())
 
 
 # Helper functions that are frequently used when testing stats.
@@ -311,6 +319,90 @@ class StatisticTrackMixin(StatisticMixin):  # pylint: disable=abstract-method
         return ""
 
 
+class EventRegistrationColumns:
+    """Columnar representation of the registrations of an event.
+
+    Every registration is sorted into the sets of ids for the properties relevant to
+    the registration statistics exactly once. The statistics are then computed by
+    combining these sets, instead of testing every registration for every statistic
+    and every part or track.
+
+    The registration parts need to contain the precomputed `age_class` and the
+    registrations the `birthday` of the persona.
+    """
+
+    def __init__(self, event: models.Event, registrations: CdEDBObjectMap):
+        self.all = set(registrations)
+        # Properties of the registration.
+        self.paid: set[int] = set()
+        self.checked_in: set[int] = set()
+        self.orgas: set[int] = set()
+        self.parental_agreement: set[int] = set()
+        # Properties of the registration parts.
+        self.status: dict[int, dict[RPS, set[int]]] = {
+            part_id: {status: set() for status in RPS} for part_id in event.parts}
+        self.age_class: dict[int, dict[AgeClasses, set[int]]] = {
+            part_id: {age_class: set() for age_class in AgeClasses}
+            for part_id in event.parts}
+        self.no_lodgement: dict[int, set[int]] = {
+            part_id: set() for part_id in event.parts}
+        self.birthdays: dict[int, set[int]] = {
+            part_id: set() for part_id in event.parts}
+        # Properties of the registration tracks.
+        self.course_instructor: dict[int, set[int]] = {
+            track_id: set() for track_id in event.tracks}
+        self.instructs_course: dict[int, set[int]] = {
+            track_id: set() for track_id in event.tracks}
+        self.attends_course: dict[int, set[int]] = {
+            track_id: set() for track_id in event.tracks}
+        self.without_course: dict[int, set[int]] = {
+            track_id: set() for track_id in event.tracks}
+
+        years = range(event.begin.year, event.end.year + 1)
+        for reg_id, reg in registrations.items():
+            if reg['amount_owed'] <= reg['amount_paid']:
+                self.paid.add(reg_id)
+            if reg['checkin']:
+                self.checked_in.add(reg_id)
+            if reg['persona_id'] in event.orgas:
+                self.orgas.add(reg_id)
+            if reg['parental_agreement']:
+                self.parental_agreement.add(reg_id)
+            for part_id, part in reg['parts'].items():
+                self.status[part_id][part['status']].add(reg_id)
+                self.age_class[part_id][part['age_class']].add(reg_id)
+                if not part['lodgement_id']:
+                    self.no_lodgement[part_id].add(reg_id)
+                # Only relevant for present registrations, so skip the date
+                # arithmetic for all others.
+                if part['status'] in PRESENT_STATI:
+                    month, day = reg['birthday'].month, reg['birthday'].day
+                    event_part = event.parts[part_id]
+                    if any(event_part.part_begin <= datetime.date(year, month, day)
+                           <= event_part.part_end for year in years):
+                        self.birthdays[part_id].add(reg_id)
+            for track_id, track in reg['tracks'].items():
+                if track['course_instructor']:
+                    self.course_instructor[track_id].add(reg_id)
+                if track['course_id']:
+                    if track['course_id'] == track['course_instructor']:
+                        self.instructs_course[track_id].add(reg_id)
+                    else:
+                        self.attends_course[track_id].add(reg_id)
+                else:
+                    self.without_course[track_id].add(reg_id)
+
+    def with_status(self, part_id: int, stati: Collection[RPS]) -> set[int]:
+        """Select the registrations with any of the given stati in a part."""
+        return set().union(*(self.status[part_id][status] for status in stati))
+
+    def with_age_class(self, part_id: int, age_classes: Collection[AgeClasses],
+                       ) -> set[int]:
+        """Select the registrations with any of the given age classes in a part."""
+        return set().union(
+            *(self.age_class[part_id][age_class] for age_class in age_classes))
+
+
 # These enums each offer a collection of statistics for the stats page.
 # They implement a test and query building interface:
 # A `.test` method that takes the event data and a registrations, returning
@@ -438,6 +530,68 @@ class EventRegistrationPartStatistic(StatisticPartMixin, enum.Enum):
         else:
             raise RuntimeError(n_("Impossible."))
 
+    def get_matching_ids(self, columns: EventRegistrationColumns, part_id: int,
+                         ) -> set[int]:
+        """Determine all registrations fitting into this statistic for the given part.
+
+        This is equivalent to using `test` on every registration.
+        """
+        status = columns.status[part_id]
+        participants = status[RPS.participant]
+        if self == self.pending:
+            return set(status[RPS.applied])
+        elif self == self.paid:
+            return status[RPS.applied] & columns.paid
+        elif self == self.participant:
+            return set(participants)
+        elif self == self.minors:
+            return participants & columns.with_age_class(part_id, MINOR_AGE_CLASSES)
+        elif self == self.u18:
+            return participants & columns.age_class[part_id][AgeClasses.u18]
+        elif self == self.u16:
+            return participants & columns.age_class[part_id][AgeClasses.u16]
+        elif self == self.u14:
+            return participants & columns.age_class[part_id][AgeClasses.u14]
+        elif self == self.u10:
+            return participants & columns.age_class[part_id][AgeClasses.u10]
+        elif self == self.checked_in:
+            return participants & columns.checked_in
+        elif self == self.not_checked_in:
+            return participants - columns.checked_in
+        elif self == self.orgas:
+            return participants & columns.orgas
+        elif self == self.waitlist:
+            return set(status[RPS.waitlist])
+        elif self == self.guest:
+            return set(status[RPS.guest])
+        elif self == self.involved:
+            return columns.with_status(part_id, INVOLVED_STATI)
+        elif self == self.not_paid:
+            return columns.with_status(part_id, HAS_TO_PAY_STATI) - columns.paid
+        elif self == self.orgas_not_paid:
+            return ((columns.with_status(part_id, HAS_TO_PAY_STATI) - columns.paid)
+                    & columns.orgas)
+        elif self == self.no_parental_agreement:
+            return ((columns.with_status(part_id, INVOLVED_STATI)
+                     & columns.with_age_class(part_id, MINOR_AGE_CLASSES))
+                    - columns.parental_agreement)
+        elif self == self.present:
+            return columns.with_status(part_id, PRESENT_STATI)
+        elif self == self.no_lodgement:
+            return (columns.with_status(part_id, PRESENT_STATI)
+                    & columns.no_lodgement[part_id])
+        elif self == self.birthdays:
+            # Only present registrations are considered for birthdays.
+            return set(columns.birthdays[part_id])
+        elif self == self.cancelled:
+            return set(status[RPS.cancelled])
+        elif self == self.rejected:
+            return set(status[RPS.rejected])
+        elif self == self.total:
+            return columns.all - status[RPS.not_applied]
+        else:
+            raise RuntimeError(n_("Impossible."))
+
     def _get_query_aux(self, event: models.Event, part_id: int) -> StatQueryAux:  # pylint: disable=arguments-differ
         """
         Return fields of interest, constraints and order for this statistic for a part.
@@ -740,6 +894,25 @@ class EventRegistrationTrackStatistic(StatisticTrackMixin, enum.Enum):
         else:
             raise RuntimeError(n_("Impossible."))
 
+    def get_matching_ids(self, event: models.Event, columns: EventRegistrationColumns,
+                         track_id: int) -> set[int]:
+        """Determine all registrations fitting into this statistic for the given track.
+
+        This is equivalent to using `test` on every registration.
+        """
+        part_id = event.tracks[track_id].part_id
+        participants = columns.status[part_id][RPS.participant]
+        if self == self.all_instructors:
+            return participants & columns.course_instructor[track_id]
+        elif self == self.instructors:
+            return participants & columns.instructs_course[track_id]
+        elif self == self.attendees:
+            return participants & columns.attends_course[track_id]
+        elif self == self.no_course:
+            return (participants & columns.without_course[track_id]) - columns.orgas
+        else:
+            raise RuntimeError(n_("Impossible."))
+
     def _get_query_aux(self, event: models.Event, track_id: int) -> StatQueryAux:  # pylint: disable=arguments-differ
         track = event.tracks[track_id]
         part = event.parts[track.part_id]
@@ -10,7 +10,7 @@ from typing import Optional
 from werkzeug import Response
 
 import cdedb.database.constants as const
-from cdedb.common import CdEDBObject, RequestState
+from cdedb.common import CdEDBObject, RequestState, now
 from cdedb.common.n_ import n_
 from cdedb.frontend.common import REQUESTdata, access, mailinglist_guard, periodic
 from cdedb.frontend.ml.base import MlBaseFrontend
@@ -18,6 +18,34 @@ from cdedb.frontend.ml.mailman import MlMailmanMixin
 
 __all__ = ['MlFrontend']
 
+# Markers of the inputs of the subscriptions are only used once they are this old (in
+# seconds), so that transactions running while they were taken have committed.
+MARKER_OVERLAP = 60*60
+
+MarkerHistory = list[tuple[float, dict[str, int]]]
+
+
+def _usable_marker(history: MarkerHistory, current: float,
+                   ) -> Optional[dict[str, int]]:
+    """Select the newest marker which is at least `MARKER_OVERLAP` old.
+
+    If there is none, fall back to the oldest marker.
+    """
+    usable = [marker for tstamp, marker in history
+              if tstamp <= current - MARKER_OVERLAP]
+    if usable:
+        return usable[-1]
+    return history[0][1] if history else None
+
+
+def _add_marker(history: MarkerHistory, current: float, marker: dict[str, int],
+                ) -> MarkerHistory:
+    """Add a new marker, dropping those which will not be used anymore."""
+    history = [*history, (current, marker)]
+    old = [i for i, (tstamp, _) in enumerate(history)
+           if tstamp <= current - MARKER_OVERLAP]
+    return history[old[-1]:] if old else history
+
 
 class MlFrontend(MlMailmanMixin, MlBaseFrontend):
     @access("ml")
@@ -142,8 +170,37 @@ class MlFrontend(MlMailmanMixin, MlBaseFrontend):
 
     @periodic("sync_subscriptions")
     def sync_subscriptions(self, rs: RequestState, store: CdEDBObject) -> CdEDBObject:
-        """Update current subscriptions then sync to mailman."""
-        self.write_subscription_states(rs)
-        self.mailman_sync(rs)
+        """Update current subscriptions then sync to mailman.
+
+        Only mailinglists whose inputs changed since the last run are updated and
+        synced, except for a full update once a day.
+
+        The changed inputs are determined via markers of the relevant logs. To
+        account for transactions which were still running when a marker was taken,
+        a marker is only used once it is `MARKER_OVERLAP` old. Changes of even longer
+        transactions are caught by the next daily full update.
+        """
+        current = now().timestamp()
+        marker = self.mlproxy.get_subscription_input_marker(rs)
+        mailman_marker = self.mlproxy.get_mailman_sync_marker(rs)
+        markers = store.get('markers', [])
+        mailman_markers = store.get('mailman_markers', [])
+        mailinglist_ids = None
+        if current > store.get('tstamp', 0) + 24*60*60:
+            self.write_subscription_states(rs)
+            store['tstamp'] = current
+        else:
+            self.write_subscription_states(
+                rs, since=_usable_marker(markers, current))
+            if since := _usable_marker(mailman_markers, current):
+                mailinglist_ids = self.mlproxy.list_changed_mailinglists(rs, since)
+        store['markers'] = _add_marker(markers, current, marker)
+        # Only add the marker if the sync succeeded, otherwise retry next time.
+        if self.mailman_sync(rs, mailinglist_ids):
+            mailman_markers = _add_marker(mailman_markers, current, mailman_marker)
+            store['mailman_markers'] = mailman_markers
+            # Changes up to the oldest marker we keep are never looked at again.
+            self.mlproxy.prune_subscription_changes(rs, mailman_markers[0][1])
 
         return store
+
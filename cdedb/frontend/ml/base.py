@@ -94,10 +94,15 @@ class MlBaseFrontend(AbstractUserFrontend):
             'subscriptions': subscriptions,
             'mailinglist_infos': mailinglist_infos})
 
-    def write_subscription_states(self, rs: RequestState) -> DefaultReturnCode:
-        """Write the current state of implicit subscribers to the database."""
+    def write_subscription_states(self, rs: RequestState,
+                                  since: Optional[dict[str, int]] = None,
+                                  ) -> DefaultReturnCode:
+        """Write the current state of implicit subscribers to the database.
+
+        :param since: See `MlBackend.write_subscription_states`.
+        """
         mailinglist_ids = self.mlproxy.list_mailinglists(rs)
-        return self.mlproxy.write_subscription_states(rs, mailinglist_ids)
+        return self.mlproxy.write_subscription_states(rs, mailinglist_ids, since)
 
     @access("ml_admin", modi={"POST"})
     def manually_write_subscription_states(self, rs: RequestState) -> Response:
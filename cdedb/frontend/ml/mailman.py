@@ -6,11 +6,18 @@ This utilizes the mailman REST API to drive the mailinglists residing
 on the mail VM from within the CdEDB.
 """
 
+import concurrent.futures
+import dataclasses
+from collections.abc import Collection
+from typing import Optional
+
 import mailmanclient as mmc
 
+import cdedb.common.validation.types as vtypes
 import cdedb.database.constants as const
 from cdedb.backend.common import DatabaseLock
-from cdedb.common import RequestState, make_persona_name
+from cdedb.common import CdEDBObjectMap, RequestState, make_persona_name
+from cdedb.common.sorting import xsorted
 from cdedb.database.constants import EmailStatus, LockType
 from cdedb.frontend.common import cdedburl
 from cdedb.frontend.ml.base import MlBaseFrontend
@@ -58,6 +65,20 @@ def template_url(name: str) -> str:
     return f"https://db.cde-ev.de/mailman_templates/{name}"
 
 
+@dataclasses.dataclass(frozen=True)
+class MailmanSyncInputs:
+    """The data needed to sync the mailinglists, retrieved once for all of them.
+
+    The mailinglists are synced in worker threads, which must not access the
+    database, so everything has to be retrieved beforehand.
+    """
+    #: The subscribers of each mailinglist with their explicit addresses.
+    addresses: dict[int, dict[int, Optional[str]]]
+    #: All subscribers and moderators of the mailinglists.
+    personas: CdEDBObjectMap
+    defect_addresses: set[str]
+
+
 class MlMailmanMixin(MlBaseFrontend):
     def mailman_sync_list_meta(self, rs: RequestState, mailman: mmc.Client,
                                db_list: Mailinglist,
@@ -236,16 +257,13 @@ The original message as received by Mailman is attached.
             existing_templates[name].delete()
 
     def mailman_sync_list_subs(self, rs: RequestState, mailman: mmc.Client,
-                               db_list: Mailinglist,
-                               mm_list: mmc.MailingList) -> None:
-        subscribing_states = const.SubscriptionState.subscribing_states()
-        persona_ids = set(self.mlproxy.get_subscription_states(
-            rs, db_list.id, states=subscribing_states))
-        db_addresses = self.mlproxy.get_subscription_addresses(
-            rs, db_list.id, persona_ids)
-        defect_addresses = self.coreproxy.list_email_states(
-            rs, EmailStatus.defect_states())
-        personas = self.coreproxy.get_personas(rs, persona_ids)
+                               db_list: Mailinglist, mm_list: mmc.MailingList,
+                               inputs: MailmanSyncInputs) -> None:
+        personas = inputs.personas
+        db_addresses = {
+            pid: address or personas[pid]['username']
+            for pid, address in inputs.addresses[db_list.id].items()
+        }
 
         # Before updating subscribers, delete spurious (un)subscription requests
         # submitted via mailman.
@@ -260,7 +278,7 @@ The original message as received by Mailman is attached.
             address: make_persona_name(personas[pid])
             for pid, address in db_addresses.items() if address
         }
-        actual_db_subscribers = set(db_subscribers) - set(defect_addresses)
+        actual_db_subscribers = set(db_subscribers) - inputs.defect_addresses
         mm_subscribers = {m.email: m for m in mm_list.members}
 
         new_subs = actual_db_subscribers - set(mm_subscribers)
@@ -274,12 +292,12 @@ The original message as received by Mailman is attached.
             mm_list.unsubscribe(address, pre_confirmed=True, pre_approved=True)
 
     def mailman_sync_list_mods(self, rs: RequestState, mailman: mmc.Client,
-                               db_list: Mailinglist,
-                               mm_list: mmc.MailingList) -> None:
-        personas = self.coreproxy.get_personas(rs, db_list.moderators)
+                               db_list: Mailinglist, mm_list: mmc.MailingList,
+                               inputs: MailmanSyncInputs) -> None:
+        personas = [inputs.personas[pid] for pid in db_list.moderators]
         db_moderators = {
             persona['username']: make_persona_name(persona)
-            for persona in personas.values() if persona['username']
+            for persona in personas if persona['username']
         }
         mm_moderators = {m.email: m for m in mm_list.moderators}
 
@@ -302,14 +320,18 @@ The original message as received by Mailman is attached.
 
     def mailman_sync_list_whites(
             self, rs: RequestState, mailman: mmc.Client, db_list: Mailinglist,
-            mm_list: mmc.MailingList,
+            mm_list: mmc.MailingList, inputs: MailmanSyncInputs,
     ) -> None:
         db_whitelist = set(db_list.whitelist)
         mm_whitelist = {n.email: n for n in mm_list.nonmembers}
 
         # implicitly whitelist username for personas with custom address
         if db_list.mod_policy == const.ModerationPolicy.non_subscribers:
-            db_whitelist |= self.mlproxy.get_implicit_whitelist(rs, db_list.id)
+            db_whitelist |= {
+                inputs.personas[pid]['username']
+                for pid, address in inputs.addresses[db_list.id].items()
+                if address and inputs.personas[pid]['username']
+            }
 
         new_whites = set(db_whitelist) - set(mm_whitelist)
         current_whites = set(mm_whitelist) - new_whites
@@ -330,28 +352,49 @@ The original message as received by Mailman is attached.
             mm_list.remove_role('nonmember', address)
 
     def mailman_sync_list(self, rs: RequestState, mailman: mmc.Client,
-                          db_list: Mailinglist, mm_list: mmc.MailingList) -> None:
+                          db_list: Mailinglist, mm_list: mmc.MailingList,
+                          inputs: MailmanSyncInputs) -> None:
         self.mailman_sync_list_meta(rs, mailman, db_list, mm_list)
         if db_list.is_active:
-            self.mailman_sync_list_subs(rs, mailman, db_list, mm_list)
-            self.mailman_sync_list_mods(rs, mailman, db_list, mm_list)
-            self.mailman_sync_list_whites(rs, mailman, db_list, mm_list)
+            self.mailman_sync_list_subs(rs, mailman, db_list, mm_list, inputs)
+            self.mailman_sync_list_mods(rs, mailman, db_list, mm_list, inputs)
+            self.mailman_sync_list_whites(rs, mailman, db_list, mm_list, inputs)
 
-    def mailman_sync(self, rs: RequestState) -> bool:
+    def mailman_sync(self, rs: RequestState,
+                     mailinglist_ids: Optional[Collection[int]] = None) -> bool:
         """Synchronize the mailing list software with the database.
 
         This has an @periodic decorator in the frontend.
 
+        :param mailinglist_ids: If given, only sync these existing mailinglists.
+            Mailinglists missing in or deleted from the database are handled in
+            any case.
         :returns: Whether the operation has been successful.
         """
         with DatabaseLock(rs, LockType.mailman) as lock:
             if lock:
-                return self._sync(rs)
+                return self._sync(rs, mailinglist_ids)
             else:
                 self.logger.info("Mailman sync ongoing, skipping this invokation.")
         return False
 
-    def _sync(self, rs: RequestState) -> bool:
+    def _retrieve_mailman_sync_inputs(self, rs: RequestState,
+                                      db_lists: Collection[Mailinglist],
+                                      ) -> MailmanSyncInputs:
+        active_lists = [ml for ml in db_lists if ml.is_active]
+        addresses = self.mlproxy.get_many_subscription_addresses(
+            rs, [ml.id for ml in active_lists])
+        persona_ids = set().union(
+            *addresses.values(), *(ml.moderators for ml in active_lists))
+        return MailmanSyncInputs(
+            addresses=addresses,
+            personas=self.coreproxy.get_personas(rs, persona_ids),
+            defect_addresses=set(self.coreproxy.list_email_states(
+                rs, EmailStatus.defect_states())),
+        )
+
+    def _sync(self, rs: RequestState,
+              mailinglist_ids: Optional[Collection[int]] = None) -> bool:
         if (self.conf["CDEDB_OFFLINE_DEPLOYMENT"] or (
                 self.conf["CDEDB_DEV"] and not self.conf["CDEDB_TEST"])):  # pragma: no cover
             self.logger.debug("Skipping mailman sync in dev/offline mode.")
@@ -370,14 +413,31 @@ The original message as received by Mailman is attached.
         new_lists = set(db_lists) - set(mm_lists)
         current_lists = set(db_lists) - new_lists
         deleted_lists = set(mm_lists) - set(db_lists)
-
-        for address in new_lists:
-            local_part, domain = address.split('@')
-            mm_list = mailman.get_domain(domain).create_list(local_part)
-            self.mailman_sync_list(rs, mailman, db_lists[address], mm_list)
-        for address in current_lists:
-            self.mailman_sync_list(rs, mailman, db_lists[address],
-                                   mm_lists[address])
+        if mailinglist_ids is not None:
+            current_lists = {address for address in current_lists
+                             if db_lists[address].id in mailinglist_ids}
+
+        # The database is only accessed here, the workers only talk to mailman.
+        inputs = self._retrieve_mailman_sync_inputs(
+            rs, [db_lists[address] for address in new_lists | current_lists])
+
+        def sync_list(address: vtypes.Email) -> None:
+            if address in new_lists:
+                local_part, domain = address.split('@')
+                mm_list = mailman.get_domain(domain).create_list(local_part)
+            else:
+                mm_list = mm_lists[address]
+            self.mailman_sync_list(rs, mailman, db_lists[address], mm_list, inputs)
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.conf["MAILMAN_SYNC_WORKERS"]) as executor:
+            futures = [executor.submit(sync_list, address)
+                       for address in xsorted(new_lists | current_lists)]
+        for future in futures:
+            # Propagate the first exception, after all lists had their turn.
+            future.result()
         for address in deleted_lists:
             mailman.delete_list(address)
+        self.logger.info(f"Synced {len(futures)} of {len(db_lists)} mailinglists"
+                         f" to mailman.")
         return True
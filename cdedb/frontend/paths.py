@@ -62,6 +62,8 @@ CDEDB_PATHS = werkzeug.routing.Map((
                  endpoint="meta_info_form"),
             rule("/meta", methods=_POST,
                  endpoint="change_meta_info"),
+            rule("/timings", methods=_GET,
+                 endpoint="view_request_timings"),
             rule("/user/create", methods=_GET,
                  endpoint="create_user_form"),
             rule("/user/create/redirect", methods=_GET,
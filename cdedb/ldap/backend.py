@@ -17,16 +17,18 @@ from typing import (
     overload,
 )
 
+from ldaptor.protocols import pureldap
 from ldaptor.protocols.ldap.distinguishedname import DistinguishedName as DN
 from ldaptor.protocols.pureber import int2ber
 from passlib.hash import sha512_crypt
-from psycopg import AsyncCursor
+from psycopg import AsyncConnection, AsyncCursor
 from psycopg.rows import DictRow
 from psycopg_pool import AsyncConnectionPool
 
-from cdedb.config import SecretsConfig
+from cdedb.config import Config, SecretsConfig
 from cdedb.database.constants import SubscriptionState
 from cdedb.database.conversions import from_db_output, to_db_input
+from cdedb.ldap.cache import CHANNEL as LDAP_CACHE_CHANNEL, LDAPCache
 from cdedb.ldap.schema import SchemaDescription
 
 if TYPE_CHECKING:
@@ -120,6 +122,44 @@ class LDAPsqlBackend:
         # encrypting dua passwords once at startup, to increase runtime performance
         self._dua_pwds = {name: self.encrypt_password(pwd)
                           for name, pwd in SecretsConfig()["LDAP_DUA_PW"].items()}
+        # cache of group memberships, only active while listening for invalidations
+        conf = Config()
+        self.cache = LDAPCache(ttl=conf["LDAP_CACHE_TTL"].total_seconds(),
+                               max_size=conf["LDAP_CACHE_MAX_SIZE"])
+
+    # seconds to wait before reconnecting to listen for cache invalidations
+    LISTEN_RETRY_DELAY = 10
+
+    async def listen_for_invalidations(self) -> None:
+        """Invalidate the cache on notifications of the database.
+
+        This runs forever. If the connection is lost, the cache is deactivated until
+        we are listening again, since we may have missed some notifications.
+        """
+        while True:
+            try:
+                # Notifications need a dedicated connection outside of the pool.
+                conninfo = cast(str, self.pool.conninfo)
+                async with await AsyncConnection.connect(
+                        conninfo, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {LDAP_CACHE_CHANNEL}")
+                    self.cache.clear()
+                    self.cache.active = True
+                    logger.info("Listening for ldap cache invalidations.")
+                    async for notify in conn.notifies():
+                        self.cache.invalidate_table(notify.payload)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Lost connection for ldap cache invalidations.")
+            finally:
+                self.cache.active = False
+                self.cache.clear()
+            await asyncio.sleep(self.LISTEN_RETRY_DELAY)
+
+    async def log_cache_stats(self, interval: float) -> None:
+        """Periodically log the hit and miss counters of the cache."""
+        while True:
+            await asyncio.sleep(interval)
+            self.cache.log_stats()
 
     @staticmethod
     async def execute_db_query(cur: AsyncCursor[DictRow], query: str,
@@ -443,12 +483,178 @@ class LDAPsqlBackend:
         """
         return cls.user_dn(persona_id)
 
-    async def list_users(self) -> list[DN]:
-        query = "SELECT id FROM core.personas WHERE NOT is_archived"
-        return [self.list_single_user(e["id"]) async for e in self.query_all(query, [])]
+    async def list_users(self, filter_object: Optional[Any] = None, *,
+                         after: Optional[int] = None, limit: Optional[int] = None,
+                         ) -> list[DN]:
+        """List all users, possibly restricted by an ldap search filter.
+
+        The filter is only used to narrow down the candidates in the database, see
+        'user_filter_condition'. The entries still have to be matched against the
+        filter afterwards.
+
+        The users are ordered by their id. To list them in batches, pass the id of
+        the last user of the previous batch as `after`.
+        """
+        condition = "NOT is_archived"
+        params: list[DatabaseValue_s] = []
+        if filter_object is not None:
+            if pushdown := self.user_filter_condition(filter_object):
+                condition = f"{condition} AND {pushdown[0]}"
+                params.extend(pushdown[1])
+        if after is not None:
+            condition = f"{condition} AND id > %s"
+            params.append(after)
+        query = f"SELECT id FROM core.personas WHERE {condition} ORDER BY id"
+        if limit is not None:
+            query = f"{query} LIMIT %s"
+            params.append(limit)
+        return [
+            self.list_single_user(e["id"]) async for e in self.query_all(query, params)
+        ]
+
+    # Map lowercase ldap attribute names to the sql expressions providing their value.
+    USER_FILTER_COLUMNS = {
+        "uid": "id::text",
+        "mail": "username",
+        "cn": "(given_names || ' ' || family_name)",
+    }
+
+    @staticmethod
+    def _filter_value(value: Union[str, bytes]) -> str:
+        """Filters parsed from text contain str, filters read from the wire bytes."""
+        if isinstance(value, bytes):
+            return value.decode("utf-8", errors="replace")
+        return value
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @classmethod
+    def user_filter_condition(cls, filter_object: Any,
+                              ) -> Optional[tuple[str, list["DatabaseValue_s"]]]:
+        """Translate an ldap search filter into a condition on core.personas.
+
+        This supports equality, presence and substring filters on the attributes
+        uid, mail, cn, objectClass and memberOf, and their combinations.
+
+        The translation is conservative: Every user matching the filter satisfies the
+        returned condition, but not the other way round. Parts of the filter which
+        can not be translated are replaced by TRUE, which is also signaled by
+        returning None. The matching in entry.py stays the single source of truth.
+        """
+        if isinstance(filter_object, pureldap.LDAPFilter_and):
+            conditions = [cls.user_filter_condition(f) for f in filter_object]
+            parts = [c for c in conditions if c is not None]
+            if not parts:
+                return None
+            elif len(parts) == 1:
+                return parts[0]
+            return (
+                "(" + " AND ".join(c[0] for c in parts) + ")",
+                [param for c in parts for param in c[1]],
+            )
+        elif isinstance(filter_object, pureldap.LDAPFilter_or):
+            conditions = [cls.user_filter_condition(f) for f in filter_object]
+            if not conditions or any(c is None for c in conditions):
+                return None
+            parts = cast(list[tuple[str, list["DatabaseValue_s"]]], conditions)
+            return (
+                "(" + " OR ".join(c[0] for c in parts) + ")",
+                [param for c in parts for param in c[1]],
+            )
+        elif isinstance(filter_object, pureldap.LDAPFilter_equalityMatch):
+            attribute = cls._filter_value(filter_object.attributeDesc.value).lower()
+            value = cls._filter_value(filter_object.assertionValue.value)
+            if attribute == "uid":
+                if not (value.isascii() and value.isdigit()):
+                    return "FALSE", []
+                return "id = %s", [int(value)]
+            elif attribute == "mail":
+                # usernames are always stored in lower case
+                return "username = %s", [value.lower()]
+            elif attribute == "cn":
+                return f"LOWER({cls.USER_FILTER_COLUMNS['cn']}) = LOWER(%s)", [value]
+            elif attribute == "objectclass":
+                if value.lower() == "inetorgperson":
+                    return None
+                return "FALSE", []
+            elif attribute == "memberof":
+                return cls._member_of_condition(value)
+        elif isinstance(filter_object, pureldap.LDAPFilter_substrings):
+            attribute = cls._filter_value(filter_object.type).lower()
+            if attribute not in cls.USER_FILTER_COLUMNS:
+                return None
+            column = cls.USER_FILTER_COLUMNS[attribute]
+            likes: list[str] = []
+            patterns: list[DatabaseValue_s] = []
+            # The parts are matched independently, which is less strict than the
+            # ldap semantic, but still a valid narrowing of the candidates.
+            for substring in filter_object.substrings:
+                value = cls._escape_like(cls._filter_value(substring.value))
+                if isinstance(substring, pureldap.LDAPFilter_substrings_initial):
+                    patterns.append(f"{value}%")
+                elif isinstance(substring, pureldap.LDAPFilter_substrings_final):
+                    patterns.append(f"%{value}")
+                else:
+                    patterns.append(f"%{value}%")
+                likes.append(f"{column} ILIKE %s")
+            if not likes:
+                return None
+            elif len(likes) == 1:
+                return likes[0], patterns
+            return "(" + " AND ".join(likes) + ")", patterns
+        # Presence filters are always true, since all users have all attributes.
+        #  Negations and other filters are not translated.
+        return None
+
+    @classmethod
+    def _member_of_condition(cls, value: str,
+                             ) -> Optional[tuple[str, list["DatabaseValue_s"]]]:
+        """Uninlined code from user_filter_condition.
+
+        This has to stay in sync with 'get_users_groups'.
+        """
+        try:
+            dn = DN(value)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if cls.is_status_group_dn(dn):
+            name = cls.status_group_name(dn)
+            if name is None:
+                return "FALSE", []
+            # The name is one of the known status flags, so this is safe.
+            if name == "is_searchable":
+                return "(is_member AND is_searchable)", []
+            return name, []
+        elif cls.is_presider_group_dn(dn):
+            return ("id IN (SELECT persona_id FROM assembly.presiders"
+                    " WHERE assembly_id = %s)", [cls.presider_group_id(dn)])
+        elif cls.is_orga_group_dn(dn):
+            return ("id IN (SELECT persona_id FROM event.orgas WHERE event_id = %s)",
+                    [cls.orga_group_id(dn)])
+        elif cls.is_moderator_group_dn(dn):
+            return ("id IN (SELECT persona_id FROM ml.moderators, ml.mailinglists"
+                    " WHERE ml.mailinglists.id = ml.moderators.mailinglist_id"
+                    " AND address = %s)", [cls.moderator_group_address(dn)])
+        elif cls.is_subscriber_group_dn(dn):
+            return ("id IN (SELECT persona_id"
+                    " FROM ml.subscription_states, ml.mailinglists"
+                    " WHERE ml.mailinglists.id = ml.subscription_states.mailinglist_id"
+                    " AND subscription_state = ANY(%s) AND address = %s)",
+                    [SubscriptionState.subscribing_states(),
+                     cls.subscriber_group_address(dn)])
+        # We do not know the dn, so we let the matching decide.
+        return None
 
     async def get_users_groups(self, persona_ids: Collection[int],
                                ) -> dict[int, list[str]]:
+        """Collect all groups of each given user, see '_get_users_groups'."""
+        return await self.cache.get_many(
+            "users_groups", persona_ids, self._get_users_groups)
+
+    async def _get_users_groups(self, persona_ids: Collection[int],
+                                ) -> dict[int, list[str]]:
         """Collect all groups of each given user.
 
         This is completely redundant information – we could get the same information by
@@ -638,14 +844,14 @@ class LDAPsqlBackend:
     async def list_status_groups(self) -> list[DN]:
         return [self.status_group_dn(name) for name in self.STATUS_GROUPS]
 
-    async def _get_status_group(self, dn: DN, name: str) -> tuple[DN, LDAPObject]:
-        """Uninlined code from get_status_groups."""
+    async def _get_status_group(self, name: str) -> tuple[str, LDAPObject]:
+        """Uninlined code from _get_status_groups."""
         if name == "is_searchable":
             condition = "is_member AND is_searchable"
         else:
             condition = name
         query = f"SELECT id FROM core.personas WHERE {condition}"
-        return dn, self._to_bytes({
+        return name, self._to_bytes({
             b"cn": [self.status_group_cn(name)],
             b"objectClass": ["groupOfUniqueNames"],
             b"description": [self.STATUS_GROUPS[name]],
@@ -663,12 +869,20 @@ class LDAPsqlBackend:
                 continue
             dn_to_name[dn] = name
 
+        groups = await self.cache.get_many(
+            "status_groups", set(dn_to_name.values()), self._get_status_groups)
+        return {
+            dn: groups[name] for dn, name in dn_to_name.items() if name in groups
+        }
+
+    async def _get_status_groups(self, names: Collection[str],
+                                 ) -> dict[str, LDAPObject]:
         # Schedule all tasks at the same time and wait for them all to complete.
-        # For convenience, the `_get_status_group` helper returns the dn as the key.
+        # For convenience, the `_get_status_group` helper returns the name as the key.
         # For some reason the generator expression needs to be unpacked explicitly.
         return dict(await asyncio.gather(*(
-            self._get_status_group(dn, name)
-            for dn, name in dn_to_name.items()
+            self._get_status_group(name)
+            for name in names
             if name in self.STATUS_GROUPS
         )))
 
@@ -743,13 +957,23 @@ class LDAPsqlBackend:
                 continue
             dn_to_assembly_id[dn] = assembly_id
 
+        groups = await self.cache.get_many(
+            "presider_groups", set(dn_to_assembly_id.values()),
+            self._get_assembly_presider_groups)
+        return {
+            dn: groups[assembly_id] for dn, assembly_id in dn_to_assembly_id.items()
+            if assembly_id in groups
+        }
+
+    async def _get_assembly_presider_groups(self, assembly_ids: Collection[int],
+                                            ) -> dict[int, LDAPObject]:
         assemblies, presiders = await asyncio.gather(
-            self.get_assemblies(dn_to_assembly_id.values()),
-            self.get_presiders(dn_to_assembly_id.values()),
+            self.get_assemblies(assembly_ids),
+            self.get_presiders(assembly_ids),
         )
 
         ret = dict()
-        for dn, assembly_id in dn_to_assembly_id.items():
+        for assembly_id in assembly_ids:
             if assembly_id not in assemblies:
                 continue
             group = {
@@ -760,7 +984,7 @@ class LDAPsqlBackend:
                 b"uniqueMember": [self.user_dn(e) for e in presiders[assembly_id]],
                 b"ipaUniqueID": [f"assembly_presider_groups/{assembly_id}"],
             }
-            ret[dn] = self._to_bytes(group)
+            ret[assembly_id] = self._to_bytes(group)
         return ret
 
     #
@@ -826,13 +1050,22 @@ class LDAPsqlBackend:
                 continue
             dn_to_event_id[dn] = event_id
 
+        groups = await self.cache.get_many(
+            "orga_groups", set(dn_to_event_id.values()), self._get_event_orga_groups)
+        return {
+            dn: groups[event_id] for dn, event_id in dn_to_event_id.items()
+            if event_id in groups
+        }
+
+    async def _get_event_orga_groups(self, event_ids: Collection[int],
+                                     ) -> dict[int, LDAPObject]:
         events, orgas = await asyncio.gather(
-            self.get_events(dn_to_event_id.values()),
-            self.get_orgas(dn_to_event_id.values()),
+            self.get_events(event_ids),
+            self.get_orgas(event_ids),
         )
 
         ret = dict()
-        for dn, event_id in dn_to_event_id.items():
+        for event_id in event_ids:
             if event_id not in events:
                 continue
             group = {
@@ -843,7 +1076,7 @@ class LDAPsqlBackend:
                 b"uniqueMember": [self.user_dn(e) for e in orgas[event_id]],
                 b"ipaUniqueID": [f"event_orga_groups/{event_id}"],
             }
-            ret[dn] = self._to_bytes(group)
+            ret[event_id] = self._to_bytes(group)
         return ret
 
     #
@@ -922,13 +1155,23 @@ class LDAPsqlBackend:
                 continue
             dn_to_address[dn] = address
 
+        groups = await self.cache.get_many(
+            "moderator_groups", set(dn_to_address.values()),
+            self._get_ml_moderator_groups)
+        return {
+            dn: groups[address] for dn, address in dn_to_address.items()
+            if address in groups
+        }
+
+    async def _get_ml_moderator_groups(self, addresses: Collection[str],
+                                       ) -> dict[str, LDAPObject]:
         mls, moderators = await asyncio.gather(
-            self.get_mailinglists(dn_to_address.values()),
-            self.get_moderators(dn_to_address.values()),
+            self.get_mailinglists(addresses),
+            self.get_moderators(addresses),
         )
 
         ret = dict()
-        for dn, address in dn_to_address.items():
+        for address in addresses:
             if address not in mls:
                 continue
             # mail addresses seem to be valid cns
@@ -941,7 +1184,7 @@ class LDAPsqlBackend:
                 b"uniqueMember": [self.user_dn(e) for e in moderators[address]],
                 b"ipaUniqueID": [f"ml_moderator_groups/{address}"],
             }
-            ret[dn] = self._to_bytes(group)
+            ret[address] = self._to_bytes(group)
         return ret
 
     #
@@ -1005,13 +1248,23 @@ class LDAPsqlBackend:
                 continue
             dn_to_address[dn] = address
 
+        groups = await self.cache.get_many(
+            "subscriber_groups", set(dn_to_address.values()),
+            self._get_ml_subscriber_groups)
+        return {
+            dn: groups[address] for dn, address in dn_to_address.items()
+            if address in groups
+        }
+
+    async def _get_ml_subscriber_groups(self, addresses: Collection[str],
+                                        ) -> dict[str, LDAPObject]:
         mls, subscribers = await asyncio.gather(
-            self.get_mailinglists(dn_to_address.values()),
-            self.get_subscribers(dn_to_address.values()),
+            self.get_mailinglists(addresses),
+            self.get_subscribers(addresses),
         )
 
         ret = dict()
-        for dn, address in dn_to_address.items():
+        for address in addresses:
             if address not in mls:
                 continue
             # mail addresses seem to be valid cns
@@ -1024,5 +1277,5 @@ class LDAPsqlBackend:
                 b"uniqueMember": [self.user_dn(e) for e in subscribers[address]],
                 b"ipaUniqueID": [f"mls/{address}"],
             }
-            ret[dn] = self._to_bytes(group)
+            ret[address] = self._to_bytes(group)
         return ret
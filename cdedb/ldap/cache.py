@@ -0,0 +1,115 @@
+"""Cache for the materialized ldap entries of the LDAPsqlBackend.
+
+The cache is invalidated by notifications of the database, see the triggers on the
+'ldap_cache' channel in cdedb-tables.sql. As long as we do not listen to those, the
+cache is bypassed, so it is never stale for longer than a notification round-trip.
+"""
+
+import collections
+import logging
+import time
+from collections.abc import Awaitable, Collection, Hashable
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# The channel to which the database sends the names of modified tables.
+CHANNEL = "ldap_cache"
+
+# Map the tables of the database to the namespaces of the cache depending on them.
+DEPENDENCIES: dict[str, set[str]] = {
+    "core.personas": {"users_groups", "status_groups"},
+    "assembly.assemblies": {"presider_groups"},
+    "assembly.presiders": {"users_groups", "presider_groups"},
+    "event.events": {"orga_groups"},
+    "event.orgas": {"users_groups", "orga_groups"},
+    "ml.mailinglists": {"users_groups", "moderator_groups", "subscriber_groups"},
+    "ml.moderators": {"users_groups", "moderator_groups"},
+    "ml.subscription_states": {"users_groups", "subscriber_groups"},
+}
+
+
+class LDAPCache:
+    """Size bounded LRU cache with expiring entries, divided into namespaces.
+
+    Each namespace has a generation counter, which is incremented on invalidation. A
+    result is only stored if the generation did not change while it was retrieved,
+    so concurrent modifications of the database can not sneak stale data in.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.active = False
+        self._data: collections.OrderedDict[
+            tuple[str, Hashable], tuple[float, object]] = collections.OrderedDict()
+        self._generations: dict[str, int] = collections.defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_many(
+        self, namespace: str, keys: Collection[K],
+        retrieve: Callable[[Collection[K]], Awaitable[dict[K, V]]],
+    ) -> dict[K, V]:
+        """Get the values for the given keys, retrieving the missing ones at once.
+
+        :param retrieve: Coroutine function to get the values of the missing keys.
+            Keys not contained in its result are not cached.
+        """
+        if not self.active:
+            return await retrieve(keys)
+        now = time.monotonic()
+        ret: dict[K, V] = {}
+        missing = []
+        for key in keys:
+            entry = self._data.get((namespace, key))
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end((namespace, key))
+                ret[key] = entry[1]  # type: ignore[assignment]
+            else:
+                missing.append(key)
+        self.hits += len(ret)
+        self.misses += len(missing)
+        if not missing:
+            return ret
+        generation = self._generations[namespace]
+        retrieved = await retrieve(missing)
+        if self.active and generation == self._generations[namespace]:
+            expires = time.monotonic() + self.ttl
+            for key, value in retrieved.items():
+                self._data[(namespace, key)] = (expires, value)
+                self._data.move_to_end((namespace, key))
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        ret.update(retrieved)
+        return ret
+
+    def invalidate(self, namespace: str) -> None:
+        """Drop all entries of the given namespace."""
+        self._generations[namespace] += 1
+        self.invalidations += 1
+        for key in [k for k in self._data if k[0] == namespace]:
+            del self._data[key]
+
+    def invalidate_table(self, table: str) -> None:
+        """Drop all entries depending on the given table of the database."""
+        for namespace in DEPENDENCIES.get(table, set()):
+            self.invalidate(namespace)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        for namespace in list(self._generations):
+            self._generations[namespace] += 1
+        self._data.clear()
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0.0
+        logger.info(
+            f"LDAP cache: {len(self._data)} entries, {self.hits} hits,"
+            f" {self.misses} misses ({ratio:.1%} hit rate),"
+            f" {self.invalidations} invalidations.")
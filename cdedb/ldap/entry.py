@@ -3,7 +3,7 @@
 import abc
 import asyncio
 import logging
-from collections.abc import ItemsView, Iterator, KeysView, ValuesView
+from collections.abc import AsyncIterator, ItemsView, Iterator, KeysView, ValuesView
 from typing import Any, Callable, Optional, Union
 
 import ldaptor.entryhelpers
@@ -149,13 +149,38 @@ class CdEDBBaseLDAPEntry(
     ) -> list["CdEDBBaseLDAPEntry"]:
         """Asyncio analogon to ldaptor.entryhelpers.SearchByTreeWalkingMixin.
 
+        This collects all results of 'search_iter' into a list.
+        """
+        return [
+            entry async for entry in self.search_iter(
+                filterText=filterText, filterObject=filterObject, scope=scope,
+                derefAliases=derefAliases, bound_dn=bound_dn)
+        ]
+
+    async def search_iter(
+        self,
+        filterText: Optional[Any] = None,
+        filterObject: Optional[Any] = None,
+        scope: Optional[Any] = None,
+        derefAliases: Optional[Any] = None,
+        bound_dn: Optional[BoundDn] = None,
+        after: Optional[DistinguishedName] = None,
+    ) -> AsyncIterator["CdEDBBaseLDAPEntry"]:
+        """Search the ldap tree, yielding the matching entries one by one.
+
         Note that our search accepted an additional kwarg "bound_dn". This should be
         used to prevent ddos attacks: Instead of performing all database searches for
         all searches and strip the results away during determining the returns, we
         prevent the query in the first place.
 
+        The filter is also handed down to the entries listing their children, so they
+        may restrict the entries retrieved from the database in the first place.
+
         :param bound_dn: Either the DN of the user performing the search, or None if
             an anonymous search is performed.
+        :param after: If given, resume a previous search after the entry with this DN.
+            The entries are always yielded in the same order, so this can be used to
+            page through the results without repeating the whole search.
         """
         if filterObject is None and filterText is None:
             filterObject = pureldap.LDAPFilterMatchAll
@@ -173,17 +198,37 @@ class CdEDBBaseLDAPEntry(
             derefAliases = pureldap.LDAP_DEREF_neverDerefAliases
 
         # choose iterator: base/children/subtree
+        entries: AsyncIterator[CdEDBBaseLDAPEntry]
         if scope == pureldap.LDAP_SCOPE_wholeSubtree:
-            entries = await self.subtree(bound_dn)
+            entries = self.subtree_iter(
+                bound_dn, filterObject=filterObject, after=after)
         elif scope == pureldap.LDAP_SCOPE_singleLevel:
-            entries = await self.children(bound_dn)
+            entries = self.children_iter(
+                bound_dn, filterObject=filterObject, after=after)
+            if after is not None:
+                entries = self._skip_iter(entries, after)
         elif scope == pureldap.LDAP_SCOPE_baseObject:
-            entries = [self]
+            entries = self._self_iter(after)
         else:
             raise LDAPProtocolError(f"unknown search scope: {scope!r}")
 
-        matched = [entry for entry in entries if entry.match(filterObject)]
-        return matched
+        async for entry in entries:
+            if entry.match(filterObject):
+                yield entry
+
+    async def _self_iter(self, after: Optional[DistinguishedName] = None,
+                         ) -> AsyncIterator["CdEDBBaseLDAPEntry"]:
+        if after is None:
+            yield self
+
+    @staticmethod
+    async def _skip_iter(entries: AsyncIterator["CdEDBBaseLDAPEntry"],
+                         after: DistinguishedName,
+                         ) -> AsyncIterator["CdEDBBaseLDAPEntry"]:
+        """Skip the entry with the given DN, which was already returned."""
+        async for entry in entries:
+            if entry.dn != after:
+                yield entry
 
     @abc.abstractmethod
     async def children(self, bound_dn: Optional[BoundDn] = None) -> LDAPEntries:
@@ -207,6 +252,47 @@ class CdEDBBaseLDAPEntry(
             result.extend(tree)
         return result
 
+    async def children_iter(
+        self, bound_dn: Optional[BoundDn] = None, filterObject: Optional[Any] = None,
+        after: Optional[DistinguishedName] = None,
+    ) -> AsyncIterator["CdEDBBaseLDAPEntry"]:
+        """Iterate over the children entries of this entry.
+
+        :param filterObject: The filter of the current search. Every child which
+            matches the filter has to be yielded, but others may be omitted.
+        :param after: A DN inside the subtree of this entry. If given, the children
+            preceding the child which contains this DN are omitted.
+        """
+        children = await self.children(bound_dn=bound_dn)
+        if after is not None:
+            for i, child in enumerate(children):
+                if child.dn.contains(after):
+                    children = children[i:]
+                    break
+        for child in children:
+            yield child
+
+    async def subtree_iter(
+        self, bound_dn: Optional[BoundDn] = None, filterObject: Optional[Any] = None,
+        after: Optional[DistinguishedName] = None,
+    ) -> AsyncIterator["CdEDBBaseLDAPEntry"]:
+        """Iterate over the subtree rooted at this entry, including this entry.
+
+        :param after: A DN inside the subtree of this entry. If given, only the
+            entries following the entry with this DN are yielded.
+        """
+        if after is None:
+            yield self
+        elif after == self.dn:
+            after = None
+        async for child in self.children_iter(
+                bound_dn, filterObject=filterObject, after=after):
+            child_after = (
+                after if after is not None and child.dn.contains(after) else None)
+            async for entry in child.subtree_iter(
+                    bound_dn, filterObject=filterObject, after=child_after):
+                yield entry
+
     @abc.abstractmethod
     async def lookup(self, dn: DistinguishedName) -> "CdEDBBaseLDAPEntry":
         """Lookup the given DN.
@@ -319,6 +405,18 @@ class CdEPreLeafEntry(CdEDBStaticEntry, metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    # number of children whose attributes are retrieved at once by children_iter
+    CHILDREN_BATCH_SIZE = 500
+
+    @staticmethod
+    def children_sort_key(dn: DistinguishedName) -> Any:
+        """Determine the order in which the children are returned by children_iter.
+
+        This order needs to be total, so a search can be resumed after a child even
+        if the child itself has vanished in the meantime.
+        """
+        return dn.getText()
+
     async def children(self, bound_dn: Optional[BoundDn] = None) -> LDAPEntries:
         dns = await self.children_lister(bound_dn=bound_dn)
         children = await self.children_getter(dns)
@@ -326,6 +424,22 @@ class CdEPreLeafEntry(CdEDBStaticEntry, metaclass=abc.ABCMeta):
                dn, attributes in children.items()]
         return ret
 
+    async def children_iter(
+        self, bound_dn: Optional[BoundDn] = None, filterObject: Optional[Any] = None,
+        after: Optional[DistinguishedName] = None,
+    ) -> AsyncIterator[CdEDBBaseLDAPEntry]:
+        """Retrieve the children in batches, to not hold all of them in memory."""
+        dns = sorted(await self.children_lister(bound_dn=bound_dn),
+                     key=self.children_sort_key)
+        if after is not None:
+            after_key = self.children_sort_key(after)
+            dns = [dn for dn in dns if self.children_sort_key(dn) > after_key]
+        for start in range(0, len(dns), self.CHILDREN_BATCH_SIZE):
+            children = await self.children_getter(
+                dns[start:start + self.CHILDREN_BATCH_SIZE])
+            for dn, attributes in children.items():
+                yield self.ChildGroup(dn, backend=self.backend, attributes=attributes)
+
     async def lookup(self, dn: DistinguishedName) -> CdEDBBaseLDAPEntry:
         if dn == self.dn:
             return self
@@ -567,6 +681,32 @@ class UsersEntry(CdEPreLeafEntry):
             return [self.backend.list_single_user(user_id)]
         return await self.backend.list_users()
 
+    async def children_iter(
+        self, bound_dn: Optional[BoundDn] = None, filterObject: Optional[Any] = None,
+        after: Optional[DistinguishedName] = None,
+    ) -> AsyncIterator[CdEDBBaseLDAPEntry]:
+        """Retrieve the users in bounded batches, ordered by their id.
+
+        Each batch continues after the last user of the previous one (keyset
+        pagination), so resuming a search after some user is cheap. The search filter
+        is used to restrict the users in the database, see list_users.
+        """
+        if bound_dn is None or self.backend.is_user_dn(bound_dn):
+            async for child in super().children_iter(
+                    bound_dn, filterObject=filterObject, after=after):
+                yield child
+            return
+        after_id = self.backend.user_id(after) if after is not None else None
+        while True:
+            dns = await self.backend.list_users(
+                filterObject, after=after_id, limit=self.CHILDREN_BATCH_SIZE)
+            children = await self.children_getter(dns)
+            for dn, attributes in children.items():
+                yield self.ChildGroup(dn, backend=self.backend, attributes=attributes)
+            if len(dns) < self.CHILDREN_BATCH_SIZE:
+                break
+            after_id = self.backend.user_id(dns[-1])
+
     async def children_getter(self, dns: list[DistinguishedName]) -> LDAPObjectMap:
         return await self.backend.get_users(dns)
 
@@ -37,6 +37,12 @@ async def main() -> None:
     logger.debug("Got database connection.")
     backend = LDAPsqlBackend(pool)
     root = RootEntry(backend)
+    # Keep references to the background tasks, so they are not garbage collected.
+    background_tasks = {
+        asyncio.create_task(backend.listen_for_invalidations()),
+        asyncio.create_task(backend.log_cache_stats(
+            conf["LDAP_CACHE_STATS_INTERVAL"].total_seconds())),
+    }
 
     # Create Server
     logger.info("Opening LDAP server ...")
@@ -87,6 +93,8 @@ async def main() -> None:
             await server.serve_forever()
         except asyncio.CancelledError:
             logger.info("Server shut down")
+    for task in background_tasks:
+        task.cancel()
 
 
 if __name__ == '__main__':
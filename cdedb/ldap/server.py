@@ -1,9 +1,12 @@
 """Custom ldaptor server."""
 
 import asyncio
+import dataclasses
 import logging
-import sys
+import secrets
+import time
 from asyncio import StreamReader, StreamWriter
+from collections import OrderedDict
 from collections.abc import Coroutine
 from typing import Any, Callable, Optional, Protocol
 
@@ -40,6 +43,17 @@ class ReplyCallback(Protocol):
         ...
 
 
+@dataclasses.dataclass
+class PagedSearch:
+    """The state of a paged search, referenced by the cookie given to the client."""
+    # identifies the search, so a cookie can not be used to continue another search
+    key: tuple[Any, ...]
+    # the dn of the last entry which was returned to the client
+    last_dn: DistinguishedName
+    # point in time (see time.monotonic) after which the search may not be continued
+    expires: float
+
+
 class LdapHandler:
     """Implementation of the ldap protocol via asyncio.
 
@@ -58,6 +72,15 @@ class LdapHandler:
         self.writer = writer
         self.reader = reader
         self.bound_user: Optional[CdEDBBaseLDAPEntry] = None
+        # paged searches of this client which may be continued, least recent first
+        self.paged_searches: OrderedDict[bytes, PagedSearch] = OrderedDict()
+
+    # number of search result entries after which we wait for the client to catch up
+    DRAIN_INTERVAL = 100
+    # number of paged searches per client which may be continued at the same time
+    PAGED_SEARCHES_MAX = 16
+    # time in seconds after which a paged search may no longer be continued
+    PAGED_SEARCH_TTL = 600
 
     berdecoder = pureldap.LDAPBERDecoderContext_TopLevel(
         inherit=pureldap.LDAPBERDecoderContext_LDAPMessage(
@@ -288,6 +311,31 @@ class LdapHandler:
             reply(pureldap.LDAPCompareResponse(ldaperrors.LDAPCompareFalse.resultCode))
         return None
 
+    def store_paged_search(self, key: tuple[Any, ...],
+                           last_dn: DistinguishedName) -> bytes:
+        """Remember a paged search to continue it later on.
+
+        :returns: The cookie referencing the search.
+        """
+        cookie = secrets.token_bytes(16)
+        self.paged_searches[cookie] = PagedSearch(
+            key=key, last_dn=last_dn,
+            expires=time.monotonic() + self.PAGED_SEARCH_TTL)
+        while len(self.paged_searches) > self.PAGED_SEARCHES_MAX:
+            self.paged_searches.popitem(last=False)
+        return cookie
+
+    def pop_paged_search(self, cookie: bytes, key: tuple[Any, ...]) -> PagedSearch:
+        """Retrieve a paged search by its cookie. Each cookie may be used only once."""
+        now = time.monotonic()
+        for expired in [
+                c for c, state in self.paged_searches.items() if state.expires < now]:
+            del self.paged_searches[expired]
+        paged_search = self.paged_searches.pop(cookie, None)
+        if paged_search is None or paged_search.key != key:
+            raise LDAPUnwillingToPerform("Invalid paged results cookie.")
+        return paged_search
+
     fail_LDAPSearchRequest = pureldap.LDAPSearchResultDone
 
     # see RFC 2696
@@ -304,8 +352,11 @@ class LdapHandler:
     #         cookie          OCTET STRING
     # }
     #
-    # We decided to store the offset of the last page (the ordinal of the last entry
-    # which was already returned) in the cookie.
+    # The cookie is an opaque token referencing the state of the search, which is
+    # kept per connection (see PagedSearch). Since the entries are always returned in
+    # the same order, the next page is retrieved by resuming the search after the last
+    # entry of the previous page. The total size of the result is not known in advance,
+    # so we always return 0 as estimate.
     async def handle_LDAPSearchRequest(
         self,
         request: LDAPSearchRequest,
@@ -318,7 +369,7 @@ class LdapHandler:
 
         is_paged = False
         paged_size = 0
-        paged_cookie = 0
+        paged_cookie = b""
         for controlType, _, controlValue in (controls or []):
             if controlType != PagedResultsControlType:
                 continue
@@ -327,12 +378,11 @@ class LdapHandler:
             ).data[0]
             logger.debug(f"Control values: {control_values.data}")
             paged_size = control_values[0].value
-            # Signaling we should return the first page.
-            if control_values[1].value != b"":
-                paged_cookie = int.from_bytes(control_values[1].value, sys.byteorder)
-            is_paged = paged_size != 0
+            # An empty cookie signals we should return the first page.
+            paged_cookie = control_values[1].value
+            is_paged = paged_size != 0 or paged_cookie != b""
             logger.debug(f"Received Paged size: {paged_size}")
-            logger.debug(f"Received Paged cookie: {paged_cookie}")
+            logger.debug(f"Received Paged cookie: {paged_cookie!r}")
 
         # short-circuit if the requested entry is the root entry
         # ignore the paged_search request, since its only one entry
@@ -351,16 +401,37 @@ class LdapHandler:
             reply(msg)
             return None
 
+        bound_dn = self.bound_user.dn if self.bound_user else None
+        search_key = (
+            request.baseObject, request.scope, request.derefAliases,
+            request.filter.toWire(), tuple(request.attributes),
+            bound_dn.getText() if bound_dn else None,
+        )
+        # A page size of zero signals that the client abandons the paged search.
+        if is_paged and paged_size == 0:
+            self.paged_searches.pop(paged_cookie, None)
+            control_value = pureber.BERSequence([
+                pureber.BERInteger(0), pureber.BEROctetString(b""),
+            ])
+            reply(pureldap.LDAPSearchResultDone(
+                resultCode=ldaperrors.Success.resultCode),
+                controls=[(PagedResultsControlType, None, control_value)])
+            return None
+
+        after = None
+        if is_paged and paged_cookie:
+            after = self.pop_paged_search(paged_cookie, search_key).last_dn
+
         base = await self.root.lookup(base_dn)
-        search_results = await base.search(
+        search_results = base.search_iter(
             filterObject=request.filter,
             # attributes=request.attributes,
             scope=request.scope,
             derefAliases=request.derefAliases,
-            # sizeLimit=request.sizeLimit,
             # timeLimit=request.timeLimit,
             # typesOnly=request.typesOnly,
-            bound_dn=self.bound_user.dn if self.bound_user else None,
+            bound_dn=bound_dn,
+            after=after,
         )
 
         def filter_entry(entry: CdEDBBaseLDAPEntry) -> Optional[list[Any]]:
@@ -454,38 +525,44 @@ class LdapHandler:
                     (key, attributes.get(key)) for key in request.attributes
                     if key in attributes]
 
-        results = [(result.dn, filter_entry(result)) for result in search_results
-                   if filter_entry(result) is not None]
-
-        total_size = 0
-        new_cookie = None
-        enc_new_cookie = b""
-        if is_paged:
-            total_size = len(results)
-            results = results[paged_cookie:][:paged_size]
-            # indicates this is the last page
-            if paged_size + paged_cookie >= total_size:
-                enc_new_cookie = b""
-            else:
-                new_cookie = paged_cookie + paged_size
-                # determine the number of bytes we need to encode the cookie
-                enc_new_cookie = new_cookie.to_bytes(
-                    (new_cookie.bit_length() + 7) // 8, sys.byteorder)
-
-        for result_dn, attributes in results:
+        # The results are sent to the client as soon as they are found, so we never
+        #  hold the whole result set in memory.
+        sent = 0
+        last_dn = None
+        has_next_page = False
+        size_limit_exceeded = False
+        async for result in search_results:
+            attributes = filter_entry(result)
+            if attributes is None:
+                continue
+            if is_paged and sent >= paged_size:
+                has_next_page = True
+                break
+            if request.sizeLimit and sent >= request.sizeLimit:
+                size_limit_exceeded = True
+                break
             reply(pureldap.LDAPSearchResultEntry(
-                objectName=result_dn.getText(), attributes=attributes))
+                objectName=result.dn.getText(), attributes=attributes))
+            sent += 1
+            last_dn = result.dn
+            if sent % self.DRAIN_INTERVAL == 0:
+                await self.writer.drain()
 
         controls = None
         if is_paged:
+            new_cookie = b""
+            if has_next_page and last_dn is not None:
+                new_cookie = self.store_paged_search(search_key, last_dn)
             control_value = pureber.BERSequence([
-                pureber.BERInteger(total_size), pureber.BEROctetString(enc_new_cookie),
+                pureber.BERInteger(0), pureber.BEROctetString(new_cookie),
             ])
             controls = [(PagedResultsControlType, None, control_value)]
-            logger.debug(f"Returned Paged size: {total_size}")
-            logger.debug(f"Retruned Paged cookie: {new_cookie}")
+            logger.debug(f"Returned Paged cookie: {new_cookie!r}")
 
-        reply(pureldap.LDAPSearchResultDone(resultCode=ldaperrors.Success.resultCode),
-              controls=controls)
+        if size_limit_exceeded:
+            result_code = ldaperrors.LDAPSizeLimitExceeded.resultCode
+        else:
+            result_code = ldaperrors.Success.resultCode
+        reply(pureldap.LDAPSearchResultDone(resultCode=result_code), controls=controls)
 
         return None
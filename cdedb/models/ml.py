@@ -2,7 +2,7 @@
 
 import dataclasses
 from collections import OrderedDict
-from collections.abc import Collection, Mapping
+from collections.abc import Collection, Hashable, Mapping
 from dataclasses import dataclass, fields
 from typing import TYPE_CHECKING, Any, ClassVar, Optional, cast
 
@@ -48,6 +48,22 @@ class BackendContainer:
         self.assembly = cast("AssemblyBackend", assembly)
 
 
+@dataclass
+class SubscriptionInputChanges:
+    """Summary of the changes to the inputs of the subscription states.
+
+    This is used to skip mailinglists whose subscription states can not have changed
+    since some point in time, see `Mailinglist.inputs_changed`.
+    """
+    # Whether any persona has been changed.
+    personas: bool
+    # Whether the moderators of any mailinglist have been changed.
+    moderators: bool
+    event_ids: set[int]
+    assembly_ids: set[int]
+    mailinglist_ids: set[int]
+
+
 class MailinglistGroup(CdEIntEnum):
     """To be used in `MlType.sortkey` to group similar mailinglists together."""
     public = 1
@@ -335,7 +351,20 @@ class Mailinglist(CdEDataclass):
         """
         # TODO check for access to the ml? Needs ml_backend.
         personas = bc.core.get_personas(rs, persona_ids)
+        return self.get_role_policies(personas)
+
+    @classmethod
+    def has_role_policies(cls) -> bool:
+        """Whether the subscription policies only depend on the `role_map`."""
+        return cls.get_subscription_policies is Mailinglist.get_subscription_policies
 
+    def get_role_policies(self, personas: Mapping[int, CdEDBObject],
+                          ) -> SubscriptionPolicyMap:
+        """Determine the SubscriptionPolicy for the given personas from the `role_map`.
+
+        This allows to determine the policies of many mailinglists with the same
+        personas, which have been retrieved only once.
+        """
         ret = {}
         for persona_id, persona in personas.items():
             roles = extract_roles(persona, introspection_only=True)
@@ -352,6 +381,19 @@ class Mailinglist(CdEDataclass):
         """Retrieve a set of personas, which should be subscribers."""
         return set()
 
+    def implicit_subscribers_key(self) -> Hashable:
+        """Identify the inputs of `get_implicit_subscribers`.
+
+        Mailinglists with the same key have the same implicit subscribers, so these
+        have to be retrieved only once when writing the subscription states of many
+        mailinglists. Override this together with `get_implicit_subscribers`.
+        """
+        return ("mailinglist", self.id)
+
+    def inputs_changed(self, changes: SubscriptionInputChanges) -> bool:
+        """Whether the subscription states may be affected by the given changes."""
+        return self.id in changes.mailinglist_ids or changes.personas
+
     def periodic_cleanup(self, rs: RequestState) -> bool:  # pylint: disable=no-self-use
         """Whether or not to do periodic subscription cleanup on this list."""
         return True
@@ -374,6 +416,9 @@ class AllUsersImplicitMeta(GeneralMailinglist):
         Leave out personas which are archived or have no valid email set.."""
         return bc.core.list_all_personas(rs, is_active=False)
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("all_personas",)
+
 
 @dataclass
 class AllMembersImplicitMeta(GeneralMailinglist):
@@ -385,6 +430,9 @@ class AllMembersImplicitMeta(GeneralMailinglist):
         """Return a set of all current members."""
         return bc.core.list_current_members(rs, is_active=False)
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("current_members",)
+
 
 @dataclass
 class EventAssociatedMeta(GeneralMailinglist):
@@ -396,6 +444,10 @@ class EventAssociatedMeta(GeneralMailinglist):
         """Disable periodic cleanup to freeze legacy event-lists."""
         return self.event_id is not None
 
+    def inputs_changed(self, changes: SubscriptionInputChanges) -> bool:
+        return (self.id in changes.mailinglist_ids
+                or self.event_id in changes.event_ids)
+
 
 @dataclass
 class TeamMeta(GeneralMailinglist):
@@ -421,14 +473,21 @@ class ImplicitsSubscribableMeta(GeneralMailinglist):
         infers non-eligibity for mailinglists if a user raises a privilege error while
         checking whether they are privileged.
         """
-        ret = {pid: SubscriptionPolicy.none for pid in persona_ids}
         try:
             implicits = self.get_implicit_subscribers(rs, bc)
         except PrivilegeError:
             if {rs.user.persona_id} == set(persona_ids):
-                return ret
+                return {pid: SubscriptionPolicy.none for pid in persona_ids}
             else:
                 raise
+        return self.get_implicit_policies(persona_ids, implicits)
+
+    @staticmethod
+    def get_implicit_policies(persona_ids: Collection[int], implicits: set[int],
+                              ) -> SubscriptionPolicyMap:
+        """Determine the SubscriptionPolicy for the given personas from the already
+        retrieved implicit subscribers."""
+        ret = {pid: SubscriptionPolicy.none for pid in persona_ids}
         ret.update({pid: SubscriptionPolicy.subscribable
                     for pid in implicits.intersection(persona_ids)})
         return ret
@@ -609,6 +668,10 @@ class EventAssociatedMailinglist(EventAssociatedMeta, EventMailinglist):
 
         return {e["persona.id"] for e in data}
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("registrations", self.event_id, self.event_part_group_id,
+                tuple(sorted(self.registration_stati)))
+
 
 @dataclass
 class EventAssociatedExclusiveMailinglist(EventAssociatedMailinglist):
@@ -672,6 +735,9 @@ class EventOrgaMailinglist(EventAssociatedMeta, ImplicitsSubscribableMeta,
         event = bc.event.get_event(rs, self.event_id)
         return cast(set[int], event.orgas)
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("orgas", self.event_id)
+
 
 @dataclass
 class AssemblyAssociatedMailinglist(ImplicitsSubscribableMeta, AssemblyMailinglist):
@@ -682,6 +748,10 @@ class AssemblyAssociatedMailinglist(ImplicitsSubscribableMeta, AssemblyMailingli
         """Disable periodic cleanup to freeze legacy assembly-lists."""
         return self.assembly_id is not None
 
+    def inputs_changed(self, changes: SubscriptionInputChanges) -> bool:
+        return (self.id in changes.mailinglist_ids
+                or self.assembly_id in changes.assembly_ids)
+
     def is_restricted_moderator(self, rs: RequestState, bc: BackendContainer) -> bool:
         """Check if the user is a restricted moderator.
 
@@ -722,6 +792,9 @@ class AssemblyAssociatedMailinglist(ImplicitsSubscribableMeta, AssemblyMailingli
 
         return bc.assembly.list_attendees(rs, self.assembly_id)
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("attendees", self.assembly_id)
+
 
 @dataclass
 class AssemblyPresiderMailinglist(AssemblyAssociatedMailinglist):
@@ -753,6 +826,9 @@ class AssemblyPresiderMailinglist(AssemblyAssociatedMailinglist):
         assert self.assembly_id is not None
         return bc.assembly.list_assembly_presiders(rs, self.assembly_id)
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("presiders", self.assembly_id)
+
 
 @dataclass
 class AssemblyOptInMailinglist(AssemblyMailinglist):
@@ -812,6 +888,12 @@ class GeneralModeratorMailinglist(ImplicitsSubscribableMeta, Mailinglist):
         """
         return bc.core.list_all_moderators(rs)
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("moderators",)
+
+    def inputs_changed(self, changes: SubscriptionInputChanges) -> bool:
+        return self.id in changes.mailinglist_ids or changes.moderators
+
 
 @dataclass
 class CdELokalModeratorMailinglist(GeneralModeratorMailinglist):
@@ -826,6 +908,9 @@ class CdELokalModeratorMailinglist(GeneralModeratorMailinglist):
         """
         return bc.core.list_all_moderators(rs, ml_types={MailinglistTypes.cdelokal})
 
+    def implicit_subscribers_key(self) -> Hashable:
+        return ("moderators", MailinglistTypes.cdelokal)
+
 
 @dataclass
 class SemiPublicMailinglist(GeneralMailinglist):
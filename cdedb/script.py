@@ -28,7 +28,11 @@ from cdedb.cli.util import fake_rs, redirect_to_file
 from cdedb.common import AbstractBackend, PathLike, RequestState, make_proxy
 from cdedb.common.n_ import n_
 from cdedb.config import Config, SecretsConfig, get_configpath, set_configpath
-from cdedb.database.connection import Atomizer, IrradiatedConnection
+from cdedb.database.connection import (
+    Atomizer,
+    IrradiatedConnection,
+    connection_pool_factory,
+)
 from cdedb.frontend.common import AbstractFrontend, setup_translations
 from cdedb.frontend.paths import CDEDB_PATHS
 
@@ -202,6 +206,18 @@ class Script:
         if self._conn:
             return  # pragma: no cover
 
+        if (self.config["DB_POOL_SIZE"]
+                and cursor is psycopg2.extras.RealDictCursor):
+            # Scripts run in a long lived process may share a persistent pool.
+            connpool = connection_pool_factory(
+                self.config["CDB_DATABASE_NAME"], (dbuser,), self._secrets,
+                self.config["DB_HOST"], self.config["DIRECT_DB_PORT"],
+                isolation_level=None, pool_size=self.config["DB_POOL_SIZE"],
+                max_idle=self.config["DB_POOL_MAX_IDLE"],
+                timeout=self.config["DB_POOL_TIMEOUT"])
+            self._conn = connpool[dbuser]
+            return
+
         self._conn = psycopg2.connect(
             dbname=self.config["CDB_DATABASE_NAME"],
             user=dbuser,
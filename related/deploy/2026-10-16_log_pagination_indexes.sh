@@ -0,0 +1,3 @@
+#!/usr/bin/env sh
+
+sudo -u cdb psql -U cdb -d cdb -f /cdedb2/cdedb/database/evolutions/2026-10-16_log_pagination_indexes.sql
@@ -922,6 +922,26 @@ class TestAssemblyBackend(BackendTest):
                 self.assertEqual(
                     vote, self.assembly.get_vote(self.key, ballot_id, secret))
 
+    @as_users("berta")
+    def test_get_votes(self) -> None:
+        expectation = {
+            1: '3>2=4>_bar_>1',
+            2: None,
+            3: 'Lo>Li=St=Fi=Bu=Go=_bar_',
+            4: None,
+        }
+        self.assertEqual(expectation,
+                         self.assembly.get_votes(self.key, (1, 2, 3, 4), None))
+        # The second lookup uses the remembered votes.
+        self.assertEqual(expectation,
+                         self.assembly.get_votes(self.key, (1, 2, 3, 4), None))
+        self.assertEqual({1: '3>2=4>_bar_>1'},
+                         self.assembly.get_votes(self.key, (1,), 'snthdiueoa'))
+        with self.assertRaises(ValueError):
+            self.assembly.get_votes(self.key, (1,), 'aoeuidhtns')
+        with self.assertRaises(PrivilegeError):
+            self.assembly.get_votes(self.key, (1, 2, 3, 4, 7), None)
+
     def test_vote(self) -> None:
         self.login(USER_DICT['anton'])
         self.assertEqual(None, self.assembly.get_vote(self.key, 3, secret=None))
@@ -946,6 +966,30 @@ class TestAssemblyBackend(BackendTest):
             with open(self.conf['STORAGE_DIR'] / "ballot_result/1", 'rb') as g:
                 self.assertEqual(json.load(f), json.load(g))
 
+    @storage
+    @as_users("kalif")
+    def test_tally_ballots(self) -> None:
+        self.assertEqual({1: 1, 15: 1},
+                         self.assembly.list_due_ballots(self.key, assembly_id=1))
+        # Ballots of assemblies we may not access are not listed.
+        self.assertEqual({1: 1, 15: 1}, self.assembly.list_due_ballots(self.key))
+        self.assertEqual({}, self.assembly.list_due_ballots(self.key, is_active=False))
+        with self.assertRaises(ValueError):
+            self.assembly.tally_ballots(self.key, (1, 2))
+        self.assertFalse(self.assembly.get_ballot(self.key, 1)['is_tallied'])
+
+        results = self.assembly.tally_ballots(self.key, (1,))
+        self.assertEqual({1}, results.keys())
+        with open(self.testfile_dir / "ballot_result.json", 'rb') as f:
+            with open(self.conf['STORAGE_DIR'] / "ballot_result/1", 'rb') as g:
+                expectation = json.load(f)
+                self.assertEqual(expectation, json.load(g))
+        self.assertEqual(expectation, json.loads(results[1]))
+        self.assertTrue(self.assembly.get_ballot(self.key, 1)['is_tallied'])
+        self.assertEqual({15: 1},
+                         self.assembly.list_due_ballots(self.key, assembly_id=1))
+        self.assertEqual({}, self.assembly.tally_ballots(self.key, (1,)))
+
     @storage
     def test_conclusion(self) -> None:
         base_time = now()
@@ -6,7 +6,7 @@ import decimal
 
 import cdedb.database.constants as const
 from cdedb.backend.cde.semester import AllowedSemesterSteps
-from cdedb.common import now
+from cdedb.common import normalize_fulltext, now
 from cdedb.common.exceptions import QuotaException
 from cdedb.common.fields import (
     PERSONA_CDE_FIELDS,
@@ -135,6 +135,64 @@ class TestCdEBackend(BackendTest):
         self.assertEqual(
             {e[query.scope.get_primary_key()] for e in result}, expectation)
 
+    @prepsql("""
+        UPDATE core.personas SET postal_code = '47239' WHERE id = 1;
+        UPDATE core.personas SET postal_code = '47447' WHERE id = 2;
+        UPDATE core.personas SET postal_code2 = '47802', is_searchable = True
+            WHERE id = 3;
+    """)
+    @as_users("berta")
+    def test_member_search_nearby(self) -> None:
+        self.assertTrue(self.cde.is_known_postal_code(self.key, "47239"))
+        self.assertFalse(self.cde.is_known_postal_code(self.key, "00000"))
+        nearby = self.cde.get_nearby_postal_codes(self.key, "47239", 10_000)
+        self.assertLessEqual({"47239", "47447", "47802"}, set(nearby))
+        self.assertEqual([], self.cde.get_nearby_postal_codes(self.key, "00000", 10_000))
+
+        for postal_code, radius, expectation in (
+                ("47239", 5_000, {1, 2}),
+                ("47239", 10_000, {1, 2, 3}),
+                ("00000", 10_000, set()),
+        ):
+            with self.subTest(postal_code=postal_code, radius=radius):
+                query = Query(
+                    scope=QueryScope.cde_member,
+                    spec=QueryScope.cde_member.get_spec(),
+                    fields_of_interest=("personas.id",),
+                    constraints=[],
+                    order=(("personas.id", True),))
+                result = self.cde.submit_general_query(
+                    self.key, query, near_postal_code=postal_code, near_radius=radius)
+                self.assertEqual(
+                    expectation, {e[query.scope.get_primary_key()] for e in result})
+
+    @as_users("berta")
+    def test_member_search_fulltext(self) -> None:
+        with self.database_cursor() as cur:
+            cur.execute("SELECT fulltext, fulltext_normalized FROM core.personas")
+            for e in cur.fetchall():
+                self.assertEqual(normalize_fulltext(e['fulltext']),
+                                 e['fulltext_normalized'])
+
+        for operator, value, expectation in (
+                (QueryOperators.containsall, ["bertalotta", "utopia"], {2}),
+                (QueryOperators.containsall, ["Bertålotta", "UTOPIA"], {2}),
+                (QueryOperators.containsall, ["bertalotta", "anton"], set()),
+                (QueryOperators.containsall, [r"\mBert.lotta\M"], {2}),
+                (QueryOperators.match, "BERTALOTTA", {2}),
+                (QueryOperators.match, "bertaelotta", set()),
+        ):
+            with self.subTest(operator=operator, value=value):
+                query = Query(
+                    scope=QueryScope.cde_member,
+                    spec=QueryScope.cde_member.get_spec(),
+                    fields_of_interest=("personas.id",),
+                    constraints=[("fulltext", operator, value)],
+                    order=(("personas.id", True),))
+                result = self.cde.submit_general_query(self.key, query)
+                self.assertEqual(
+                    expectation, {e[query.scope.get_primary_key()] for e in result})
+
     @as_users("vera")
     def test_user_search(self) -> None:
         query = Query(
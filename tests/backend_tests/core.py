@@ -216,6 +216,34 @@ class TestCoreBackend(BackendTest):
         self.login(newuser)
         self.assertTrue(self.key)
 
+    @as_users("vera")
+    def test_find_doppelgangers(self) -> None:
+        base = {
+            'id': 1, 'given_names': "Nobody", 'family_name': "Nowhere",
+            'birth_name': None, 'birthday': datetime.date.min, 'location': None,
+            'postal_code': None, 'username': "nobody@example.cde",
+        }
+        candidates = {
+            # given names and family name
+            10: dict(base, given_names="Bertålotta", family_name="Beispiel"),
+            # display name, birth name and location
+            11: dict(base, given_names="Bertå", birth_name="Gemeinser",
+                     location="Utopia"),
+            # username alone is not enough
+            12: dict(base, username="anton@example.cde"),
+            13: dict(base, username="anton@example.cde",
+                     birthday=datetime.date(1991, 3, 30)),
+            14: base,
+        }
+        expectation = {10: {2}, 11: {2}, 12: set(), 13: {1}, 14: set()}
+        result = self.core.find_doppelgangers_batch(self.key, candidates)
+        self.assertEqual(expectation, {k: set(v) for k, v in result.items()})
+        self.assertTrue(result[13][1]['may_be_edited'])
+        for key, candidate in candidates.items():
+            self.assertEqual(result[key],
+                             self.core.find_doppelgangers(self.key, candidate))
+        self.assertEqual({}, self.core.find_doppelgangers_batch(self.key, {}))
+
     @as_users("vera")
     def test_admin_change_username(self) -> None:
         persona_id = 2
@@ -1522,6 +1550,31 @@ class TestCoreBackend(BackendTest):
         log_expectation[1]['change_note'] = None
         self.assertLogEqual(log_expectation, realm="core")
 
+    @as_users("vera")
+    def test_log_keyset_pagination(self) -> None:
+        total, entries = self.core.retrieve_changelog_meta(
+            self.key, ChangelogLogFilter(offset=0, length=1000))
+        self.assertEqual(len(entries), total)
+        ids = [e['id'] for e in entries]
+        _, page = self.core.retrieve_changelog_meta(
+            self.key, ChangelogLogFilter(length=5, before_id=ids[20]))
+        self.assertEqual(ids[15:20], [e['id'] for e in page])
+        _, page = self.core.retrieve_changelog_meta(
+            self.key, ChangelogLogFilter(length=5, after_id=ids[20]))
+        self.assertEqual(ids[21:26], [e['id'] for e in page])
+        # The offset is ignored in favour of the keyset.
+        _, page = self.core.retrieve_changelog_meta(
+            self.key, ChangelogLogFilter(offset=0, length=5, before_id=ids[3]))
+        self.assertEqual(ids[:3], [e['id'] for e in page])
+        # Filters are applied as well.
+        total, entries = self.core.retrieve_changelog_meta(
+            self.key, ChangelogLogFilter(offset=0, length=1000, persona_id=13))
+        self.assertEqual(2, total)
+        _, page = self.core.retrieve_changelog_meta(
+            self.key, ChangelogLogFilter(length=1000, persona_id=13,
+                                         after_id=entries[0]['id']))
+        self.assertEqual(entries[1:], page)
+
     @as_users("vera")
     def test_changelog_meta(self) -> None:
         expectation = self.get_sample_data(
@@ -1025,6 +1025,21 @@ class TestEventBackend(BackendTest):
     def test_has_registrations(self) -> None:
         self.assertTrue(self.event.has_registrations(self.key, 1))
 
+    @as_users("farin")
+    def test_list_many_amounts_owed(self) -> None:
+        persona_ids = (1, 2, 5, 9, NON_EXISTING_ID)
+        amounts = self.event.list_many_amounts_owed(self.key, persona_ids)
+        self.assertEqual(set(persona_ids), set(amounts))
+        self.assertEqual({}, amounts[NON_EXISTING_ID])
+        for persona_id in persona_ids:
+            self.assertEqual(self.event.list_amounts_owed(self.key, persona_id),
+                             amounts[persona_id])
+            for event_id, amount in amounts[persona_id].items():
+                self.assertEqual(
+                    self.event.get_amount_owed(self.key, persona_id, event_id),
+                    amount)
+        self.assertTrue(any(amounts.values()))
+
     @as_users("emilia")
     def test_registration_participant(self) -> None:
         expectation: CdEDBObject = {
@@ -2050,6 +2065,45 @@ class TestEventBackend(BackendTest):
         result = self.event.submit_general_query(self.key, query, event_id=2)
         self.assertEqual(tuple(), result)
 
+    @as_users("garcia")
+    def test_registration_query_after_event_change(self) -> None:
+        # The views are cached, so make sure they are rebuilt for a changed event.
+        event_id = 1
+        query = Query(
+            scope=QueryScope.registration,
+            spec=QueryScope.registration.get_spec(
+                event=self.event.get_event(self.key, event_id)),
+            fields_of_interest=["reg.id"],
+            constraints=[("reg.id", QueryOperators.equal, 1)],
+            order=[],
+        )
+        result = self.event.submit_general_query(self.key, query, event_id=event_id)
+        self.assertEqual(({'reg.id': 1},), result)
+
+        update_event = {
+            'fields': {
+                -1: {
+                    'association': const.FieldAssociations.registration,
+                    'field_name': "arrival",
+                    'kind': const.FieldDatatypes.str,
+                    'entries': None,
+                },
+            },
+        }
+        self.event.set_event(self.key, event_id, update_event)
+        self.event.set_registration(
+            self.key, {'id': 1, 'fields': {'arrival': "Zug"}})
+        query = Query(
+            scope=QueryScope.registration,
+            spec=QueryScope.registration.get_spec(
+                event=self.event.get_event(self.key, event_id)),
+            fields_of_interest=["reg.id", "reg_fields.xfield_arrival"],
+            constraints=[("reg.id", QueryOperators.equal, 1)],
+            order=[],
+        )
+        result = self.event.submit_general_query(self.key, query, event_id=event_id)
+        self.assertEqual(({'reg.id': 1, 'reg_fields.xfield_arrival': "Zug"},), result)
+
     @as_users("garcia")
     def test_lodgement_query(self) -> None:
         query = Query(
@@ -1412,6 +1412,95 @@ class TestMlBackend(BackendTest):
         result = self.ml.get_subscription_states(self.key, mailinglist_id)
         self.assertEqual(result, expectation)
 
+    @as_users("nina")
+    def test_write_subscription_states_since(self) -> None:
+        # CdE-Member list.
+        mailinglist_id = 7
+        marker = self.ml.get_subscription_input_marker(self.key)
+
+        # This is not logged and thus not noticed as a change of the inputs.
+        self.ml._set_subscription(self.key, {
+            'mailinglist_id': mailinglist_id,
+            'persona_id': 5,
+            'subscription_state': SS.subscribed,
+        })
+        self.ml.write_subscription_states(self.key, (mailinglist_id,), since=marker)
+        self.assertEqual(
+            SS.subscribed, self.ml.get_subscription(self.key, 5, mailinglist_id))
+
+        # Any logged change of the mailinglist marks it as changed.
+        self.ml.add_whitelist_entry(self.key, mailinglist_id, "honeypot@example.cde")
+        self.ml.write_subscription_states(self.key, (mailinglist_id,), since=marker)
+        self.assertEqual(
+            SS.none, self.ml.get_subscription(self.key, 5, mailinglist_id))
+
+        # Without a marker, all mailinglists are written.
+        self.ml._set_subscription(self.key, {
+            'mailinglist_id': mailinglist_id,
+            'persona_id': 5,
+            'subscription_state': SS.subscribed,
+        })
+        self.ml.write_subscription_states(self.key, (mailinglist_id,))
+        self.assertEqual(
+            SS.none, self.ml.get_subscription(self.key, 5, mailinglist_id))
+
+    @as_users("nina")
+    def test_list_changed_mailinglists(self) -> None:
+        marker = self.ml.get_mailman_sync_marker(self.key)
+        self.assertEqual(set(), self.ml.list_changed_mailinglists(self.key, marker))
+
+        # This is not logged, but still noticed as a change of the subscribers.
+        self.ml._set_subscription(self.key, {
+            'mailinglist_id': 7,
+            'persona_id': 5,
+            'subscription_state': SS.subscribed,
+        })
+        self.assertEqual({7}, self.ml.list_changed_mailinglists(self.key, marker))
+
+        # A changed persona affects all lists they are subscribed to or moderate.
+        self.core.change_persona(
+            self.key, {'id': self.user['id'], 'display_name': "Nini"})
+        expectation = {7} | {
+            e['mailinglist_id']
+            for table in ("ml.subscription_states", "ml.moderators")
+            for e in self.get_sample_data(table).values()
+            if e['persona_id'] == self.user['id']}
+        self.assertEqual(
+            expectation, self.ml.list_changed_mailinglists(self.key, marker))
+
+        # A changed email status affects all lists.
+        self.core.mark_email_status(
+            self.key, "anton@example.cde", const.EmailStatus.defect)
+        self.assertEqual(
+            set(self.ml.list_mailinglists(self.key, active_only=False)),
+            self.ml.list_changed_mailinglists(self.key, marker))
+
+        # Pruning only drops the changes up to the given marker.
+        new_marker = self.ml.get_mailman_sync_marker(self.key)
+        self.assertLess(marker["ml.subscription_changes"],
+                        new_marker["ml.subscription_changes"])
+        self.ml.prune_subscription_changes(self.key, marker)
+        self.ml._set_subscription(self.key, {
+            'mailinglist_id': 7,
+            'persona_id': 5,
+            'subscription_state': SS.unsubscribed,
+        })
+        self.assertEqual(
+            {7}, self.ml.list_changed_mailinglists(self.key, new_marker))
+        self.ml.prune_subscription_changes(self.key, new_marker)
+        self.assertEqual(
+            {7}, self.ml.list_changed_mailinglists(self.key, new_marker))
+
+    @as_users("nina")
+    def test_get_many_subscription_addresses(self) -> None:
+        addresses = self.ml.get_many_subscription_addresses(self.key, (3, 4, 7))
+        self.assertEqual({3, 4, 7}, set(addresses))
+        for mailinglist_id, expectation in addresses.items():
+            self.assertEqual(
+                expectation, self.ml.get_subscription_addresses(
+                    self.key, mailinglist_id, explicits_only=True))
+        self.assertEqual("janis-spam@example.cde", addresses[3][10])
+
     @as_users("nina")
     def test_change_sub_policy(self) -> None:
         data = models_ml.MemberInvitationOnlyMailinglist(
@@ -73,6 +73,7 @@ from cdedb.common import (
     now,
     unwrap,
 )
+from cdedb.common.cache import clear_all_caches
 from cdedb.common.exceptions import PrivilegeError
 from cdedb.common.query import QueryOperators
 from cdedb.common.query.log_filter import (
@@ -238,15 +239,6 @@ def _make_backend_shim(backend: B, internal: bool = False) -> B:
         )
         rs._conn = connpool[roles_to_db_role(rs.user.roles)]
         rs.conn = rs._conn
-        if "event" in rs.user.roles and hasattr(backend, "orga_info"):
-            rs.user.orga = backend.orga_info(
-                rs, rs.user.persona_id)
-        if "ml" in rs.user.roles and hasattr(backend, "moderator_info"):
-            rs.user.moderator = backend.moderator_info(
-                rs, rs.user.persona_id)
-        if "assembly" in rs.user.roles and hasattr(backend, "presider_info"):
-            rs.user.presider = backend.presider_info(
-                rs, rs.user.persona_id)
         return rs
 
     class Proxy:
@@ -434,6 +426,7 @@ class CdEDBTest(BasicTest):
         with self.database_cursor() as cur:
             cur.execute(self._clean_data)
             cur.execute(self._sample_data)
+        clear_all_caches()
 
         super().setUp()
 
@@ -958,6 +951,7 @@ def event_keeper(fun: F) -> F:
 def execsql(sql: str) -> None:
     """Execute arbitrary SQL-code on the test database."""
     execute_sql_script(TestConfig(), SecretsConfig(), sql)
+    clear_all_caches()
 
 
 class FrontendTest(BackendTest):
@@ -152,7 +152,7 @@ class TestCoreFrontend(FrontendTest):
         genesis = {"Accountanfragen"}
         pending = {"Änderungen prüfen"}
         defect_email = {"Defekte Email-Adressen"}
-        core_admin = {"Nutzer verwalten", "Metadaten"}
+        core_admin = {"Nutzer verwalten", "Metadaten", "Anfragedauern"}
         meta_admin = {"Admin-Änderungen"}
         log = {"Account-Log", "Nutzerdaten-Log"}
 
@@ -1700,6 +1700,12 @@ class TestCoreFrontend(FrontendTest):
         f = self.response.forms['changeinfoform']
         self.assertEqual("Zelda", f["Finanzvorstand_Name"].value)
 
+    @as_users("vera")
+    def test_view_request_timings(self) -> None:
+        self.traverse("Anfragedauern")
+        self.assertTitle("Anfragedauern")
+        self.assertPresence("Die Zeitmessung von Anfragen ist deaktiviert.")
+
     def test_lockdown_web(self) -> None:
         self.login('vera')
         self.traverse("Metadaten")
@@ -402,8 +402,32 @@ class TestCron(CronTest):
 
     @event_keeper
     def test_event_keeper(self) -> None:
-        # We just want to test that no exception is raised.
+        def stored_watermarks() -> dict[str, int]:
+            return self.core.get_cron_store(RS, "event_keeper")['log_watermarks']
+
         self.execute('event_keeper')
+        watermarks = self.event.get_event_log_watermarks(RS, (1, 2, 3, 4))
+        self.assertEqual(
+            {str(event_id): log_id for event_id, log_id in watermarks.items()},
+            stored_watermarks())
+
+        # A new log entry only moves the watermark of its event.
+        execsql(f"INSERT INTO event.log (code, event_id)"
+                f" VALUES ({const.EventLogCodes.event_changed.value}, 2)")
+        self.stores = []
+        eventproxy = self.cron.event.eventproxy
+        with unittest.mock.patch.object(
+                eventproxy, "event_keeper_commit",
+                wraps=eventproxy.event_keeper_commit) as commit:
+            self.execute('event_keeper')
+        # Unchanged events are skipped without asking the backend.
+        self.assertEqual([2], [call.args[1] for call in commit.call_args_list])
+        new_watermarks = stored_watermarks()
+        self.assertLess(watermarks[2], new_watermarks["2"])
+        del new_watermarks["2"]
+        self.assertEqual(
+            {str(event_id): watermarks[event_id] for event_id in (1, 3, 4)},
+            new_watermarks)
 
     def test_mail_orgateam_reminders_none(self) -> None:
         cronjob = "mail_orgateam_reminders"
@@ -5,7 +5,6 @@ import csv
 import datetime
 import decimal
 import types
-import unittest.mock
 from typing import Any, Optional, cast
 
 import webtest
@@ -126,9 +125,13 @@ class TestParseFrontend(FrontendTest):
         transaction = parse.Transaction(data)
         transaction.persona = {'id': 1}
         event_backend = self.initialize_backend(EventBackend)
-        event_backend.list_amounts_owed = unittest.mock.MagicMock(  # type: ignore[method-assign]
-            return_value={2: amount})
-        transaction._match_event(rs=self.key, event_backend=event_backend)  # pylint: disable=protected-access
+        context = parse.StatementContext(
+            events=event_backend.get_events(
+                self.key, event_backend.list_events(self.key)),
+            personas={},
+            amounts_owed={1: {2: amount}},
+        )
+        transaction._match_event(context)  # pylint: disable=protected-access
 
         # Check that reference match is better.
         self.assertIsNotNone(transaction.event)
@@ -10,6 +10,7 @@ e.g. `self.assertEqual("123", str(123))`.
 import asyncio
 from typing import Any
 
+from ldaptor.ldapfilter import parseFilter
 from ldaptor.protocols.ldap.distinguishedname import DistinguishedName as DN
 from ldaptor.protocols.pureber import ber2int, int2ber
 from psycopg.rows import dict_row
@@ -210,6 +211,34 @@ class LDAPBackendTest(BasicTest):
         self.assertFalse(self.ldap_backend_class.is_moderator_group_dn(dn))
         self.assertEqual(address, self.ldap_backend_class.subscriber_group_address(dn))
 
+    def test_user_filter_condition(self) -> None:
+        condition = self.ldap_backend_class.user_filter_condition
+        self.assertEqual(("id = %s", [9]), condition(parseFilter("(UID=9)")))
+        self.assertEqual(("FALSE", []), condition(parseFilter("(uid=abc)")))
+        self.assertEqual(
+            ("username = %s", ["inga@example.cde"]),
+            condition(parseFilter("(&(objectClass=*)(mail=Inga@example.cde))")))
+        self.assertEqual(
+            ("(id = %s OR (given_names || ' ' || family_name) ILIKE %s)",
+             [1, "Anton%"]),
+            condition(parseFilter("(|(uid=1)(cn=Anton*))")))
+        self.assertEqual(
+            ("is_member", []),
+            condition(parseFilter(
+                "(memberOf=cn=is_member,ou=status,ou=groups,dc=cde-ev,dc=de)")))
+        self.assertEqual(
+            ("(is_member AND is_searchable)", []),
+            condition(parseFilter(
+                "(memberOf=cn=is_searchable,ou=status,ou=groups,dc=cde-ev,dc=de)")))
+        self.assertEqual(
+            ("FALSE", []), condition(parseFilter("(objectClass=groupOfUniqueNames)")))
+        # untranslatable filters do not restrict the users
+        self.assertIsNone(condition(parseFilter("(objectClass=inetOrgPerson)")))
+        self.assertIsNone(condition(parseFilter("(!(uid=1))")))
+        self.assertIsNone(condition(parseFilter("(|(uid=1)(sn=Administrator))")))
+        self.assertEqual(
+            ("id = %s", [1]), condition(parseFilter("(&(uid=1)(sn=Administrator))")))
+
 
 class AsyncLDAPBackendTest(AsyncBasicTest):
     ldap: LDAPsqlBackend
@@ -247,12 +276,37 @@ class AsyncLDAPBackendTest(AsyncBasicTest):
         user_dns = await self.ldap.list_users()
         for user in user_dns:
             self.assertIsInstance(user, DN)
+        self.assertEqual(
+            [self.ldap.user_dn(9)],
+            await self.ldap.list_users(parseFilter("(mail=inga@example.cde)")))
+        self.assertEqual(user_dns[3:5], await self.ldap.list_users(
+            after=self.ldap.user_id(user_dns[2]), limit=2))
         _users = await self.ldap.get_users(user_dns)
         users_data = await self.ldap.get_users_data(persona_ids)
         self.assertIn(1, users_data)
         user_groups = await self.ldap.get_users_groups(persona_ids)
         self.assertIn(1, user_groups)
 
+    async def test_cache(self) -> None:
+        persona_ids = {1, 3, 10}
+        # The cache is only used while listening for invalidations.
+        self.assertFalse(self.ldap.cache.active)
+        self.ldap.cache.active = True
+        groups = await self.ldap.get_users_groups(persona_ids)
+        self.assertEqual((0, 3), (self.ldap.cache.hits, self.ldap.cache.misses))
+        self.assertEqual(groups, await self.ldap.get_users_groups(persona_ids))
+        self.assertEqual((3, 3), (self.ldap.cache.hits, self.ldap.cache.misses))
+        self.ldap.cache.invalidate_table("ml.subscription_states")
+        self.assertEqual(groups, await self.ldap.get_users_groups(persona_ids))
+        self.assertEqual((3, 6), (self.ldap.cache.hits, self.ldap.cache.misses))
+
+        dns = await self.ldap.list_status_groups()
+        status_groups = await self.ldap.get_status_groups(dns)
+        self.assertEqual(status_groups, await self.ldap.get_status_groups(dns))
+        self.ldap.cache.invalidate_table("event.orgas")
+        self.assertEqual(status_groups, await self.ldap.get_status_groups(dns))
+        self.assertEqual(len(dns), self.ldap.cache.misses - 6)
+
     async def test_get_status_groups(self) -> None:
         status_group_dns = await self.ldap.list_status_groups()
         for status_group in status_group_dns:
@@ -6,6 +6,7 @@ from typing import Optional, Union
 
 import ldap3
 from ldap3 import ALL_ATTRIBUTES
+from ldap3.core.exceptions import LDAPUnwillingToPerformResult
 from ldap3.core.tls import Tls
 
 from tests.common import USER_DICT, BasicTest
@@ -666,6 +667,16 @@ class TestLDAP(BasicTest):
             self.assertEqual(['3'], conn.entries[0].entry_attributes_as_dict["uid"])
             self.assertEqual(['4'], conn.entries[1].entry_attributes_as_dict["uid"])
 
+            # cookies may be used only once
+            with self.assertRaises(LDAPUnwillingToPerformResult):
+                conn.search(
+                    search_base=self.root_dn,
+                    search_filter=search_filter,
+                    paged_size=2,
+                    paged_cookie=cookie,
+                    attributes=["uid"],
+                )
+
             # next try, with more results
             # first page
             conn.search(
@@ -695,6 +706,20 @@ class TestLDAP(BasicTest):
                 "value"]["cookie"]
             self.assertEqual(b"", cookie)
 
+    def test_search_size_limit(self) -> None:
+        search_filter = "(objectclass=inetOrgPerson)"
+        with ldap3.Connection(
+            self.server, user=self.test_dua_dn, password=self.test_dua_pw,
+        ) as conn:
+            conn.search(
+                search_base=self.root_dn,
+                search_filter=search_filter,
+                size_limit=3,
+                attributes=["uid"],
+            )
+            self.assertEqual(3, len(conn.entries))
+            self.assertEqual("sizeLimitExceeded", conn.result["description"])
+
     def test_caseinsensitive_attributes(self) -> None:
         user_id = 9
         attributes = ["objectClass", "cn", "givenName", "mail", "uid"]
@@ -8,18 +8,47 @@ import re
 import shutil
 import subprocess
 import tempfile
+import time
+import types
+from typing import cast
 
+import cdedb.common.instrumentation as instrumentation
+import cdedb.database.constants as const
+import cdedb.fee_condition_parser.evaluation as fcp_evaluation
+import cdedb.fee_condition_parser.parsing as fcp_parsing
+import cdedb.models.event as models
+from cdedb.backend.entity_keeper import EntityKeeper
 from cdedb.common import (
+    AgeClasses,
     NearlyNow,
+    diacritic_patterns,
     int_to_words,
     inverse_diacritic_patterns,
+    json_serialize,
     nearly_now,
+    normalize_fulltext,
+    normalized_search_pattern,
     now,
     unwrap,
 )
+from cdedb.common.cache import ExpiringCache, clear_all_caches
 from cdedb.common.roles import extract_roles
 from cdedb.common.sorting import mixed_existence_sorter, xsorted
 from cdedb.enums import ALL_ENUMS
+from cdedb.frontend.common import (
+    compile_templates,
+    csv_output,
+    csv_output_chunks,
+    encode_chunks,
+    make_jinja_environments,
+    query_result_to_json_chunks,
+)
+from cdedb.frontend.event.lodgement_wishes import WishMatcher
+from cdedb.frontend.event.query_stats import (
+    EventRegistrationColumns,
+    EventRegistrationPartStatistic,
+    EventRegistrationTrackStatistic,
+)
 from cdedb.models.ml import ML_TYPE_MAP, ML_TYPE_MAP_INV
 from tests.common import BasicTest
 
@@ -244,6 +273,281 @@ class TestCommon(BasicTest):
         self.assertTrue(pattern.match("Bertå Boehm"))
         self.assertFalse(pattern.match("Bertä Böhm"))
 
+    def test_normalized_search_pattern(self) -> None:
+        texts = ("Anton Armin A. Administrator", "Bertå Böhm Düsseldorf",
+                 "Charly Straße C. Clown Łódź", "Søren Œuvre Æther Kühne",
+                 "Michael Feuer e-mail@example.cde")
+        terms = ("Bertå", "berta", "boehm", "duesseldorf", "esseldorf", "ssel",
+                 "strasse", "straße", "lodz", "soren", "soeren", "oeuvre",
+                 "aether", "ether", "kuehne", "ehne", "uhn", "michael", "el",
+                 "Feuer", "er", "e-mail@example", "xyz")
+        for text in texts:
+            normalized = normalize_fulltext(text)
+            self.assertEqual(len(text), len(normalized))
+            for term in terms:
+                with self.subTest(text=text, term=term):
+                    pattern = normalized_search_pattern(term)
+                    assert pattern is not None
+                    if re.search(diacritic_patterns(term), text, flags=re.I):
+                        self.assertTrue(re.search(pattern, normalized))
+        self.assertEqual("bohm", normalized_search_pattern(r"\mBöhm\M"))
+        self.assertEqual(r"strass?e\-kue?hne",
+                         normalized_search_pattern("Strasse-Kuehne"))
+        for term in ("", "B.hm", "^Bert", "(Bert|Anton)", "Ant*"):
+            with self.subTest(term=term):
+                self.assertIsNone(normalized_search_pattern(term))
+
+    def test_wish_matcher(self) -> None:
+        personas = {
+            1: {'id': 1, 'given_names': "Bertå Alicia", 'display_name': "Bertå",
+                'family_name': "Böhm", 'username': "berta@example.cde"},
+            2: {'id': 2, 'given_names': "Emilia", 'display_name': "Emilia",
+                'family_name': "E. Eventis", 'username': None},
+            3: {'id': 3, 'given_names': "Alicia", 'display_name': "Alicia",
+                'family_name': "Böhm", 'username': "alicia@example.cde"},
+        }
+        registrations = {10 + i: {'persona_id': i} for i in personas}
+        matcher = WishMatcher(registrations, personas)
+        texts = [
+            "Ich möchte mit Berta Boehm und E. EVENTIS in ein Zimmer.",
+            "Alicia Böhm, DB-2-7",
+            "berta@example.cde oder Bertå Alicia Böhm",
+            "Boehmer, Eventis und alicia@example",
+            "",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                expectation = {reg_id for reg_id, pattern in matcher.patterns.items()
+                               if pattern.search(text)}
+                self.assertLessEqual(expectation, matcher.candidates(text))
+        self.assertEqual({11, 12, 13}, matcher.candidates(texts[1]))
+        self.assertEqual(set(), matcher.candidates(texts[3]))
+
+    def test_registration_statistic_columns(self) -> None:
+        rng = random.Random(42)
+        begin = datetime.date(2222, 2, 22)
+        parts = {
+            part_id: types.SimpleNamespace(
+                id=part_id, part_begin=begin + datetime.timedelta(days=7 * part_id),
+                part_end=begin + datetime.timedelta(days=7 * part_id + 6))
+            for part_id in (1, 2)
+        }
+        tracks = {track_id: types.SimpleNamespace(id=track_id, part_id=part_id)
+                  for track_id, part_id in ((1, 1), (2, 1), (3, 2))}
+        event = cast(models.Event, types.SimpleNamespace(
+            parts=parts, tracks=tracks, orgas={1, 2, 3},
+            begin=parts[1].part_begin, end=parts[2].part_end))
+        registrations = {}
+        for reg_id in range(1, 201):
+            courses = (None, 1, 2)
+            registrations[reg_id] = {
+                'id': reg_id,
+                'persona_id': rng.randrange(1, 20),
+                'amount_owed': rng.choice((0, 10)),
+                'amount_paid': rng.choice((0, 10)),
+                'checkin': rng.choice((None, now())),
+                'parental_agreement': rng.random() < 0.5,
+                'birthday': begin - datetime.timedelta(days=rng.randrange(30 * 365)),
+                'parts': {
+                    part_id: {
+                        'status': rng.choice(list(const.RegistrationPartStati)),
+                        'age_class': rng.choice(list(AgeClasses)),
+                        'lodgement_id': rng.choice((None, 1)),
+                    }
+                    for part_id in parts
+                },
+                'tracks': {
+                    track_id: {'course_id': rng.choice(courses),
+                               'course_instructor': rng.choice(courses)}
+                    for track_id in tracks
+                },
+            }
+        columns = EventRegistrationColumns(event, registrations)
+        for part_stat in EventRegistrationPartStatistic:
+            for part_id in parts:
+                with self.subTest(stat=part_stat, part_id=part_id):
+                    self.assertEqual(
+                        {reg_id for reg_id, reg in registrations.items()
+                         if part_stat.test(event, reg, part_id)},
+                        part_stat.get_matching_ids(columns, part_id))
+        for track_stat in EventRegistrationTrackStatistic:
+            for track_id in tracks:
+                with self.subTest(stat=track_stat, track_id=track_id):
+                    self.assertEqual(
+                        {reg_id for reg_id, reg in registrations.items()
+                         if track_stat.test(event, reg, track_id)},
+                        track_stat.get_matching_ids(event, columns, track_id))
+
+    def test_instrumentation(self) -> None:
+        timing = instrumentation.RequestTiming(slow_queries=2)
+        for i, duration in enumerate((0.003, 0.001, 0.004, 0.002)):
+            timing.record_query(f"SELECT {i}", duration)
+        timing.record_render(0.005)
+        timing.finish()
+        data = timing.as_dict()
+        self.assertEqual(4, data['queries'])
+        self.assertEqual(10.0, data['db'])
+        self.assertEqual(5.0, data['render'])
+        self.assertEqual(["SELECT 2", "SELECT 0"],
+                         [entry['query'] for entry in data['slow_queries']])
+        self.assertIn('db;dur=10.0;desc="4 queries"', timing.server_timing())
+
+        statistics = instrumentation.EndpointStatistics(samples=10)
+        for duration in range(1, 101):
+            timing = instrumentation.RequestTiming(slow_queries=0)
+            timing.endpoint = "core/index"
+            timing.total = duration / 1000
+            statistics.add(timing)
+        summary = unwrap(statistics.summary())
+        self.assertEqual(100, summary['count'])
+        self.assertAlmostEqual(50.5, summary['mean'])
+        self.assertLessEqual(summary['p50'], summary['p95'])
+
+    def test_expiring_cache(self) -> None:
+        cache: ExpiringCache[int, int] = ExpiringCache(max_size=2)
+        calls = []
+
+        def retrieve(value: int) -> int:
+            calls.append(value)
+            return value
+
+        self.assertEqual(1, cache.get(1, lambda: retrieve(1), ttl=60))
+        self.assertEqual(1, cache.get(1, lambda: retrieve(2), ttl=60))
+        self.assertEqual([1], calls)
+        # Non-positive time to live bypasses the cache.
+        self.assertEqual(3, cache.get(1, lambda: retrieve(3), ttl=0))
+        self.assertEqual(1, cache.get(1, lambda: retrieve(4), ttl=60))
+        # Expired entries are retrieved again.
+        self.assertEqual(5, cache.get(2, lambda: retrieve(5), ttl=-1))
+        cache.get(2, lambda: retrieve(5), ttl=0.001)
+        time.sleep(0.01)
+        self.assertEqual(6, cache.get(2, lambda: retrieve(6), ttl=60))
+        # Least recently used entries are dropped first.
+        cache.get(1, lambda: retrieve(7), ttl=60)
+        cache.get(3, lambda: retrieve(8), ttl=60)
+        self.assertEqual(9, cache.get(2, lambda: retrieve(9), ttl=60))
+        self.assertEqual(8, cache.get(3, lambda: retrieve(10), ttl=60))
+        cache.invalidate(3)
+        self.assertEqual(11, cache.get(3, lambda: retrieve(11), ttl=60))
+        clear_all_caches()
+        self.assertEqual(12, cache.get(3, lambda: retrieve(12), ttl=60))
+        self.assertEqual([1, 3, 5, 5, 6, 8, 9, 11, 12], calls)
+
+        # An invalidation during the retrieval prevents storing the stale value.
+        def retrieve_and_clear() -> int:
+            cache.clear()
+            return 13
+
+        self.assertEqual(13, cache.get(4, retrieve_and_clear, ttl=60))
+        self.assertEqual(14, cache.get(4, lambda: retrieve(14), ttl=60))
+
+        # Values retrieved elsewhere can be stored and looked up directly.
+        self.assertIsNone(cache.peek(5))
+        cache.put(5, 15, ttl=0)
+        self.assertIsNone(cache.peek(5))
+        cache.put(5, 15, ttl=60)
+        self.assertEqual(15, cache.peek(5))
+        self.assertEqual(15, cache.get(5, lambda: retrieve(16), ttl=60))
+        cache.put(5, 17, ttl=0.001)
+        time.sleep(0.01)
+        self.assertIsNone(cache.peek(5))
+
+    def test_entity_keeper(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            keeper = EntityKeeper(self.conf, pathlib.Path(tmp_dir), log_keys=["Code"],
+                                  log_timestamp_key="ctime")
+            repo = pathlib.Path(tmp_dir) / "1"
+
+            def git(*args: str) -> str:
+                return subprocess.run(["git", *args], cwd=repo, check=True,
+                                      capture_output=True, text=True).stdout
+
+            keeper.init(1)
+            self.assertIsNone(keeper.latest_logtime(1))
+            first = keeper.commit(1, "{}", "Initialer Commit", may_drop=False)
+            self.assertIsNone(keeper.commit(1, "{}", "Leer"))
+            empty = keeper.commit(1, "{}", "Nach Änderung", may_drop=False)
+            ctime = datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone.utc)
+            last = keeper.commit(1, '{"ä": 1}', "Snapshot", "Anton", "anton@example.cde",
+                                 logs=[{"Code": "foo", "ctime": ctime}])
+            self.assertEqual(ctime, keeper.latest_logtime(1))
+            git("fsck", "--strict")
+            self.assertEqual(
+                [f"{last} Anton Snapshot", f"{empty} CdE-Datenbank Nach Änderung",
+                 f"{first} CdE-Datenbank Initialer Commit"],
+                git("log", "--format=%H %an %s").splitlines())
+            self.assertEqual('{"ä": 1}', git("show", "HEAD:1.json"))
+
+            # Commits are still possible if git packed the objects.
+            git("gc", "--quiet", "--prune=now")
+            self.assertEqual(ctime, keeper.latest_logtime(1))
+            self.assertIsNone(keeper.commit(1, '{"ä": 1}', "Leer"))
+            self.assertIsNotNone(keeper.commit(1, '{"ä": 2}', "Snapshot"))
+            git("fsck", "--strict")
+
+    def test_download_chunks(self) -> None:
+        data = [
+            {'id': 1, 'name': "Anton\nArmin", 'extra': {'a': [1, 2], 'b': {}}},
+            {'id': 2, 'name': "Bertålotta", 'extra': []},
+        ]
+        fields = ["id", "name", "extra"]
+        for rows in (data, data[:1], []):
+            self.assertEqual(
+                json_serialize([{k: row[k] for k in fields} for row in rows]),
+                "".join(query_result_to_json_chunks(iter(rows), fields)))
+        self.assertEqual(
+            csv_output(data, fields[:2]),
+            "".join(csv_output_chunks(iter(data), fields[:2])))
+        self.assertEqual("id;name\n", next(csv_output_chunks(iter(data), fields[:2])))
+
+        chunks = ["id;name\n", "1;Anton\n", "2;Bertålotta\n"]
+        blocks = list(encode_chunks(chunks, 'utf-8-sig', block_size=10))
+        # The first block is sent right away, the others are collected.
+        self.assertEqual(
+            [b"\xef\xbb\xbfid;name\n", "1;Anton\n2;Bertålotta\n".encode()], blocks)
+
+    def test_compiled_fee_conditions(self) -> None:
+        conditions = [
+            "true", "false", "field.is_child", "not part.Wu-1",
+            "field.is_child and part.Wu-1 or is_orga",
+            "field.is_child xor (part.Wu'2 and not any_part)",
+            "not (is_member or all_parts) xor not field.is_child and part.Wu-1",
+        ]
+        rng = random.Random(42)
+        inputs = [
+            ({'is_child': rng.random() < 0.5},
+             {'Wu-1': rng.random() < 0.5, "Wu'2": rng.random() < 0.5},
+             {k: rng.random() < 0.5
+              for k in ('is_orga', 'is_member', 'any_part', 'all_parts')})
+            for _ in range(200)
+        ]
+        for condition in conditions:
+            with self.subTest(condition=condition):
+                parse_result = fcp_parsing.parse(condition)
+                expectation = [fcp_evaluation.evaluate(parse_result, *values)
+                               for values in inputs]
+                self.assertEqual(
+                    expectation, fcp_evaluation.compile_condition(condition)(inputs))
+                evaluator = fcp_evaluation.create_evaluator(parse_result)
+                self.assertEqual(
+                    expectation, [evaluator(*values) for values in inputs])
+
+    def test_template_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conf = {**self.conf, "TEMPLATE_CACHE_DIR": pathlib.Path(tmp_dir)}
+            envs = make_jinja_environments(conf)  # type: ignore[arg-type]
+            num = compile_templates(envs)
+            self.assertLess(200, num)
+            self.assertEqual(num, len(list(pathlib.Path(tmp_dir).iterdir())))
+            # A new environment uses the compiled templates.
+            envs = make_jinja_environments(conf)  # type: ignore[arg-type]
+            loader, cache = envs.mail.loader, envs.mail.bytecode_cache
+            assert loader is not None and cache is not None
+            name = "mail/core/admin_reset_password.tmpl"
+            source, filename, _ = loader.get_source(envs.mail, name)
+            self.assertIsNotNone(
+                cache.get_bucket(envs.mail, name, filename, source).code)
+
     def test_enum_str_conversion(self) -> None:
         for enum_ in ALL_ENUMS:
             for member in enum_:
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 # pylint: disable=missing-module-docstring
 
+import datetime
+import logging
 import unittest
 from typing import Any, cast
 
+import psycopg2.errors
 import psycopg2.extensions
 
 from cdedb.backend.common import DatabaseLock, Silencer, _affirm_atomized_context
@@ -13,8 +16,12 @@ from cdedb.database.connection import (
     Atomizer,
     ConnectionContainer,
     IrradiatedConnection,
+    PersistentConnectionPool,
+    PoolTimeoutError,
     connection_pool_factory,
+    pooled_connection,
 )
+from cdedb.database.query import SqlQueryBackend
 
 
 class TestDatabase(unittest.TestCase):
@@ -44,6 +51,51 @@ class TestDatabase(unittest.TestCase):
             # pylint: disable=pointless-statement
             factory["cdb_persona"]  # exception in __getitem__
 
+    def test_persistent_connection(self) -> None:
+        factory = connection_pool_factory(
+            self.config["CDB_DATABASE_NAME"], ("cdb_anonymous", "cdb_persona"),
+            self.secrets, self.config["DB_HOST"], self.config["DB_PORT"],
+            pool_size=2, timeout=datetime.timedelta(seconds=0.1))
+        self.assertIsInstance(factory, PersistentConnectionPool)
+        assert isinstance(factory, PersistentConnectionPool)
+        factory.clear()
+        with self.assertRaises(ValueError):
+            # pylint: disable=pointless-statement
+            factory["cdb_admin"]  # exception in __getitem__
+
+        conn = factory["cdb_persona"]
+        self.assertIsInstance(conn, IrradiatedConnection)
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM core.personas")
+        # Leave a transaction open, which has to be rolled back on checkin.
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM core.sessions")
+        conn.close()
+        self.assertFalse(conn.closed)
+        self.assertEqual(psycopg2.extensions.STATUS_READY, conn.status)
+
+        with pooled_connection(factory, "cdb_persona") as conn2:
+            self.assertIs(conn, conn2)
+            with pooled_connection(factory, "cdb_persona") as conn3:
+                self.assertIsNot(conn2, conn3)
+                with self.assertRaises(PoolTimeoutError):
+                    # pylint: disable=pointless-statement
+                    factory["cdb_persona"]
+        stats = factory.stats()["cdb_persona"]
+        self.assertEqual(2, stats["created"])
+        self.assertEqual(1, stats["reused"])
+        self.assertEqual(2, stats["idle"])
+        self.assertEqual(0, stats["in_use"])
+
+        # The pool is shared with other callers using the same parameters.
+        self.assertIs(factory, connection_pool_factory(
+            self.config["CDB_DATABASE_NAME"], ("cdb_persona", "cdb_anonymous"),
+            self.secrets, self.config["DB_HOST"], self.config["DB_PORT"],
+            pool_size=2, timeout=datetime.timedelta(seconds=0.1)))
+        factory.clear()
+        self.assertEqual(0, factory.stats()["cdb_persona"]["idle"])
+
     def test_atomizer(self) -> None:
         factory = connection_pool_factory(
             self.config["CDB_DATABASE_NAME"], ("cdb_persona",), self.secrets,
@@ -89,6 +141,35 @@ class TestDatabase(unittest.TestCase):
                     with Silencer(rs):
                         pass  # pragma: no cover
 
+    def test_query_iter(self) -> None:
+        factory = connection_pool_factory(
+            self.config["CDB_DATABASE_NAME"], ("cdb_persona",), self.secrets,
+            self.config["DB_HOST"], self.config["DB_PORT"])
+        conn = factory["cdb_persona"]
+
+        rs = ConnectionContainer()
+        rs.conn = rs._conn = conn
+        backend = SqlQueryBackend(logging.getLogger(__name__))
+        query = "SELECT id FROM core.personas ORDER BY id"
+        expectation = backend.query_all(rs, query, ())
+        rows = backend.query_iter(rs, query, (), batch_size=3)
+        # The transaction stays open while the rows are retrieved.
+        self.assertTrue(conn.is_contaminated)
+        self.assertEqual(expectation[0], next(rows))
+        self.assertEqual(expectation[1:], tuple(rows))
+        self.assertFalse(conn.is_contaminated)
+        self.assertEqual(psycopg2.extensions.STATUS_READY, conn.status)
+
+        # Errors are raised right away and abandoning the rows ends the transaction.
+        with self.assertRaises(psycopg2.errors.UndefinedTable):
+            backend.query_iter(rs, "SELECT * FROM core.nonexistent", ())
+        self.assertFalse(conn.is_contaminated)
+        rows = backend.query_iter(rs, query, (), batch_size=3)
+        next(rows)
+        rows.close()  # type: ignore[attr-defined]
+        self.assertFalse(conn.is_contaminated)
+        self.assertEqual(psycopg2.extensions.STATUS_READY, conn.status)
+
     def test_suppressed_exception(self) -> None:
         factory = connection_pool_factory(
             self.config["CDB_DATABASE_NAME"], ("cdb_admin",), self.secrets,
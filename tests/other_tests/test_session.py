@@ -59,6 +59,33 @@ class TestSessionBackend(BackendTest):
         self.assertIsInstance(user, User)
         self.assertEqual(USER_DICT["anton"]['id'], user.persona_id)
 
+    def test_sessionlookup_privileges(self) -> None:
+        key = self.login(USER_DICT["garcia"])
+        user = self.session.lookupsession(key, "127.0.0.0")
+        self.assertEqual({1, 3}, user.orga)
+        self.assertLessEqual({8, 9, 10, 58}, user.moderator)
+        self.assertEqual(set(), user.presider)
+        key = self.login(USER_DICT["werner"])
+        user = self.session.lookupsession(key, "127.0.0.0")
+        self.assertEqual({1, 3}, user.presider)
+
+    def test_sessionlookup_atime(self) -> None:
+        admin_key = cast(RequestState, self.login(USER_DICT["vera"]))
+        old_time = now() - self.conf["SESSION_ATIME_RESOLUTION"] * 2
+        entry = make_session_entry(1, ctime=old_time, atime=old_time)
+        execsql(insert_sessions_template([entry]))
+        self.assertEqual(
+            old_time, self.core.get_persona_latest_session(admin_key, 1))
+        user = self.session.lookupsession(entry.sessionkey, entry.ip)
+        self.assertEqual(1, user.persona_id)
+        last_access = self.core.get_persona_latest_session(admin_key, 1)
+        self.assertEqual(nearly_now(), last_access)
+        # Subsequent accesses do not update the access time immediately.
+        user = self.session.lookupsession(entry.sessionkey, entry.ip)
+        self.assertEqual(1, user.persona_id)
+        self.assertEqual(
+            last_access, self.core.get_persona_latest_session(admin_key, 1))
+
     def test_tokenlookup(self) -> None:
         persona_sessionkey = cast(RequestState, self.core.login(
             self.key, USER_DICT['anton']['username'],
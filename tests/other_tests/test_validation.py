@@ -139,6 +139,52 @@ class TestValidation(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate.validate_assert_optional(int, "garbage", ignore_warnings)
 
+    def test_compiled_validators(self) -> None:
+        ignore_warnings = True
+        types: tuple[Any, ...] = (
+            ID, Optional[ID], int, str, bool, StringType, Persona)
+        for type_ in types:
+            with self.subTest(type_=type_):
+                self.assertIs(validate._ALL_TYPED[type_],
+                              validate._ALL_TYPED[type_])
+        id_set = set[ID]
+        self.assertIs(validate._ALL_TYPED[id_set], validate._ALL_TYPED[id_set])
+
+        # The fast paths must not let through anything the validators would change.
+        self.assertIs(int, type(validate.validate_assert(int, True, ignore_warnings)))
+        self.assertIs(int, type(validate.validate_assert(ID, True, ignore_warnings)))
+        with self.assertRaises(ValueError):
+            validate.validate_assert(ID, 0, ignore_warnings)
+        with self.assertRaises(ValueError):
+            validate.validate_assert(int, 2 ** 31, ignore_warnings)
+        with self.assertRaises(ValueError):
+            validate.validate_assert(str, "", ignore_warnings)
+        self.assertEqual(
+            "", validate.validate_assert(StringType, "", ignore_warnings))
+        self.assertEqual(
+            "a\nb", validate.validate_assert(str, "a\r\nb", ignore_warnings))
+        self.assertEqual(
+            "ab", validate.validate_assert(str, "a-b", ignore_warnings, zap="-"))
+        self.assertIs(False, validate.validate_assert(bool, "no", ignore_warnings))
+
+        self.assertEqual(
+            [1, 2, 3],
+            validate.validate_assert_all(ID, [1, "2", 3.0], ignore_warnings))
+        with self.assertRaises(ValueError) as cm:
+            validate.validate_assert_all(ID, [1, -2], ignore_warnings)
+        self.assertEqual(("Must be positive. (None)",), cm.exception.args)
+
+        # Registering a validator invalidates the compiled ones.
+        storage = validate.ValidatorStorage()
+        storage[int] = lambda val, argname=None, **kwargs: -1
+        compiled = storage[int]
+        self.assertIs(compiled, storage[int])
+        self.assertEqual(-1, compiled("12"))
+        self.assertEqual(12, compiled(12))
+        storage[int] = lambda val, argname=None, **kwargs: -2
+        self.assertIsNot(compiled, storage[int])
+        self.assertEqual(-2, storage[int]("12"))
+
     def test_int(self) -> None:
         self.do_validator_test(int, (
             (0, 0, None),